@@ -0,0 +1,80 @@
+"""Connection acquisition benchmark.
+
+Run once without and once with the pool and compare the percentiles:
+
+    DB_ENGINE=django.db.backends.postgresql DB_CONN_MAX_AGE=0 python benchmarks/bench_db_pool.py
+    DB_ENGINE=django.db.backends.postgresql DB_POOL=1 python benchmarks/bench_db_pool.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "school_motivation_system.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def worker(iterations: int, query_ms: float, samples: list[float], lock: threading.Lock) -> None:
+    local = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        connection.ensure_connection()
+        local.append((time.perf_counter() - started) * 1000)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(%s)", [query_ms / 1000])
+        connection.close()
+    with lock:
+        samples.extend(local)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    samples: list[float] = []
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(args.iterations, args.query_ms, samples, lock))
+        for _ in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"engine={connection.settings_dict['ENGINE']} threads={args.threads} iterations={args.iterations}")
+    print(f"requests/s={len(samples) / elapsed:.0f}")
+    print(
+        "acquire ms: "
+        f"mean={statistics.mean(samples):.2f} p50={percentile(samples, 0.5):.2f} "
+        f"p95={percentile(samples, 0.95):.2f} p99={percentile(samples, 0.99):.2f} max={max(samples):.2f}"
+    )
+    if connection.settings_dict["ENGINE"] == "core.db.backends.postgresql_pool":
+        from core.db.backends.postgresql_pool.base import pool_stats
+
+        for alias, stats in pool_stats().items():
+            print(f"pool[{alias}]: " + " ".join(f"{key}={value}" for key, value in sorted(stats.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Cold-start benchmark: time to the first rendered response in a fresh process.
+
+    python benchmarks/bench_startup.py --runs 5
+
+Each run starts a new interpreter, so template compilation, URL resolution and translation
+loading are paid again. Pages that use ``{% static %}`` need ``collectstatic`` first when
+DEBUG is off.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "school_motivation_system.settings")
+import django
+django.setup()
+setup_ms = (time.perf_counter() - started) * 1000
+warm_ms = 0.0
+if {warm!r}:
+    from core.warmup import warm_up
+    warm_ms = sum(warm_up().values())
+from django.test import Client
+client = Client()
+first = time.perf_counter()
+client.get({path!r})
+first_ms = (time.perf_counter() - first) * 1000
+second = time.perf_counter()
+client.get({path!r})
+second_ms = (time.perf_counter() - second) * 1000
+print(json.dumps({{"setup": setup_ms, "warm": warm_ms, "first": first_ms, "second": second_ms}}))
+"""
+
+
+def run(path: str, warm: bool) -> dict[str, float]:
+    env = {**os.environ, "DJANGO_DEBUG": os.environ.get("DJANGO_DEBUG", "0")}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=str(ROOT), warm=warm, path=path)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/login/")
+    args = parser.parse_args()
+
+    for warm in (False, True):
+        results = [run(args.path, warm) for _ in range(args.runs)]
+        summary = " ".join(
+            f"{key}={statistics.median(result[key] for result in results):.1f}ms"
+            for key in ("setup", "warm", "first", "second")
+        )
+        print(f"{'warm-up' if warm else 'cold   '} {args.path}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
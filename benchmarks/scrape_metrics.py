@@ -0,0 +1,116 @@
+"""Local stand-in for a Prometheus scraper.
+
+Fetches /metrics/, prints latency and query-count percentiles per view and service,
+DomainError counts and lock waits:
+
+    METRICS_TOKEN=... python benchmarks/scrape_metrics.py --url http://127.0.0.1:8000/metrics/
+    python benchmarks/scrape_metrics.py --interval 15   # scrape repeatedly, show the delta
+"""
+
+import argparse
+import os
+import time
+import urllib.request
+from collections import defaultdict
+
+from prometheus_client.parser import text_string_to_metric_families
+
+HISTOGRAMS = {
+    "school_view_latency_seconds": (1000, "ms", True),
+    "school_view_queries": (1, "užkl.", False),
+    "school_service_latency_seconds": (1000, "ms", True),
+    "school_service_queries": (1, "užkl.", False),
+    "school_lock_wait_seconds": (1000, "ms", True),
+    "school_job_duration_seconds": (1000, "ms", True),
+    "school_job_queue_delay_seconds": (1000, "ms", True),
+}
+
+
+def scrape(url: str, token: str) -> dict:
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        text = response.read().decode("utf-8")
+    histograms = defaultdict(lambda: defaultdict(dict))
+    counters = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if family.name in HISTOGRAMS and sample.name.endswith("_bucket"):
+                labels = dict(sample.labels)
+                bound = float(labels.pop("le"))
+                key = tuple(sorted(labels.items()))
+                histograms[family.name][key][bound] = sample.value
+            elif family.name == "school_domain_errors" and sample.name.endswith("_total"):
+                counters[(sample.labels["service"], sample.labels["message"])] = sample.value
+    return {"histograms": histograms, "counters": counters}
+
+
+def subtract(current: dict, previous: dict | None) -> dict:
+    if previous is None:
+        return current
+    histograms = defaultdict(lambda: defaultdict(dict))
+    for name, series in current["histograms"].items():
+        for key, buckets in series.items():
+            before = previous["histograms"].get(name, {}).get(key, {})
+            histograms[name][key] = {bound: value - before.get(bound, 0) for bound, value in buckets.items()}
+    counters = {key: value - previous["counters"].get(key, 0) for key, value in current["counters"].items()}
+    return {"histograms": histograms, "counters": counters}
+
+
+def quantile(buckets: dict[float, float], fraction: float, interpolate: bool) -> float:
+    ordered = sorted(buckets.items())
+    total = ordered[-1][1]
+    lower_bound, lower_count = 0.0, 0.0
+    for bound, count in ordered:
+        if count >= total * fraction:
+            if bound == float("inf"):
+                return lower_bound
+            if count == lower_count or not interpolate:
+                return bound
+            return lower_bound + (bound - lower_bound) * (total * fraction - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+def report(snapshot: dict) -> None:
+    for name, (scale, unit, interpolate) in HISTOGRAMS.items():
+        series = snapshot["histograms"].get(name, {})
+        rows = [(dict(key), buckets) for key, buckets in series.items() if max(buckets.values(), default=0) > 0]
+        if not rows:
+            continue
+        print(f"\n{name}")
+        for labels, buckets in sorted(rows, key=lambda row: -max(row[1].values())):
+            title = " ".join(f"{key}={value}" for key, value in labels.items())
+            values = []
+            for q in (0.5, 0.95, 0.99):
+                value = quantile(buckets, q, interpolate) * scale
+                values.append(
+                    f"p{int(q * 100)}={value:.1f}{unit}" if interpolate else f"p{int(q * 100)}≤{value:g}{unit}"
+                )
+            print(f"  {title:<60} n={max(buckets.values()):>7.0f} " + " ".join(values))
+    errors = [(key, value) for key, value in snapshot["counters"].items() if value > 0]
+    if errors:
+        print("\nschool_domain_errors_total")
+        for (service, message), value in sorted(errors, key=lambda item: -item[1]):
+            print(f"  {service:<35} {value:>6.0f}  {message}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000/metrics/")
+    parser.add_argument("--token", default=os.environ.get("METRICS_TOKEN", ""))
+    parser.add_argument("--interval", type=float, default=0)
+    args = parser.parse_args()
+
+    previous = None
+    while True:
+        current = scrape(args.url, args.token)
+        print(f"--- {time.strftime('%H:%M:%S')} {args.url}")
+        report(subtract(current, previous))
+        if not args.interval:
+            return
+        previous = current
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
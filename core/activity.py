@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .db.routers import use_primary
+from .models import PointTransaction, Semester
+
+
+@dataclass(frozen=True)
+class ActivityEntry:
+    id: int
+    created_at: datetime
+    student_profile_id: int
+    student_name: str
+    message: str
+    points_delta: int
+    tx_type: str
+    teacher_name: str | None
+
+
+@dataclass
+class ActivityFeed:
+    entries: list[ActivityEntry]
+    truncated: bool
+
+
+def activity_cache_key(semester_id: int) -> str:
+    return f"activity:semester:{semester_id}"
+
+
+def _entry(tx: PointTransaction) -> ActivityEntry:
+    teacher_profile = getattr(tx.created_by, "teacher_profile", None)
+    return ActivityEntry(
+        id=tx.id,
+        created_at=tx.created_at,
+        student_profile_id=tx.student_profile_id,
+        student_name=tx.student_profile.display_name,
+        message=tx.message,
+        points_delta=tx.points_delta,
+        tx_type=tx.tx_type,
+        teacher_name=teacher_profile.display_name if teacher_profile else None,
+    )
+
+
+def _ledger(semester_id: int):
+    return PointTransaction.objects.filter(semester_id=semester_id).select_related(
+        "student_profile", "created_by__teacher_profile"
+    )
+
+
+def load_activity_feed(semester_id: int) -> ActivityFeed:
+    size = settings.ACTIVITY_FEED_SIZE
+    with use_primary():
+        rows = list(_ledger(semester_id).order_by("-created_at", "-id")[: size + 1])
+    return ActivityFeed(entries=[_entry(tx) for tx in rows[:size]], truncated=len(rows) > size)
+
+
+def _generation_key(key: str) -> str:
+    return f"{key}:generation"
+
+
+def _bump_generation(key: str) -> None:
+    try:
+        cache.incr(_generation_key(key))
+    except ValueError:
+        cache.set(_generation_key(key), 1, None)
+
+
+def _drop(key: str) -> None:
+    _bump_generation(key)
+    cache.delete(key)
+
+
+def activity_feed(semester: Semester) -> ActivityFeed:
+    if not settings.CACHE_SHARED:
+        # A write appends to the buffer of the worker that handled it; the others would keep a stale feed.
+        return load_activity_feed(semester.pk)
+    key = activity_cache_key(semester.pk)
+    feed = cache.get(key)
+    if feed is None:
+        generation = cache.get(_generation_key(key))
+        feed = load_activity_feed(semester.pk)
+        # A write that commits while the ledger is read finds no buffer to append to and bumps the generation
+        # instead; add() never replaces a buffer another request already built, and a stale one is dropped.
+        cache.add(key, feed, settings.ACTIVITY_FEED_TIMEOUT)
+        if cache.get(_generation_key(key)) != generation:
+            cache.delete(key)
+    return feed
+
+
+def append_activity(tx_id: int, semester_id: int) -> None:
+    if not settings.CACHE_SHARED:
+        return
+    key = activity_cache_key(semester_id)
+    lock_key, dirty_key = f"{key}:lock", f"{key}:dirty"
+    # A concurrent read-modify-write would drop an entry: the writer that misses the lock marks the buffer dirty,
+    # and whoever holds the lock drops a dirty buffer, so the next read rebuilds it from the ledger.
+    if not cache.add(lock_key, 1, 5):
+        cache.set(dirty_key, 1, 5)
+        _drop(key)
+        return
+    try:
+        feed = cache.get(key)
+        if feed is None:
+            _drop(key)
+            return
+        if any(entry.id == tx_id for entry in feed.entries):
+            return
+        with use_primary():
+            tx = _ledger(semester_id).filter(pk=tx_id).first()
+        if tx is None:
+            return
+        entries = sorted([_entry(tx), *feed.entries], key=lambda entry: (entry.created_at, entry.id), reverse=True)
+        size = settings.ACTIVITY_FEED_SIZE
+        cache.set(
+            key,
+            ActivityFeed(entries=entries[:size], truncated=feed.truncated or len(entries) > size),
+            settings.ACTIVITY_FEED_TIMEOUT,
+        )
+    finally:
+        if cache.get(dirty_key):
+            _drop(key)
+            cache.delete(dirty_key)
+        cache.delete(lock_key)
+
+
+def invalidate_activity_feed(semester_id: int) -> None:
+    _drop(activity_cache_key(semester_id))
+
+
+def invalidate_school_activity_feeds(school_id: int) -> None:
+    for semester_id in Semester._base_manager.filter(school_id=school_id).values_list("pk", flat=True):
+        invalidate_activity_feed(semester_id)
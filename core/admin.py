@@ -1,5 +1,13 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.urls import path
 
 from .models import (
     User,
@@ -7,21 +15,133 @@ from .models import (
     TeacherProfile,
     GroupPurchase,
     GroupContribution,
+    School,
     SchoolSettings,
     Semester,
     TeacherBudget,
     BonusItem,
     BonusRedemptionRequest,
     PointTransaction,
+    PointDailyRollup,
+    ViewProfile,
+    BackgroundJob,
+    name_prefix_q,
 )
+from .budgets import allocate_teacher_budgets
+from .forms import BudgetAllocationForm
+from .jobs import retry_failed_jobs
+from .rollups import points_report
+from .services import DomainError, get_active_semester
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class SemesterListFilter(admin.SimpleListFilter):
+    title = "semestras"
+    parameter_name = "semester"
+    semester_field = "semester"
+    all_value = "all"
+
+    def lookups(self, request, model_admin):
+        semesters = Semester.objects.filter(school_id=request.school_id).order_by("-start_date")
+        return [(str(semester.id), semester.name) for semester in semesters]
+
+    def value(self):
+        value = super().value()
+        if value is not None:
+            return value
+        try:
+            return str(get_active_semester().id)
+        except DomainError:
+            return self.all_value
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.value() == self.all_value,
+            "query_string": changelist.get_query_string({self.parameter_name: self.all_value}),
+            "display": "Visi",
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
+
+    def queryset(self, request, queryset):
+        if self.value() == self.all_value:
+            return queryset
+        return queryset.filter(**{self.semester_field: self.value()})
+
+
+class GroupPurchaseSemesterListFilter(SemesterListFilter):
+    semester_field = "group_purchase__semester"
+
+
+class SchoolScopedAdminMixin:
+    school_lookup = "semester__school"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(**{self.school_lookup: request.school_id})
+
+
+class LargeTableAdminMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    student_field = "student_profile"
+    search_help_text = "Mokinio vardo pradžia arba tikslus vartotojo vardas."
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Two subqueries, so each match runs on its own index: (school, search_name) and the unique username.
+        by_name = StudentProfile.objects.filter(name_prefix_q(search_term)).values("id")
+        by_username = StudentProfile.objects.filter(user__username=search_term).values("id")
+        return (
+            queryset.filter(
+                Q(**{f"{self.student_field}__in": by_name}) | Q(**{f"{self.student_field}__in": by_username})
+            ),
+            False,
+        )
 
 
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
-    fieldsets = DjangoUserAdmin.fieldsets + (("Rolė", {"fields": ("role",)}),)
+    fieldsets = DjangoUserAdmin.fieldsets + (("Rolė", {"fields": ("role", "school")}),)
     add_fieldsets = DjangoUserAdmin.add_fieldsets + ((None, {"fields": ("role",)}),)
     list_display = ("username", "email", "role", "is_staff")
 
+    def get_queryset(self, request):
+        # The same school that belongs_to_current_school() checks at sign-in: the profile's, else the user's own.
+        return (
+            super()
+            .get_queryset(request)
+            .filter(
+                Q(student_profile__school=request.school_id)
+                | Q(teacher_profile__school=request.school_id)
+                | Q(student_profile__isnull=True, teacher_profile__isnull=True, school=request.school_id)
+            )
+        )
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly_fields = super().get_readonly_fields(request, obj)
+        return readonly_fields if request.user.is_superuser else (*readonly_fields, "school")
+
 
 @admin.register(StudentProfile)
 class StudentProfileAdmin(admin.ModelAdmin):
@@ -39,25 +159,63 @@ class TeacherProfileAdmin(admin.ModelAdmin):
 class SemesterAdmin(admin.ModelAdmin):
     list_display = ("name", "start_date", "end_date", "is_active")
     list_filter = ("is_active",)
+    actions = ["allocate_budgets"]
+
+    @admin.action(description="Paskirstyti mokytojų biudžetus")
+    def allocate_budgets(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, "Pasirinkite vieną semestrą.", messages.ERROR)
+            return None
+        semester = queryset.get()
+        form = BudgetAllocationForm(request.POST if "apply" in request.POST else None)
+        if form.is_valid():
+            try:
+                count = allocate_teacher_budgets(semester, **form.cleaned_data)
+            except DomainError as exc:
+                self.message_user(request, exc.message, messages.ERROR)
+            else:
+                self.message_user(request, f"{semester.name}: paskirstyta {count} mokytojų biudžetų.")
+                return None
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Paskirstyti mokytojų biudžetus",
+            "semester": semester,
+            "form": form,
+            "action_checkbox_name": admin.helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(request, "admin/core/semester/allocate_budgets.html", context)
 
 
 @admin.register(TeacherBudget)
-class TeacherBudgetAdmin(admin.ModelAdmin):
+class TeacherBudgetAdmin(SchoolScopedAdminMixin, admin.ModelAdmin):
     list_display = ("teacher_profile", "semester", "allocated_points", "spent_points")
     list_filter = ("semester",)
 
 
 @admin.register(GroupPurchase)
-class GroupPurchaseAdmin(admin.ModelAdmin):
+class GroupPurchaseAdmin(SchoolScopedAdminMixin, admin.ModelAdmin):
     list_display = ("bonus_item", "semester", "status", "created_at")
     list_filter = ("status", "semester")
 
 
 @admin.register(GroupContribution)
-class GroupContributionAdmin(admin.ModelAdmin):
+class GroupContributionAdmin(SchoolScopedAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    school_lookup = "group_purchase__semester__school"
     list_display = ("group_purchase", "student_profile", "amount", "confirmed_at", "updated_at")
-    list_filter = ("group_purchase__semester",)
-    search_fields = ("student_profile__display_name",)
+    list_filter = (GroupPurchaseSemesterListFilter,)
+    list_select_related = ("group_purchase__bonus_item", "group_purchase__semester", "student_profile")
+    search_fields = ("^student_profile__display_name",)
+    raw_id_fields = ("group_purchase", "student_profile")
+
+
+@admin.register(School)
+class SchoolAdmin(admin.ModelAdmin):
+    list_display = ("name", "domain", "is_default")
+    search_fields = ("name", "domain")
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser
 
 
 @admin.register(SchoolSettings)
@@ -76,7 +234,7 @@ class BonusItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(BonusRedemptionRequest)
-class BonusRedemptionRequestAdmin(admin.ModelAdmin):
+class BonusRedemptionRequestAdmin(SchoolScopedAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "bonus_item",
         "student_profile",
@@ -85,16 +243,134 @@ class BonusRedemptionRequestAdmin(admin.ModelAdmin):
         "created_at",
         "decided_at",
     )
-    list_filter = ("status", "semester")
-    search_fields = (
-        "bonus_item__title_lt",
-        "student_profile__display_name",
-        "requested_teacher__display_name",
-    )
+    list_filter = (SemesterListFilter, "status", "bonus_item")
+    list_select_related = ("bonus_item", "student_profile", "requested_teacher")
+    search_fields = ("^student_profile__display_name",)
+    raw_id_fields = ("student_profile", "decided_by")
 
 
 @admin.register(PointTransaction)
-class PointTransactionAdmin(admin.ModelAdmin):
+class PointTransactionAdmin(SchoolScopedAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ("student_profile", "tx_type", "points_delta", "semester", "created_at")
-    list_filter = ("tx_type", "semester")
-    search_fields = ("student_profile__display_name", "message")
+    list_filter = (SemesterListFilter, "tx_type")
+    list_select_related = ("student_profile", "semester")
+    search_fields = ("^student_profile__display_name",)
+    ordering = ("-id",)
+    raw_id_fields = ("student_profile", "created_by", "bonus_item")
+
+
+@admin.register(PointDailyRollup)
+class PointDailyRollupAdmin(SchoolScopedAdminMixin, admin.ModelAdmin):
+    list_display = ("date", "semester", "teacher_profile", "class_name", "tx_type", "points_total", "tx_count")
+    list_filter = ("semester", "tx_type")
+    list_select_related = ("semester", "teacher_profile")
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                "report/",
+                self.admin_site.admin_view(self.report_view),
+                name="core_pointdailyrollup_report",
+            ),
+        ] + super().get_urls()
+
+    def report_view(self, request):
+        semesters = Semester.objects.filter(school_id=request.school_id).order_by("-start_date")
+        semester_id = request.GET.get("semester")
+        semester = semesters.filter(pk=semester_id).first() if semester_id else None
+        if semester is None:
+            semester = semesters.filter(is_active=True).first() or semesters.first()
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Taškų ataskaita",
+            "semesters": semesters,
+            "semester": semester,
+            "report": points_report(semester) if semester else None,
+        }
+        return TemplateResponse(request, "admin/core/pointdailyrollup/report.html", context)
+
+
+@admin.register(ViewProfile)
+class ViewProfileAdmin(admin.ModelAdmin):
+    list_display = ("view_name", "sample_count", "slow_sample_count", "average_ms", "max_ms", "updated_at")
+    ordering = ("-total_ms",)
+    fields = (
+        "view_name",
+        "sample_count",
+        "slow_sample_count",
+        "average_ms",
+        "max_ms",
+        "last_path",
+        "updated_at",
+        "hot_functions_table",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Vidutinė trukmė, ms")
+    def average_ms(self, obj):
+        return round(obj.total_ms / obj.sample_count, 1) if obj.sample_count else 0
+
+    @admin.display(description="Karščiausios funkcijos")
+    def hot_functions_table(self, obj):
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+            (
+                (
+                    row["function"],
+                    row["caller"] or "-",
+                    row["calls"],
+                    f"{row['cumtime_ms'] / obj.sample_count:.1f}",
+                    f"{row['tottime_ms'] / obj.sample_count:.1f}",
+                )
+                for row in obj.hot_functions
+            ),
+        )
+        return format_html(
+            "<table><thead><tr><th>Funkcija</th><th>Kviečia</th><th>Kvietimai</th>"
+            "<th>Bendra, ms/užkl.</th><th>Sava, ms/užkl.</th></tr></thead><tbody>{}</tbody></table>",
+            rows,
+        )
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "max_attempts", "run_after", "finished_at", "locked_by")
+    list_filter = ("status", "name")
+    ordering = ("-id",)
+    readonly_fields = (
+        "name",
+        "payload",
+        "unique_key",
+        "status",
+        "attempts",
+        "max_attempts",
+        "run_after",
+        "locked_by",
+        "locked_at",
+        "last_error",
+        "created_at",
+        "finished_at",
+    )
+    actions = ["retry_jobs"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Pakartoti nepavykusias užduotis")
+    def retry_jobs(self, request, queryset):
+        self.message_user(request, f"Pakartoti suplanuota užduočių: {retry_failed_jobs(queryset)}.")
@@ -0,0 +1,59 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .db.routers import use_primary
+from .models import User
+from .tenants import belongs_to_current_school
+
+PROFILE_RELATIONS = ("teacher_profile", "student_profile")
+
+
+def _without_user(profile):
+    if profile is None:
+        return None
+    # select_related links the profile back to its user; drop that link so the password hash is not cached with it.
+    detached = copy.copy(profile)
+    detached._state = copy.copy(profile._state)
+    detached._state.fields_cache = {}
+    return detached
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user-profiles:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def user_can_authenticate(self, user) -> bool:
+        return super().user_can_authenticate(user) and belongs_to_current_school(user)
+
+    def get_user(self, user_id):
+        # The user row itself (password hash, is_active, role) is read on every request, so a password change or
+        # deactivation takes effect at once in every worker; only the profiles are cached.
+        key = user_cache_key(user_id)
+        # invalidate_cached_user() in another worker cannot reach this process's locmem cache.
+        profiles = cache.get(key) if settings.CACHE_SHARED else None
+        users = User._default_manager.filter(pk=user_id)
+        if profiles is None:
+            users = users.select_related(*PROFILE_RELATIONS)
+        with use_primary():
+            user = users.first()
+        if user is None:
+            return None
+        if profiles is None:
+            if settings.CACHE_SHARED:
+                profiles = {name: _without_user(getattr(user, name, None)) for name in PROFILE_RELATIONS}
+                cache.set(key, profiles, getattr(settings, "USER_CACHE_TIMEOUT", 300))
+        else:
+            for name, profile in profiles.items():
+                relation = getattr(User, name).related
+                relation.set_cached_value(user, profile)
+                if profile is not None:
+                    relation.field.set_cached_value(profile, user)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+from .models import StudentProfile, name_prefix_q, name_search_key
+from .tenants import current_school_id
+
+
+@dataclass(frozen=True)
+class StudentMatches:
+    results: list[dict]
+    complete: bool
+
+
+class PrefixCache:
+    def __init__(self) -> None:
+        self.entries: OrderedDict[tuple[int | None, str, str], tuple[float, StudentMatches]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: tuple[int | None, str, str]) -> StudentMatches | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: tuple[int | None, str, str], matches: StudentMatches) -> None:
+        with self.lock:
+            self.entries[key] = (time.monotonic() + settings.AUTOCOMPLETE_CACHE_TIMEOUT, matches)
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.AUTOCOMPLETE_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+_prefix_cache = PrefixCache()
+
+
+def clear_autocomplete_cache() -> None:
+    _prefix_cache.clear()
+
+
+def encode_matches(matches: StudentMatches) -> bytes:
+    return json.dumps(
+        {"results": matches.results, "complete": matches.complete}, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def _within_budget(results: list[dict]) -> list[dict]:
+    budget = settings.AUTOCOMPLETE_MAX_BYTES - len(encode_matches(StudentMatches(results=[], complete=False)))
+    kept = []
+    for row in results:
+        budget -= len(json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode()) + 1
+        if budget < 0:
+            break
+        kept.append(row)
+    return kept
+
+
+def matching_students(term: str, class_name: str) -> QuerySet:
+    students = StudentProfile.objects.all()
+    if term:
+        students = students.filter(name_prefix_q(term))
+    if class_name:
+        students = students.filter(class_name__iexact=class_name)
+    return students.order_by("display_name", "id").values_list("id", "display_name", "class_name")
+
+
+def _load_matches(term: str, class_name: str) -> StudentMatches:
+    limit = settings.AUTOCOMPLETE_LIMIT
+    rows = list(matching_students(term, class_name)[: limit + 1])
+    results = [{"id": pk, "name": name, "class": student_class} for pk, name, student_class in rows[:limit]]
+    kept = _within_budget(results)
+    return StudentMatches(results=kept, complete=len(rows) <= limit and len(kept) == len(results))
+
+
+def search_students(term: str, class_name: str = "") -> StudentMatches:
+    term = " ".join(term.split())
+    class_name = class_name.strip()
+    if not term and not class_name:
+        return StudentMatches(results=[], complete=True)
+    school_id, prefix, class_key = current_school_id(), name_search_key(term), class_name.casefold()
+    matches = _prefix_cache.get((school_id, prefix, class_key))
+    if matches is not None:
+        return matches
+    # A complete answer for a shorter prefix already holds every match for a longer one: typing needs no query.
+    for length in range(len(prefix) - 1, -1 if class_key else 0, -1):
+        shorter = _prefix_cache.get((school_id, prefix[:length], class_key))
+        if shorter is not None and shorter.complete:
+            matches = StudentMatches(
+                results=[row for row in shorter.results if name_search_key(row["name"]).startswith(prefix)],
+                complete=True,
+            )
+            break
+    else:
+        matches = _load_matches(term, class_name)
+    _prefix_cache.set((school_id, prefix, class_key), matches)
+    return matches
@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models import Count
+
+from .models import PointTransaction, Semester, TeacherBudget, TeacherProfile
+from .services import DomainError
+
+
+class AllocationMode:
+    FLAT = "flat"
+    CARRY_OVER = "carry_over"
+    PER_STUDENT = "per_student"
+
+    choices = [
+        (FLAT, "Vienoda suma"),
+        (CARRY_OVER, "Kaip ankstesniame semestre"),
+        (PER_STUDENT, "Pagal mokinių skaičių"),
+    ]
+
+
+def previous_semester(semester: Semester) -> Semester | None:
+    return (
+        Semester.objects.filter(school_id=semester.school_id, start_date__lte=semester.start_date)
+        .exclude(pk=semester.pk)
+        .order_by("-start_date", "-pk")
+        .first()
+    )
+
+
+def students_taught(semester: Semester) -> dict[int, int]:
+    rows = (
+        PointTransaction.objects.filter(semester=semester, tx_type=PointTransaction.TxType.AWARD)
+        .values("created_by__teacher_profile")
+        .annotate(students=Count("student_profile", distinct=True))
+        .order_by()
+    )
+    return {row["created_by__teacher_profile"]: row["students"] for row in rows}
+
+
+def planned_allocations(
+    semester: Semester,
+    mode: str,
+    amount: int = 0,
+    source: Semester | None = None,
+    include_unspent: bool = False,
+) -> dict[int, int]:
+    teacher_ids = list(
+        TeacherProfile.objects.filter(school_id=semester.school_id).order_by("pk").values_list("pk", flat=True)
+    )
+    if mode == AllocationMode.FLAT:
+        return {teacher_id: amount for teacher_id in teacher_ids}
+
+    source = source or previous_semester(semester)
+    if source is None:
+        raise DomainError("Nerastas ankstesnis semestras.")
+
+    if mode == AllocationMode.CARRY_OVER:
+        previous = {
+            budget["teacher_profile_id"]: budget
+            for budget in TeacherBudget.objects.filter(semester=source).values(
+                "teacher_profile_id", "allocated_points", "spent_points"
+            )
+        }
+        allocations = {}
+        for teacher_id in teacher_ids:
+            budget = previous.get(teacher_id)
+            if budget is None:
+                allocations[teacher_id] = amount
+                continue
+            allocations[teacher_id] = budget["allocated_points"]
+            if include_unspent:
+                allocations[teacher_id] += max(budget["allocated_points"] - budget["spent_points"], 0)
+        return allocations
+
+    if mode == AllocationMode.PER_STUDENT:
+        students = students_taught(source)
+        return {teacher_id: amount * students.get(teacher_id, 0) for teacher_id in teacher_ids}
+
+    raise DomainError("Nežinomas biudžeto paskirstymo būdas.")
+
+
+def allocate_teacher_budgets(
+    semester: Semester,
+    mode: str,
+    amount: int = 0,
+    source: Semester | None = None,
+    include_unspent: bool = False,
+    minimum: int = 0,
+) -> int:
+    if amount < 0 or minimum < 0:
+        raise DomainError("Taškų kiekis negali būti neigiamas.")
+    allocations = planned_allocations(semester, mode, amount, source, include_unspent)
+    with transaction.atomic():
+        # Locked like award_points locks them, so no award can push spent_points past the new allocation.
+        spent = dict(
+            TeacherBudget.objects.select_for_update()
+            .filter(semester=semester, teacher_profile_id__in=allocations)
+            .values_list("teacher_profile_id", "spent_points")
+        )
+        budgets = [
+            TeacherBudget(
+                teacher_profile_id=teacher_id,
+                semester=semester,
+                allocated_points=max(points, minimum, spent.get(teacher_id, 0)),
+            )
+            for teacher_id, points in allocations.items()
+        ]
+        TeacherBudget.objects.bulk_create(
+            budgets,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["teacher_profile", "semester"],
+            update_fields=["allocated_points"],
+        )
+    return len(budgets)
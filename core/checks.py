@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+SHARED_CACHE_FEATURES = [
+    "sesijos ir vartotojų profiliai talpykloje",
+    "mokyklos nustatymų, aktyvaus semestro ir prizų katalogo talpykla",
+    "mokinio skydelio santrauka ir likučio grafikas",
+    "skydelių naujausios veiklos sąrašai",
+    "Top 5 reitingo talpykla",
+]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs=None, **kwargs):
+    # locmem stays per process, so these caches are skipped rather than served stale; that is correct but slow.
+    if settings.CACHE_SHARED:
+        return []
+    return [
+        Warning(
+            "CACHE_SHARED išjungta, todėl neveikia: " + ", ".join(SHARED_CACHE_FEATURES) + ".",
+            hint="Produkcijoje nustatykite CACHE_BACKEND=file arba db (CACHE_SHARED=1 numatyta su jomis).",
+            id="core.W001",
+        )
+    ]
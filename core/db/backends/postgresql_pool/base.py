@@ -0,0 +1,107 @@
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from psycopg import IsolationLevel
+
+from ....metrics import DB_POOL_CHECKOUTS, DB_POOL_WAIT
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError as exc:
+    raise ImproperlyConfigured("Ryšių telkiniui reikia paketo psycopg-pool (psycopg[pool]).") from exc
+
+_pools: dict[tuple[str, str], ConnectionPool] = {}
+_acquire_stats: dict[tuple[str, str], dict[str, float]] = {}
+_pools_lock = threading.Lock()
+_acquire_stats_lock = threading.Lock()
+
+
+def pool_stats() -> dict[str, dict[str, float]]:
+    stats = {}
+    for key, pool in list(_pools.items()):
+        with _acquire_stats_lock:
+            acquired = dict(_acquire_stats.get(key, {}))
+        stats[key[0]] = {**pool.get_stats(), **acquired}
+    return stats
+
+
+def close_pools(alias: str | None = None) -> None:
+    with _pools_lock:
+        keys = [key for key in _pools if alias is None or key[0] == alias]
+        for key in keys:
+            _pools.pop(key).close()
+    with _acquire_stats_lock:
+        for key in keys:
+            _acquire_stats.pop(key, None)
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    def pool_options(self) -> dict:
+        options = dict(self.settings_dict["OPTIONS"].get("pool") or {})
+        return {
+            "min_size": int(options.get("min_size", 2)),
+            "max_size": int(options.get("max_size", 10)),
+            "timeout": float(options.get("timeout", 10)),
+            "max_idle": float(options.get("max_idle", 300)),
+            "max_lifetime": float(options.get("max_lifetime", 3600)),
+            "check": ConnectionPool.check_connection if options.get("check", True) else None,
+        }
+
+    @property
+    def pool_key(self) -> tuple[str, str]:
+        return (self.alias, str(self.settings_dict["NAME"]))
+
+    @property
+    def pool(self) -> ConnectionPool:
+        pool = _pools.get(self.pool_key)
+        if pool is not None:
+            return pool
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("Naudojant ryšių telkinį CONN_MAX_AGE turi būti 0.")
+        with _pools_lock:
+            if self.pool_key not in _pools:
+                _pools[self.pool_key] = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    name=self.alias,
+                    open=True,
+                    **self.pool_options(),
+                )
+                with _acquire_stats_lock:
+                    _acquire_stats[self.pool_key] = {
+                        "acquire_count": 0,
+                        "acquire_ms_total": 0.0,
+                        "acquire_ms_max": 0.0,
+                    }
+            return _pools[self.pool_key]
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = IsolationLevel(options.get("isolation_level", IsolationLevel.READ_COMMITTED))
+
+        pool = self.pool
+        started = time.perf_counter()
+        connection = pool.getconn()
+        waited = time.perf_counter() - started
+        DB_POOL_WAIT.labels(database=self.alias).observe(waited)
+        DB_POOL_CHECKOUTS.labels(database=self.alias).inc()
+        with _acquire_stats_lock:
+            stats = _acquire_stats[self.pool_key]
+            stats["acquire_count"] += 1
+            stats["acquire_ms_total"] += waited * 1000
+            stats["acquire_ms_max"] = max(stats["acquire_ms_max"], waited * 1000)
+
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
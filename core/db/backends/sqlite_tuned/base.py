@@ -0,0 +1,44 @@
+import time
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from ....metrics import SQLITE_LOCK_WAIT
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+PROFILE_OPTIONS = ("pragmas", "immediate_transactions")
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        for option in PROFILE_OPTIONS:
+            conn_params.pop(option, None)
+        return conn_params
+
+    def pragmas(self) -> dict:
+        return {**DEFAULT_PRAGMAS, **(self.settings_dict["OPTIONS"].get("pragmas") or {})}
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas().items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        if not self.settings_dict["OPTIONS"].get("immediate_transactions", True):
+            return super()._start_transaction_under_autocommit()
+        # A deferred BEGIN takes the write lock on the first write and fails at once if another writer got there
+        # first; BEGIN IMMEDIATE queues for it up front under busy_timeout, so the wait is measurable here.
+        # This applies to read-only atomic blocks too, since Django cannot tell them apart; views read in autocommit
+        # mode, so only services, jobs and commands (whose re-checks want the lock) queue here.
+        started = time.perf_counter()
+        try:
+            self.cursor().execute("BEGIN IMMEDIATE")
+        finally:
+            SQLITE_LOCK_WAIT.labels(database=self.alias).observe(time.perf_counter() - started)
@@ -0,0 +1,55 @@
+import random
+import time
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from ..metrics import SERVICE_RETRIES
+
+SQLSTATE_REASONS = {
+    "40001": "serialization_failure",
+    "40P01": "deadlock",
+    "55P03": "lock_not_available",
+}
+
+
+def contention_reason(exc: BaseException) -> str | None:
+    if not isinstance(exc, DatabaseError):
+        return None
+    cause = exc.__cause__
+    sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if sqlstate in SQLSTATE_REASONS:
+        return SQLSTATE_REASONS[sqlstate]
+    if "database is locked" in str(exc):
+        return "sqlite_locked"
+    return None
+
+
+def backoff_delay(attempt: int) -> float:
+    ceiling = min(settings.SERVICE_RETRY_BASE_DELAY * 2**attempt, settings.SERVICE_RETRY_MAX_DELAY)
+    return random.uniform(0, ceiling)
+
+
+def retry_on_contention(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except DatabaseError as exc:
+                reason = contention_reason(exc)
+                # Inside an outer transaction the whole block has to be retried by its owner.
+                if (
+                    reason is None
+                    or attempt + 1 >= settings.SERVICE_RETRY_ATTEMPTS
+                    or connections[DEFAULT_DB_ALIAS].in_atomic_block
+                ):
+                    raise
+                SERVICE_RETRIES.labels(service=func.__name__, reason=reason).inc()
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+
+    return wrapper
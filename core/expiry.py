@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.utils import timezone
+
+from .models import BonusRedemptionRequest, GroupContribution, GroupPurchase
+
+ACTIVE_GROUP_STATUSES = [GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION]
+
+
+@dataclass
+class SweepResult:
+    group_purchases: int = 0
+    bonus_requests: int = 0
+
+
+def stale_group_purchases(now=None) -> QuerySet:
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.GROUP_PURCHASE_EXPIRY_DAYS)
+    recent_contribution = GroupContribution.objects.filter(group_purchase=OuterRef("pk"), updated_at__gte=cutoff)
+    return (
+        GroupPurchase.objects.alias(has_recent=Exists(recent_contribution))
+        .filter(status__in=ACTIVE_GROUP_STATUSES)
+        .filter(Q(created_at__lt=cutoff, has_recent=False) | Q(semester__end_date__lt=now.date()))
+    )
+
+
+def stale_bonus_requests(now=None) -> QuerySet:
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.BONUS_REQUEST_EXPIRY_DAYS)
+    return BonusRedemptionRequest.objects.filter(status=BonusRedemptionRequest.Status.PENDING).filter(
+        Q(created_at__lt=cutoff) | Q(semester__end_date__lt=now.date())
+    )
+
+
+def _expire_in_chunks(stale: QuerySet, chunk_size: int, **changes) -> int:
+    expired = 0
+    last_id = 0
+    while True:
+        chunk = list(stale.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not chunk:
+            return expired
+        last_id = chunk[-1]
+        with transaction.atomic():
+            # Lock first, then re-check the policy: a student may have contributed since the chunk was read.
+            locked = list(
+                stale.model.objects.select_for_update().filter(pk__in=chunk).order_by("pk").values_list("pk", flat=True)
+            )
+            expired += stale.filter(pk__in=locked).update(**changes)
+
+
+def sweep_stale(chunk_size: int = 1000, dry_run: bool = False) -> SweepResult:
+    now = timezone.now()
+    purchases = stale_group_purchases(now)
+    bonus_requests = stale_bonus_requests(now)
+    if dry_run:
+        return SweepResult(group_purchases=purchases.count(), bonus_requests=bonus_requests.count())
+    return SweepResult(
+        group_purchases=_expire_in_chunks(purchases, chunk_size, status=GroupPurchase.Status.EXPIRED),
+        bonus_requests=_expire_in_chunks(
+            bonus_requests, chunk_size, status=BonusRedemptionRequest.Status.EXPIRED, decided_at=now
+        ),
+    )
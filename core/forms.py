@@ -1,5 +1,7 @@
 from django import forms
 
+from .budgets import AllocationMode
+
 
 class AwardForm(forms.Form):
     points = forms.IntegerField(
@@ -11,3 +13,14 @@ class AwardForm(forms.Form):
         label="Sveikinimo žinutė",
         widget=forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
     )
+
+
+class BudgetAllocationForm(forms.Form):
+    mode = forms.ChoiceField(label="Paskirstymo būdas", choices=AllocationMode.choices)
+    amount = forms.IntegerField(
+        min_value=0,
+        label="Taškai",
+        help_text="Vienoda suma, taškai vienam mokiniui arba suma mokytojams be ankstesnio biudžeto.",
+    )
+    include_unspent = forms.BooleanField(required=False, label="Perkelti nepanaudotus taškus")
+    minimum = forms.IntegerField(min_value=0, initial=0, label="Mažiausias biudžetas")
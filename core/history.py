@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Q, QuerySet, Sum
+from django.db.models.functions import TruncDate
+
+from .models import PointTransaction, Semester, TeacherBudget, User
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@dataclass(frozen=True)
+class AwardSubtotal:
+    label: str
+    points: int
+    awards: int
+
+
+@dataclass(frozen=True)
+class BudgetBurn:
+    day: date
+    points: int
+    spent: int
+    remaining: int | None
+    percent: int | None
+
+
+@dataclass
+class AwardHistoryPage:
+    awards: list[PointTransaction]
+    next_cursor: str | None
+
+
+def teacher_awards(teacher_user: User, semester: Semester) -> QuerySet:
+    # Matches the (created_by, semester, created_at) index; tx_type is checked on the rows it returns.
+    return PointTransaction.objects.filter(
+        created_by=teacher_user, semester=semester, tx_type=PointTransaction.TxType.AWARD
+    )
+
+
+def encode_cursor(tx: PointTransaction) -> str:
+    return f"{(tx.created_at - EPOCH) // timedelta(microseconds=1)}-{tx.pk}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    micros, _, pk = (cursor or "").partition("-")
+    if not (micros.isdigit() and pk.isdigit()):
+        return None
+    return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+
+
+def award_history_page(
+    teacher_user: User, semester: Semester, cursor: str = "", size: int | None = None
+) -> AwardHistoryPage:
+    size = size or settings.AWARD_HISTORY_PAGE_SIZE
+    awards = teacher_awards(teacher_user, semester)
+    position = decode_cursor(cursor)
+    if position is not None:
+        created_at, pk = position
+        awards = awards.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    rows = list(awards.select_related("student_profile").order_by("-created_at", "-pk")[: size + 1])
+    next_cursor = encode_cursor(rows[size - 1]) if len(rows) > size else None
+    return AwardHistoryPage(awards=rows[:size], next_cursor=next_cursor)
+
+
+def award_subtotals_by_student(teacher_user: User, semester: Semester) -> list[AwardSubtotal]:
+    rows = (
+        teacher_awards(teacher_user, semester)
+        .values("student_profile_id", "student_profile__display_name")
+        .annotate(points=Sum("points_delta"), awards=Count("id"))
+        .order_by("-points", "student_profile__display_name")
+    )
+    return [AwardSubtotal(row["student_profile__display_name"], row["points"], row["awards"]) for row in rows]
+
+
+def award_subtotals_by_class(teacher_user: User, semester: Semester) -> list[AwardSubtotal]:
+    rows = (
+        teacher_awards(teacher_user, semester)
+        .values("student_profile__class_name")
+        .annotate(points=Sum("points_delta"), awards=Count("id"))
+        .order_by("student_profile__class_name")
+    )
+    return [AwardSubtotal(row["student_profile__class_name"], row["points"], row["awards"]) for row in rows]
+
+
+def budget_burn(teacher_user: User, semester: Semester, budget: TeacherBudget | None) -> list[BudgetBurn]:
+    rows = (
+        teacher_awards(teacher_user, semester)
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(points=Sum("points_delta"))
+        .order_by("day")
+    )
+    allocated = budget.allocated_points if budget else None
+    burn = []
+    spent = 0
+    for row in rows:
+        spent += row["points"]
+        burn.append(
+            BudgetBurn(
+                day=row["day"],
+                points=row["points"],
+                spent=spent,
+                remaining=allocated - spent if allocated is not None else None,
+                percent=min(spent * 100 // allocated, 100) if allocated else None,
+            )
+        )
+    return burn
@@ -0,0 +1,128 @@
+import hashlib
+import io
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from .models import SchoolSettings
+
+VARIANT_DIR = "school_variants"
+LOGO_HEIGHTS = (48, 64, 96, 128)
+BACKGROUND_WIDTHS = (1280, 1920)
+
+
+def _store_variant(stem: str, content: bytes, extension: str) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    name = f"{VARIANT_DIR}/{stem}.{digest}.{extension}"
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def _encode(image: Image.Image, image_format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _open_image(field_file) -> Image.Image:
+    field_file.open("rb")
+    try:
+        image = Image.open(field_file)
+        image.load()
+    finally:
+        field_file.close()
+    return ImageOps.exif_transpose(image)
+
+
+def build_logo_variants(field_file) -> dict:
+    image = _open_image(field_file).convert("RGBA")
+    stem = PurePosixPath(field_file.name).stem
+    variants = {"source": field_file.name, "png": {}, "webp": {}}
+    for height in LOGO_HEIGHTS:
+        if height > image.height and variants["png"]:
+            break
+        width = max(round(image.width * min(height, image.height) / image.height), 1)
+        resized = image.resize((width, min(height, image.height)), Image.LANCZOS)
+        variants["png"][str(height)] = _store_variant(f"{stem}-h{height}", _encode(resized, "PNG", optimize=True), "png")
+        variants["webp"][str(height)] = _store_variant(
+            f"{stem}-h{height}", _encode(resized, "WEBP", quality=85, method=6), "webp"
+        )
+    return variants
+
+
+def build_background_variants(field_file) -> dict:
+    image = _open_image(field_file).convert("RGB")
+    stem = PurePosixPath(field_file.name).stem
+    variants = {"source": field_file.name, "jpeg": {}, "webp": {}}
+    for width in BACKGROUND_WIDTHS:
+        if width > image.width and variants["jpeg"]:
+            break
+        height = max(round(image.height * min(width, image.width) / image.width), 1)
+        resized = image.resize((min(width, image.width), height), Image.LANCZOS)
+        variants["jpeg"][str(width)] = _store_variant(
+            f"{stem}-w{width}", _encode(resized, "JPEG", quality=80, optimize=True, progressive=True), "jpg"
+        )
+        variants["webp"][str(width)] = _store_variant(
+            f"{stem}-w{width}", _encode(resized, "WEBP", quality=75, method=6), "webp"
+        )
+    return variants
+
+
+def generate_school_image_variants(settings_row: SchoolSettings) -> dict:
+    variants = dict(settings_row.image_variants or {})
+    for field_name, builder in (("logo", build_logo_variants), ("login_background", build_background_variants)):
+        field_file = getattr(settings_row, field_name)
+        if not field_file:
+            variants.pop(field_name, None)
+            continue
+        if variants.get(field_name, {}).get("source") == field_file.name:
+            continue
+        variants[field_name] = builder(field_file)
+    return variants
+
+
+def variant_url(name: str) -> str:
+    return reverse("school_image_variant", kwargs={"name": PurePosixPath(name).name})
+
+
+def _closest(sizes: dict[str, str], target: int) -> str:
+    size = min((int(key) for key in sizes), key=lambda value: (value < target, abs(value - target)))
+    return sizes[str(size)]
+
+
+def school_logo_context(settings_row: SchoolSettings | None, height: int) -> dict[str, str]:
+    if not settings_row or not settings_row.logo:
+        return {"school_logo_url": "", "school_logo_srcset": "", "school_logo_webp_srcset": ""}
+    variants = (settings_row.image_variants or {}).get("logo")
+    if not variants or variants.get("source") != settings_row.logo.name:
+        return {"school_logo_url": settings_row.logo.url, "school_logo_srcset": "", "school_logo_webp_srcset": ""}
+
+    def srcset(image_format: str) -> str:
+        sizes = variants[image_format]
+        return f"{variant_url(_closest(sizes, height))} 1x, {variant_url(_closest(sizes, height * 2))} 2x"
+
+    return {
+        "school_logo_url": variant_url(_closest(variants["png"], height)),
+        "school_logo_srcset": srcset("png"),
+        "school_logo_webp_srcset": srcset("webp"),
+    }
+
+
+def login_background_context(settings_row: SchoolSettings | None) -> dict[str, str]:
+    empty = {"login_background_url": "", "login_background_webp_url": "", "login_background_small_url": ""}
+    if not settings_row or not settings_row.login_background:
+        return empty
+    variants = (settings_row.image_variants or {}).get("login_background")
+    if not variants or variants.get("source") != settings_row.login_background.name:
+        return {**empty, "login_background_url": settings_row.login_background.url}
+    largest = str(max(int(key) for key in variants["jpeg"]))
+    smallest = str(min(int(key) for key in variants["webp"]))
+    return {
+        "login_background_url": variant_url(variants["jpeg"][largest]),
+        "login_background_webp_url": variant_url(variants["webp"][largest]),
+        "login_background_small_url": variant_url(variants["webp"][smallest]),
+    }
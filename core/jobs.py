@@ -0,0 +1,182 @@
+import os
+import random
+import socket
+import time
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .metrics import JOB_DURATION, JOB_QUEUE_DELAY
+from .models import BackgroundJob
+
+TASKS: dict[str, Callable] = {}
+
+
+def task(name: str) -> Callable:
+    def register(func: Callable) -> Callable:
+        TASKS[name] = func
+        return func
+
+    return register
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(
+    name: str,
+    payload: dict | None = None,
+    *,
+    delay: float = 0,
+    unique_key: str | None = None,
+    max_attempts: int | None = None,
+) -> None:
+    if name not in TASKS:
+        raise ValueError(f"Nežinoma foninė užduotis: {name}")
+    job = BackgroundJob(
+        name=name,
+        payload=payload or {},
+        unique_key=unique_key,
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+    # A pending job with the same unique_key already covers this work.
+    BackgroundJob.objects.bulk_create([job], ignore_conflicts=True)
+
+
+def enqueue_on_commit(name: str, payload: dict | None = None, **options) -> None:
+    transaction.on_commit(lambda: enqueue(name, payload, **options))
+
+
+_recently_enqueued: dict[str, float] = {}
+
+
+def enqueue_debounced_on_commit(name: str, *, unique_key: str, window: float, **options) -> None:
+    # Skips the INSERT when this process already queued the same job within the window. Callers keep the window
+    # shorter than the time the job needs to be sure it is done, so the queued job still picks up this write.
+    def debounced() -> None:
+        now = time.monotonic()
+        last = _recently_enqueued.get(unique_key)
+        if last is not None and now - last < window:
+            return
+        _recently_enqueued[unique_key] = now
+        enqueue(name, unique_key=unique_key, **options)
+
+    transaction.on_commit(debounced)
+
+
+def retry_delay(attempts: int) -> float:
+    ceiling = min(settings.JOB_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0), settings.JOB_RETRY_MAX_DELAY)
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def _reschedule(job: BackgroundJob, **fields) -> None:
+    try:
+        with transaction.atomic():
+            BackgroundJob.objects.filter(pk=job.pk).update(status=BackgroundJob.Status.PENDING, **fields)
+    except IntegrityError:
+        # A newer pending job with the same unique_key will do the same work.
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.Status.FAILED, finished_at=timezone.now(), **fields
+        )
+
+
+def reclaim_stale_jobs() -> int:
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_LOCK_TIMEOUT)
+    stale = list(BackgroundJob.objects.filter(status=BackgroundJob.Status.RUNNING, locked_at__lt=cutoff))
+    for job in stale:
+        _reschedule(job, locked_by="", locked_at=None, last_error=f"Darbuotojas {job.locked_by} nebaigė užduoties.")
+    return len(stale)
+
+
+def claim_jobs(worker: str, limit: int) -> list[BackgroundJob]:
+    now = timezone.now()
+    ready = BackgroundJob.objects.filter(status=BackgroundJob.Status.PENDING, run_after__lte=now).order_by(
+        "run_after", "id"
+    )
+    claim = {
+        "status": BackgroundJob.Status.RUNNING,
+        "locked_by": worker,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            jobs = list(ready.select_for_update(skip_locked=True)[:limit])
+            BackgroundJob.objects.filter(pk__in=[job.pk for job in jobs]).update(**claim)
+    else:
+        # Without SKIP LOCKED workers race on a conditional UPDATE; the loser simply moves on.
+        jobs = [
+            job
+            for job in ready[:limit]
+            if BackgroundJob.objects.filter(pk=job.pk, status=BackgroundJob.Status.PENDING).update(**claim)
+        ]
+    for job in jobs:
+        job.status = BackgroundJob.Status.RUNNING
+        job.locked_by = worker
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def run_job(job: BackgroundJob) -> bool:
+    JOB_QUEUE_DELAY.labels(job=job.name).observe(max((job.locked_at - job.run_after).total_seconds(), 0))
+    started = time.perf_counter()
+    try:
+        func = TASKS.get(job.name)
+        if func is None:
+            raise LookupError(f"Nežinoma foninė užduotis: {job.name}")
+        func(**job.payload)
+    except Exception as exc:
+        JOB_DURATION.labels(job=job.name, status="failed").observe(time.perf_counter() - started)
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts and job.name in TASKS:
+            _reschedule(
+                job,
+                run_after=timezone.now() + timedelta(seconds=retry_delay(job.attempts)),
+                locked_by="",
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            BackgroundJob.objects.filter(pk=job.pk).update(
+                status=BackgroundJob.Status.FAILED, finished_at=timezone.now(), last_error=error
+            )
+        return False
+    JOB_DURATION.labels(job=job.name, status="succeeded").observe(time.perf_counter() - started)
+    BackgroundJob.objects.filter(pk=job.pk).update(status=BackgroundJob.Status.SUCCEEDED, finished_at=timezone.now())
+    return True
+
+
+def run_pending(worker: str | None = None, limit: int = 10) -> int:
+    worker = worker or worker_name()
+    reclaim_stale_jobs()
+    jobs = claim_jobs(worker, limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+def prune_finished_jobs() -> int:
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    deleted, _ = BackgroundJob.objects.filter(status=BackgroundJob.Status.SUCCEEDED, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def retry_failed_jobs(jobs) -> int:
+    retried = 0
+    for job in jobs.filter(status=BackgroundJob.Status.FAILED):
+        try:
+            with transaction.atomic():
+                BackgroundJob.objects.filter(pk=job.pk).update(
+                    status=BackgroundJob.Status.PENDING, attempts=0, run_after=timezone.now(), finished_at=None
+                )
+        except IntegrityError:
+            continue
+        retried += 1
+    return retried
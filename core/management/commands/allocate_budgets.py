@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.budgets import AllocationMode, allocate_teacher_budgets
+from core.models import School, Semester
+from core.services import DomainError, load_active_semester
+from core.tenants import use_school
+
+
+class Command(BaseCommand):
+    help = "Sukuria arba atnaujina mokytojų biudžetus pasirinktam arba kiekvienos mokyklos aktyviam semestrui."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--semester", type=int, help="Semestro ID (numatyta – aktyvus semestras).")
+        parser.add_argument("--school", type=int, help="Mokyklos ID (numatyta – visos mokyklos).")
+        parser.add_argument(
+            "--mode",
+            choices=[value for value, _ in AllocationMode.choices],
+            default=AllocationMode.FLAT,
+        )
+        parser.add_argument(
+            "--amount",
+            type=int,
+            default=0,
+            help="Vienoda suma, taškai vienam mokiniui arba suma mokytojams be ankstesnio biudžeto.",
+        )
+        parser.add_argument("--source", type=int, help="Ankstesnio semestro ID (numatyta – prieš tai buvęs).")
+        parser.add_argument("--include-unspent", action="store_true", help="Perkelti ir nepanaudotus taškus.")
+        parser.add_argument("--minimum", type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        if options["school"] and not School.objects.filter(pk=options["school"]).exists():
+            raise CommandError("Mokykla nerasta.")
+        if options["semester"] or options["school"]:
+            with use_school(options["school"]):
+                self.allocate(options)
+            return
+        # Each school has its own active semester, so without --semester every school is allocated separately.
+        failed = 0
+        for school in School.objects.order_by("pk"):
+            with use_school(school.pk):
+                try:
+                    self.allocate(options)
+                except CommandError as exc:
+                    failed += 1
+                    self.stderr.write(f"{school.name}: {exc}")
+        if failed:
+            raise CommandError(f"Biudžetai nepaskirstyti {failed} mokykl(-ai/-oms).")
+
+    def allocate(self, options) -> None:
+        try:
+            if options["semester"]:
+                semester = Semester.objects.get(pk=options["semester"])
+            else:
+                semester = load_active_semester()
+            source = Semester.objects.get(pk=options["source"]) if options["source"] else None
+            count = allocate_teacher_budgets(
+                semester,
+                options["mode"],
+                amount=options["amount"],
+                source=source,
+                include_unspent=options["include_unspent"],
+                minimum=options["minimum"],
+            )
+        except Semester.DoesNotExist as exc:
+            raise CommandError("Semestras nerastas.") from exc
+        except DomainError as exc:
+            raise CommandError(exc.message) from exc
+        self.stdout.write(self.style.SUCCESS(f"{semester.name}: paskirstyta {count} mokytojų biudžetų."))
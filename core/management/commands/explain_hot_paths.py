@@ -0,0 +1,72 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Semester
+from core.query_plans import (
+    PlanThresholds,
+    render_json,
+    render_markdown,
+    report_meta,
+    run_hot_paths,
+)
+from core.seeding import is_throwaway_database, seed_demo_data
+from core.services import invalidate_active_semester
+from core.tenants import default_school_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Sugeneruoja demonstracinius duomenis, paleidžia core.services funkcijas ir vaizdus, "
+        "užfiksuoja jų SQL bei EXPLAIN (ANALYZE) planus ir pažymi pilnus skenavimus bei rikiavimus. "
+        "Veikia tik su bandomąja DB (test_ pavadinimas arba SQLite failas laikinajame kataloge)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--students", type=int, default=500)
+        parser.add_argument("--teachers", type=int, default=20)
+        parser.add_argument("--transactions", type=int, default=20000)
+        parser.add_argument("--seq-scan-rows", type=int, default=1000)
+        parser.add_argument("--sort-rows", type=int, default=1000)
+        parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
+        parser.add_argument("--output", help="Ataskaitos failas (pvz., benchmarks/history/explain.md).")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Palikti sugeneruotus duomenis (pagal nutylėjimą viskas atšaukiama).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not is_throwaway_database():
+            raise CommandError(
+                "Komanda keičia aktyvų semestrą, todėl paleiskite ją su bandomąja DB, pvz. "
+                "DB_NAME=/tmp/explain.sqlite3 python manage.py migrate && "
+                "DB_NAME=/tmp/explain.sqlite3 python manage.py explain_hot_paths."
+            )
+        thresholds = PlanThresholds(seq_scan_rows=options["seq_scan_rows"], sort_rows=options["sort_rows"])
+        with transaction.atomic():
+            # Only the school the demo semester is seeded into has its active semester switched off.
+            Semester.objects.filter(school_id=default_school_id(), is_active=True).update(is_active=False)
+            invalidate_active_semester()
+            data = seed_demo_data(
+                students=options["students"],
+                teachers=options["teachers"],
+                transactions=options["transactions"],
+            )
+            reports = run_hot_paths(data, thresholds)
+            meta = report_meta(data, thresholds, options["transactions"])
+            if not options["keep"]:
+                transaction.set_rollback(True)
+        invalidate_active_semester()
+
+        render = render_json if options["format"] == "json" else render_markdown
+        output = render(reports, meta)
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(output, encoding="utf-8")
+            flagged = sum(len(report.flags) for report in reports)
+            self.stdout.write(self.style.SUCCESS(f"Ataskaita įrašyta: {path} (įspėjimų: {flagged})"))
+        else:
+            self.stdout.write(output)
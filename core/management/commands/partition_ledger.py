@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Semester
+from core.partitioning import (
+    detach_semester_partition,
+    ledger_is_partitioned,
+    partition_ledger,
+    partitioning_supported,
+    semester_partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Perkelia taškų operacijų žurnalą į Postgres lentelę, skaidomą pagal semestrą "
+        "(LIST PARTITION BY semester_id). SQLite aplinkoje lentelė paliekama įprasta."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--detach",
+            type=int,
+            metavar="SEMESTER_ID",
+            help="Atjungti nurodyto semestro skaidinį nuo žurnalo lentelės.",
+        )
+        parser.add_argument("--drop", action="store_true", help="Atjungtą skaidinį ištrinti.")
+
+    def handle(self, *args, **options) -> None:
+        if not partitioning_supported():
+            self.stdout.write("Duomenų bazė nepalaiko skaidinių – naudojama įprasta lentelė.")
+            return
+
+        if options["detach"]:
+            try:
+                semester = Semester.objects.get(pk=options["detach"])
+            except Semester.DoesNotExist as exc:
+                raise CommandError("Semestras nerastas.") from exc
+            if not detach_semester_partition(semester, drop=options["drop"]):
+                raise CommandError("Žurnalo lentelė nėra skaidoma.")
+            action = "ištrintas" if options["drop"] else "atjungtas"
+            self.stdout.write(self.style.SUCCESS(f"Skaidinys {semester_partition_name(semester.pk)} {action}."))
+            return
+
+        if ledger_is_partitioned():
+            self.stdout.write("Žurnalo lentelė jau skaidoma pagal semestrą.")
+            return
+        partition_ledger()
+        self.stdout.write(self.style.SUCCESS("Žurnalo lentelė perkelta į skaidinius pagal semestrą."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.rollups import rollup_point_transactions
+
+
+class Command(BaseCommand):
+    help = "Atnaujina taškų dienos suvestines nuo paskutinio apdoroto operacijų žurnalo įrašo."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options) -> None:
+        processed = rollup_point_transactions(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Apdorota operacijų: {processed}"))
@@ -0,0 +1,47 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.jobs import prune_finished_jobs, run_pending, worker_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Vykdo fonines užduotis iš BackgroundJob lentelės (paveikslėlių variantai, taškų suvestinės, reitingas). "
+        "PostgreSQL aplinkoje užduotys paimamos su SELECT ... FOR UPDATE SKIP LOCKED, SQLite – apklausiant lentelę."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL)
+        parser.add_argument("--once", action="store_true", help="Įvykdyti paruoštas užduotis ir baigti.")
+
+    def handle(self, *args, **options) -> None:
+        worker = worker_name()
+        stopping = False
+
+        def stop(signum, frame) -> None:
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        total = 0
+        pruned_at = 0.0
+        while not stopping:
+            close_old_connections()
+            if time.monotonic() - pruned_at > 3600:
+                prune_finished_jobs()
+                pruned_at = time.monotonic()
+            processed = run_pending(worker, limit=options["batch_size"])
+            total += processed
+            if not processed:
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        close_old_connections()
+        self.stdout.write(self.style.SUCCESS(f"Įvykdyta užduočių: {total} ({worker})"))
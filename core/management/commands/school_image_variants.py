@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.images import generate_school_image_variants
+from core.models import SchoolSettings
+from core.services import invalidate_school_settings
+
+
+class Command(BaseCommand):
+    help = "Sugeneruoja trūkstamas mokyklos logotipo ir prisijungimo fono versijas."
+
+    def handle(self, *args, **options) -> None:
+        for settings_row in SchoolSettings.objects.all():
+            variants = generate_school_image_variants(settings_row)
+            if variants != settings_row.image_variants:
+                SchoolSettings.objects.filter(pk=settings_row.pk).update(image_variants=variants)
+                self.stdout.write(f"Atnaujinta: {settings_row.name}")
+        invalidate_school_settings()
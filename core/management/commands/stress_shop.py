@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.seeding import is_throwaway_database
+from core.stress import (
+    PATTERNS,
+    build_plans,
+    invariant_violations,
+    parse_mix,
+    remove_stress_data,
+    render_report,
+    run_stress,
+    seed_stress_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Sugeneruoja demonstracinius duomenis ir iš kelių gijų ar procesų vienu metu kviečia redeem_bonus, "
+        "reserve_group_points ir confirm_group_purchase. Parodo pralaidumą, p99 trukmes, DB klaidas "
+        "ir invariantų pažeidimus. Veikia tik su bandomąja DB (test_ pavadinimas arba SQLite failas laikinajame "
+        "kataloge)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+        parser.add_argument("--duration", type=float, default=10.0, help="Trukmė sekundėmis.")
+        parser.add_argument(
+            "--pattern",
+            choices=PATTERNS,
+            default="hot-bonus",
+            help="hot-bonus – visi perka tą patį bonusą, hot-student – keli mokiniai, spread – atsitiktinai.",
+        )
+        parser.add_argument("--mix", default="redeem=60,reserve=30,confirm=10")
+        parser.add_argument("--students", type=int, default=200)
+        parser.add_argument("--bonuses", type=int, default=4)
+        parser.add_argument("--hot-students", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true", help="Palikti sugeneruotus duomenis.")
+
+    def handle(self, *args, **options) -> None:
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if options["workers"] < 1:
+            raise CommandError("Darbuotojų turi būti bent vienas.")
+        if not is_throwaway_database():
+            raise CommandError(
+                "Komanda keičia aktyvų semestrą, todėl paleiskite ją su bandomąja DB, pvz. "
+                "DB_NAME=/tmp/stress.sqlite3 python manage.py migrate && "
+                "DB_NAME=/tmp/stress.sqlite3 python manage.py stress_shop."
+            )
+
+        data = None
+        try:
+            data, previously_active = seed_stress_data(options["students"], options["bonuses"], options["seed"])
+            plans = build_plans(
+                data,
+                workers=options["workers"],
+                pattern=options["pattern"],
+                mix=mix,
+                duration=options["duration"],
+                hot_students=options["hot_students"],
+                seed=options["seed"],
+            )
+            result, elapsed = run_stress(plans, options["mode"])
+            violations = invariant_violations(data)
+        finally:
+            if data is not None and not options["keep"]:
+                remove_stress_data(data, previously_active)
+
+        meta = {
+            "vendor": connection.vendor,
+            "mode": options["mode"],
+            "workers": options["workers"],
+            "pattern": options["pattern"],
+        }
+        self.stdout.write(render_report(result, elapsed, meta, violations))
+        if violations:
+            raise CommandError(f"Rasta invariantų pažeidimų: {len(violations)}.")
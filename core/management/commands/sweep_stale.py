@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.expiry import sweep_stale
+
+
+class Command(BaseCommand):
+    help = (
+        "Pažymi pasenusius grupinius pirkimus (be naujų įnašų GROUP_PURCHASE_EXPIRY_DAYS dienų arba pasibaigusio "
+        "semestro) ir nepatvirtintus bonusų prašymus (senesnius nei BONUS_REQUEST_EXPIRY_DAYS dienų) kaip EXPIRED. "
+        "Rezervuoti taškai atlaisvinami."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Tik suskaičiuoti, nieko nekeisti.")
+
+    def handle(self, *args, **options) -> None:
+        result = sweep_stale(chunk_size=options["chunk_size"], dry_run=options["dry_run"])
+        verb = "Būtų pažymėta" if options["dry_run"] else "Pažymėta"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} EXPIRED: grupinių pirkimų {result.group_purchases} "
+                f"(>{settings.GROUP_PURCHASE_EXPIRY_DAYS} d.), bonusų prašymų {result.bonus_requests} "
+                f"(>{settings.BONUS_REQUEST_EXPIRY_DAYS} d.)."
+            )
+        )
@@ -0,0 +1,24 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = "Nukopijuoja SQLite pagrindinę DB į replikos failą (vietiniam replikos bandymui)."
+
+    def handle(self, *args, **options) -> None:
+        if settings.REPLICA_DATABASE not in connections:
+            raise CommandError("Replika nesukonfigūruota (DB_REPLICA_NAME).")
+        primary, replica = connections["default"], connections[settings.REPLICA_DATABASE]
+        # By vendor rather than ENGINE, so the tuned SQLite backend (DB_SQLITE_PROFILE=1) is accepted too.
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("Komanda skirta tik SQLite; PostgreSQL replikai naudokite srautinę replikaciją.")
+        primary_name, replica_name = primary.settings_dict["NAME"], replica.settings_dict["NAME"]
+        if str(primary_name) == str(replica_name):
+            raise CommandError("Replikos failas sutampa su pagrindine DB.")
+
+        with sqlite3.connect(primary_name) as source, sqlite3.connect(replica_name) as target:
+            source.backup(target)
+        self.stdout.write(self.style.SUCCESS(f"Replika atnaujinta: {replica_name}"))
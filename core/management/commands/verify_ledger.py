@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.verification import verify_ledger
+
+
+class Command(BaseCommand):
+    help = (
+        "Perskaičiuoja mokytojų išleistus taškus, mokinių likučius, bonusų panaudojimus, grupinių pirkimų sumas "
+        "ir dienos suvestines iš operacijų žurnalo ir palygina su saugomomis reikšmėmis."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--chunk-size", type=int, default=250_000)
+        parser.add_argument("--repair", action="store_true", help="Ištaisyti neatitikimus, kuriuos galima ištaisyti.")
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        mismatches = verify_ledger(
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            fix=options["repair"],
+        )
+        for mismatch in mismatches:
+            if mismatch.repaired:
+                status = "ištaisyta"
+            elif mismatch.repairable:
+                status = "galima ištaisyti su --repair"
+            else:
+                status = "reikia patikrinti rankiniu būdu"
+            self.stdout.write(
+                f"[{mismatch.check}] {mismatch.description}: saugoma {mismatch.stored}, "
+                f"apskaičiuota {mismatch.actual} – {status}"
+            )
+
+        elapsed = time.perf_counter() - started
+        remaining = [mismatch for mismatch in mismatches if not mismatch.repaired]
+        if remaining:
+            raise CommandError(
+                f"Rasta neatitikimų: {len(mismatches)}, neištaisyta: {len(remaining)} ({elapsed:.1f} s)."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Neatitikimų neliko: rasta {len(mismatches)} ({elapsed:.1f} s)."))
@@ -0,0 +1,134 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOCK_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+VIEW_LATENCY = Histogram(
+    "school_view_latency_seconds",
+    "Vaizdo užklausos trukmė.",
+    ["view", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+VIEW_QUERIES = Histogram(
+    "school_view_queries",
+    "SQL užklausų skaičius vienam vaizdo kvietimui.",
+    ["view", "method"],
+    buckets=QUERY_BUCKETS,
+)
+SERVICE_LATENCY = Histogram(
+    "school_service_latency_seconds",
+    "Paslaugos funkcijos trukmė.",
+    ["service"],
+    buckets=LATENCY_BUCKETS,
+)
+SERVICE_QUERIES = Histogram(
+    "school_service_queries",
+    "SQL užklausų skaičius vienam paslaugos kvietimui.",
+    ["service"],
+    buckets=QUERY_BUCKETS,
+)
+DOMAIN_ERRORS = Counter(
+    "school_domain_errors",
+    "Paslaugų grąžintos DomainError klaidos.",
+    ["service", "message"],
+)
+SERVICE_RETRIES = Counter(
+    "school_service_retries",
+    "Paslaugų pakartojimai po aklaviečių, serializacijos ar užrakto klaidų.",
+    ["service", "reason"],
+)
+JOB_DURATION = Histogram(
+    "school_job_duration_seconds",
+    "Foninės užduoties vykdymo trukmė.",
+    ["job", "status"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+JOB_QUEUE_DELAY = Histogram(
+    "school_job_queue_delay_seconds",
+    "Laikas nuo numatyto užduoties paleidimo iki jos pradžios.",
+    ["job"],
+    buckets=LATENCY_BUCKETS + (30.0, 60.0, 300.0),
+)
+LOCK_WAIT = Histogram(
+    "school_lock_wait_seconds",
+    "SELECT ... FOR UPDATE užklausų trukmė (laukimas užrakto).",
+    ["table"],
+    buckets=LOCK_WAIT_BUCKETS,
+)
+SQLITE_LOCK_WAIT = Histogram(
+    "school_sqlite_lock_wait_seconds",
+    "SQLite BEGIN IMMEDIATE trukmė (laukimas rašymo užrakto).",
+    ["database"],
+    buckets=LOCK_WAIT_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "school_db_pool_wait_seconds",
+    "Laukimas laisvo ryšio PostgreSQL ryšių telkinyje.",
+    ["database"],
+    buckets=LOCK_WAIT_BUCKETS,
+)
+DB_POOL_CHECKOUTS = Counter(
+    "school_db_pool_checkouts",
+    "Iš PostgreSQL ryšių telkinio paimti ryšiai.",
+    ["database"],
+)
+
+_query_counters: ContextVar[tuple[list[int], ...]] = ContextVar("metrics_query_counters", default=())
+_FOR_UPDATE_TABLE = re.compile(r'\bFROM\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    for counter in _query_counters.get():
+        counter[0] += 1
+    if "FOR UPDATE" not in sql:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        match = _FOR_UPDATE_TABLE.search(sql)
+        LOCK_WAIT.labels(table=match.group(1) if match else "").observe(time.perf_counter() - started)
+
+
+def install_execute_wrapper(connection) -> None:
+    if execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(execute_wrapper)
+
+
+@contextmanager
+def count_queries() -> Iterator[list[int]]:
+    counter = [0]
+    token = _query_counters.set(_query_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _query_counters.reset(token)
+
+
+@contextmanager
+def observe_service(service: str) -> Iterator[None]:
+    started = time.perf_counter()
+    with count_queries() as counter:
+        try:
+            yield
+        finally:
+            SERVICE_LATENCY.labels(service=service).observe(time.perf_counter() - started)
+            SERVICE_QUERIES.labels(service=service).observe(counter[0])
+
+
+def render_latest() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
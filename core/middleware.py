@@ -0,0 +1,114 @@
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404
+from django.http.request import split_domain_port
+
+from .db.routers import replica_alias
+from .metrics import VIEW_LATENCY, VIEW_QUERIES, count_queries
+from .profiling import record_profile, start_profiler
+from .tenants import school_for_host, use_school
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with count_queries() as counter:
+            response = self.get_response(request)
+        view = request.resolver_match.view_name if request.resolver_match else "<unmatched>"
+        VIEW_LATENCY.labels(view=view, method=request.method).observe(time.perf_counter() - started)
+        VIEW_QUERIES.labels(view=view, method=request.method).observe(counter[0])
+        return response
+
+
+class TenantMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        domain, _ = split_domain_port(request.get_host())
+        school_id = school_for_host(domain)
+        if school_id is None:
+            raise Http404("Mokykla nerasta.")
+        request.school_id = school_id
+        with use_school(school_id):
+            return self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE") and replica_alias():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
+
+
+class SamplingProfilerMiddleware:
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.slow_ms = settings.PROFILING_SLOW_MS
+        self.slow_followup = settings.PROFILING_SLOW_FOLLOWUP
+        self.boosted: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        profiler = getattr(request, "_sampling_profiler", None)
+        if profiler is not None:
+            profiler.disable()
+            try:
+                record_profile(
+                    request.resolver_match.view_name,
+                    request.path,
+                    profiler,
+                    elapsed_ms,
+                    slow=elapsed_ms >= self.slow_ms,
+                )
+            except Exception:
+                logger.exception("Nepavyko įrašyti užklausos profilio.")
+        elif elapsed_ms >= self.slow_ms and request.resolver_match is not None:
+            with self.lock:
+                self.boosted[request.resolver_match.view_name] = self.slow_followup
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        if view_name.startswith("admin:") or not self.should_sample(view_name):
+            return None
+        request._sampling_profiler = start_profiler()
+        return None
+
+    def should_sample(self, view_name: str) -> bool:
+        if view_name in self.boosted:
+            with self.lock:
+                remaining = self.boosted.pop(view_name, 0)
+                if remaining > 1:
+                    self.boosted[view_name] = remaining - 1
+                if remaining:
+                    return True
+        return random.random() < self.sample_rate
@@ -0,0 +1,63 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0009_schoolsettings_login_background"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PointDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("class_name", models.CharField(blank=True, max_length=50)),
+                (
+                    "tx_type",
+                    models.CharField(
+                        choices=[("AWARD", "AWARD"), ("REDEEM", "REDEEM"), ("ADMIN_ADJUST", "ADMIN_ADJUST")],
+                        max_length=20,
+                    ),
+                ),
+                ("points_total", models.IntegerField(default=0)),
+                ("tx_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Taškų dienos suvestinė",
+                "verbose_name_plural": "Taškų dienos suvestinės",
+            },
+        ),
+        migrations.CreateModel(
+            name="RollupWatermark",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="pointdailyrollup",
+            name="semester",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, related_name="point_rollups", to="core.semester"
+            ),
+        ),
+        migrations.AddField(
+            model_name="pointdailyrollup",
+            name="teacher_profile",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="point_rollups",
+                to="core.teacherprofile",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pointdailyrollup",
+            index=models.Index(fields=["semester", "date"], name="core_pointd_semeste_f456d8_idx"),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_schoolsettings_image_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("view_name", models.CharField(max_length=200, unique=True)),
+                ("sample_count", models.PositiveIntegerField(default=0)),
+                ("slow_sample_count", models.PositiveIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                ("last_path", models.CharField(blank=True, max_length=500)),
+                ("hot_functions", models.JSONField(blank=True, default=list)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Vaizdo profilis",
+                "verbose_name_plural": "Vaizdų profiliai",
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0014_background_job"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bonusredemptionrequest",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "PENDING"),
+                    ("APPROVED", "APPROVED"),
+                    ("DECLINED", "DECLINED"),
+                    ("EXPIRED", "EXPIRED"),
+                ],
+                default="PENDING",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="grouppurchase",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("OPEN", "OPEN"),
+                    ("AWAITING_CONFIRMATION", "AWAITING_CONFIRMATION"),
+                    ("COMPLETED", "COMPLETED"),
+                    ("EXPIRED", "EXPIRED"),
+                ],
+                default="OPEN",
+                max_length=30,
+            ),
+        ),
+    ]
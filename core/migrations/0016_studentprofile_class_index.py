@@ -0,0 +1,27 @@
+from django.db import migrations
+
+INDEX_NAME = "core_studentprofile_upper_class"
+
+
+def create_class_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON core_studentprofile (UPPER(class_name), display_name)"
+    )
+
+
+def drop_class_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0015_expired_statuses"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_class_index, drop_class_index),
+    ]
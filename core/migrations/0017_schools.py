@@ -0,0 +1,76 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+TENANT_MODELS = ["StudentProfile", "TeacherProfile", "Semester", "BonusItem", "SchoolSettings"]
+
+
+def assign_default_school(apps, schema_editor):
+    School = apps.get_model("core", "School")
+    SchoolSettings = apps.get_model("core", "SchoolSettings")
+    name = SchoolSettings.objects.order_by("pk").values_list("name", flat=True).first() or "Mokykla"
+    school, _ = School.objects.get_or_create(is_default=True, defaults={"name": name, "domain": "localhost"})
+    for model_name in TENANT_MODELS:
+        apps.get_model("core", model_name).objects.update(school=school)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0016_studentprofile_class_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="School",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=200)),
+                ("domain", models.CharField(max_length=255, unique=True)),
+                ("is_default", models.BooleanField(default=False)),
+            ],
+            options={
+                "verbose_name": "Mokykla",
+                "verbose_name_plural": "Mokyklos",
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("is_default", True)), fields=("is_default",), name="unique_default_school"
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="studentprofile",
+            name="school",
+            field=models.ForeignKey(
+                null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, to="core.school"
+            ),
+        ),
+        migrations.AddField(
+            model_name="teacherprofile",
+            name="school",
+            field=models.ForeignKey(
+                null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, to="core.school"
+            ),
+        ),
+        migrations.AddField(
+            model_name="semester",
+            name="school",
+            field=models.ForeignKey(
+                null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, to="core.school"
+            ),
+        ),
+        migrations.AddField(
+            model_name="bonusitem",
+            name="school",
+            field=models.ForeignKey(
+                null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, to="core.school"
+            ),
+        ),
+        migrations.AddField(
+            model_name="schoolsettings",
+            name="school",
+            field=models.OneToOneField(
+                null=True, editable=False, on_delete=django.db.models.deletion.CASCADE, to="core.school"
+            ),
+        ),
+        migrations.RunPython(assign_default_school, migrations.RunPython.noop),
+    ]
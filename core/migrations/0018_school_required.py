@@ -0,0 +1,63 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import core.tenants
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0017_schools"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="studentprofile",
+            name="school",
+            field=models.ForeignKey(
+                default=core.tenants.default_school_id,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="core.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teacherprofile",
+            name="school",
+            field=models.ForeignKey(
+                default=core.tenants.default_school_id,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="core.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="semester",
+            name="school",
+            field=models.ForeignKey(
+                default=core.tenants.default_school_id,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="core.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="bonusitem",
+            name="school",
+            field=models.ForeignKey(
+                default=core.tenants.default_school_id,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="core.school",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="schoolsettings",
+            name="school",
+            field=models.OneToOneField(
+                default=core.tenants.default_school_id,
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="core.school",
+            ),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0018_school_required"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="pointtransaction",
+            index=models.Index(fields=["created_by", "semester", "created_at"], name="core_pointt_created_0c7c32_idx"),
+        ),
+    ]
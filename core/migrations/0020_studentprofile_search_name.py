@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+def fill_search_name(apps, schema_editor):
+    StudentProfile = apps.get_model("core", "StudentProfile")
+    students = list(StudentProfile.objects.only("id", "display_name"))
+    for student in students:
+        student.search_name = student.display_name.casefold()[:150]
+    StudentProfile.objects.bulk_update(students, ["search_name"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0019_pointtransaction_created_by_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentprofile",
+            name="search_name",
+            field=models.CharField(db_index=True, default="", editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+    ]
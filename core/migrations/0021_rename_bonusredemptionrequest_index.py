@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0020_studentprofile_search_name"),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name="bonusredemptionrequest",
+            new_name="core_bonusr_request_57d6c0_idx",
+            old_name="core_bonusr_request_357216_idx",
+        ),
+    ]
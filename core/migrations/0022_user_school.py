@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def assign_user_school(apps, schema_editor):
+    School = apps.get_model("core", "School")
+    User = apps.get_model("core", "User")
+    StudentProfile = apps.get_model("core", "StudentProfile")
+    TeacherProfile = apps.get_model("core", "TeacherProfile")
+    school, _ = School.objects.get_or_create(is_default=True, defaults={"name": "Mokykla", "domain": "localhost"})
+    User.objects.update(
+        school=Coalesce(
+            Subquery(StudentProfile.objects.filter(user=OuterRef("pk")).values("school")[:1]),
+            Subquery(TeacherProfile.objects.filter(user=OuterRef("pk")).values("school")[:1]),
+            school.pk,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0021_rename_bonusredemptionrequest_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="school",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="users",
+                to="core.school",
+            ),
+        ),
+        migrations.RunPython(assign_user_school, migrations.RunPython.noop),
+    ]
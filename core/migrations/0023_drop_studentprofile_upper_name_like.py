@@ -0,0 +1,28 @@
+from django.db import migrations
+
+INDEX_NAME = "core_studentprofile_upper_name_like"
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON core_studentprofile (UPPER(display_name) text_pattern_ops)"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0022_user_school"),
+    ]
+
+    operations = [
+        # Name prefix search reads search_name since 0020; nothing queries the UPPER(display_name) index.
+        migrations.RunPython(drop_prefix_index, create_prefix_index),
+    ]
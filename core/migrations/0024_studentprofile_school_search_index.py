@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0023_drop_studentprofile_upper_name_like"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="studentprofile",
+            name="search_name",
+            field=models.CharField(default="", editable=False, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name="studentprofile",
+            index=models.Index(fields=["school", "search_name"], name="core_student_school_search"),
+        ),
+    ]
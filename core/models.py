@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
+from django.utils import timezone
+
+from .tenants import TenantManager, default_school_id
 
 
 class User(AbstractUser):
@@ -10,39 +13,132 @@ class User(AbstractUser):
         STUDENT = "STUDENT", "STUDENT"
 
     role = models.CharField(max_length=20, choices=Role.choices)
+    # Staff and admins have no profile, so the user row itself records which school they may sign in at.
+    school = models.ForeignKey("School", on_delete=models.CASCADE, null=True, blank=True, related_name="users")
+
+    def save(self, *args, **kwargs) -> None:
+        # Not a field default: Django instantiates the user model during system checks, before any table exists.
+        if self.school_id is None:
+            self.school_id = default_school_id()
+        super().save(*args, **kwargs)
+
+
+class School(models.Model):
+    name = models.CharField(max_length=200)
+    domain = models.CharField(max_length=255, unique=True)
+    is_default = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = "Mokykla"
+        verbose_name_plural = "Mokyklos"
+        constraints = [
+            models.UniqueConstraint(fields=["is_default"], condition=Q(is_default=True), name="unique_default_school")
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def name_search_key(name: str) -> str:
+    return name.casefold()[:150]
+
+
+def name_prefix_q(term: str, field: str = "search_name") -> Q:
+    # A range rather than startswith: SQLite cannot serve LIKE ... ESCAPE from the index, a range it can.
+    prefix = name_search_key(term)
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + "\U0010ffff"})
+
+
+class StudentProfileQuerySet(models.QuerySet):
+    # save() is bypassed by the bulk paths, so they keep search_name in step with display_name themselves.
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for profile in objs:
+            profile.search_name = name_search_key(profile.display_name)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if "display_name" in fields:
+            objs = list(objs)
+            for profile in objs:
+                profile.search_name = name_search_key(profile.display_name)
+            fields = [*fields, "search_name"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        display_name = kwargs.get("display_name")
+        if display_name is None or isinstance(display_name, str):
+            if display_name is not None:
+                kwargs["search_name"] = name_search_key(display_name)
+            return super().update(**kwargs)
+        # An expression is evaluated by the database, so the new names are read back and folded in Python.
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            renamed = list(self.model._base_manager.using(self.db).filter(pk__in=pks).only("pk", "display_name"))
+            for profile in renamed:
+                profile.search_name = name_search_key(profile.display_name)
+            self.model._base_manager.using(self.db).bulk_update(renamed, ["search_name"], batch_size=1000)
+        return rows
 
 
 class StudentProfile(models.Model):
+    school = models.ForeignKey(School, on_delete=models.CASCADE, default=default_school_id, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="student_profile")
     display_name = models.CharField(max_length=150)
     class_name = models.CharField(max_length=50, blank=True)
+    # SQLite only folds ASCII case in LIKE, so prefix search compares Python-casefolded names on every backend.
+    search_name = models.CharField(max_length=150, default="", editable=False)
+
+    objects = TenantManager.from_queryset(StudentProfileQuerySet)()
+
+    class Meta:
+        # Searches always run for one school; the school equality leads so the name range stays on the same index.
+        indexes = [models.Index(fields=["school", "search_name"], name="core_student_school_search")]
 
     def __str__(self) -> str:
         return self.display_name
 
+    def save(self, *args, **kwargs) -> None:
+        self.search_name = name_search_key(self.display_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "display_name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_name"}
+        super().save(*args, **kwargs)
+
 
 class TeacherProfile(models.Model):
+    school = models.ForeignKey(School, on_delete=models.CASCADE, default=default_school_id, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="teacher_profile")
     display_name = models.CharField(max_length=150)
 
+    objects = TenantManager()
+
     def __str__(self) -> str:
         return self.display_name
 
 
 class Semester(models.Model):
+    school = models.ForeignKey(School, on_delete=models.CASCADE, default=default_school_id, editable=False)
     name = models.CharField(max_length=100)
     start_date = models.DateField()
     end_date = models.DateField()
     is_active = models.BooleanField(default=False)
 
+    objects = TenantManager()
+
     def __str__(self) -> str:
         return self.name
 
 
 class SchoolSettings(models.Model):
+    school = models.OneToOneField(School, on_delete=models.CASCADE, default=default_school_id, editable=False)
     name = models.CharField(max_length=200, default="Mokyklos pavadinimas")
     logo = models.ImageField(upload_to="school_logos/", blank=True)
     login_background = models.ImageField(upload_to="school_backgrounds/", blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = TenantManager()
 
     def __str__(self) -> str:
         return self.name
@@ -53,6 +149,7 @@ class GroupPurchase(models.Model):
         OPEN = "OPEN", "OPEN"
         AWAITING_CONFIRMATION = "AWAITING_CONFIRMATION", "AWAITING_CONFIRMATION"
         COMPLETED = "COMPLETED", "COMPLETED"
+        EXPIRED = "EXPIRED", "EXPIRED"
 
     bonus_item = models.ForeignKey("BonusItem", on_delete=models.CASCADE)
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE)
@@ -106,6 +203,7 @@ class BonusItem(models.Model):
         POINTS_RELATED = "POINTS_RELATED", "Pirkiniai susiję su balais"
         OTHER = "OTHER", "Kiti pirkiniai"
 
+    school = models.ForeignKey(School, on_delete=models.CASCADE, default=default_school_id, editable=False)
     title_lt = models.CharField(max_length=200)
     description_lt = models.TextField()
     price_points = models.PositiveIntegerField()
@@ -122,6 +220,8 @@ class BonusItem(models.Model):
         related_name="assigned_bonus_items",
     )
 
+    objects = TenantManager()
+
     class Meta:
         verbose_name = "Pointify.lt pasiūlymas"
         verbose_name_plural = "Pointify.lt pasiūlymai"
@@ -135,6 +235,7 @@ class BonusRedemptionRequest(models.Model):
         PENDING = "PENDING", "PENDING"
         APPROVED = "APPROVED", "APPROVED"
         DECLINED = "DECLINED", "DECLINED"
+        EXPIRED = "EXPIRED", "EXPIRED"
 
     semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name="bonus_redemption_requests")
     bonus_item = models.ForeignKey(BonusItem, on_delete=models.CASCADE, related_name="redemption_requests")
@@ -193,6 +294,7 @@ class PointTransaction(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["semester", "student_profile", "created_at"]),
+            models.Index(fields=["created_by", "semester", "created_at"]),
         ]
         constraints = [
             models.CheckConstraint(
@@ -207,3 +309,94 @@ class PointTransaction(models.Model):
 
     def __str__(self) -> str:
         return f"{self.student_profile} {self.tx_type} {self.points_delta}"
+
+
+class PointDailyRollup(models.Model):
+    date = models.DateField()
+    semester = models.ForeignKey(Semester, on_delete=models.CASCADE, related_name="point_rollups")
+    teacher_profile = models.ForeignKey(
+        TeacherProfile,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="point_rollups",
+    )
+    class_name = models.CharField(max_length=50, blank=True)
+    tx_type = models.CharField(max_length=20, choices=PointTransaction.TxType.choices)
+    points_total = models.IntegerField(default=0)
+    tx_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Taškų dienos suvestinė"
+        verbose_name_plural = "Taškų dienos suvestinės"
+        indexes = [
+            models.Index(fields=["semester", "date"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} {self.tx_type} {self.points_total}"
+
+
+class RollupWatermark(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.last_id}"
+
+
+class ViewProfile(models.Model):
+    view_name = models.CharField(max_length=200, unique=True)
+    sample_count = models.PositiveIntegerField(default=0)
+    slow_sample_count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_path = models.CharField(max_length=500, blank=True)
+    hot_functions = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Vaizdo profilis"
+        verbose_name_plural = "Vaizdų profiliai"
+
+    def __str__(self) -> str:
+        return self.view_name
+
+
+class BackgroundJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Laukia"
+        RUNNING = "RUNNING", "Vykdoma"
+        SUCCEEDED = "SUCCEEDED", "Atlikta"
+        FAILED = "FAILED", "Nepavyko"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    unique_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Foninė užduotis"
+        verbose_name_plural = "Foninės užduotys"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="core_job_status_run_after"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["unique_key"],
+                condition=Q(status="PENDING"),
+                name="unique_pending_job",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
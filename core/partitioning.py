@@ -0,0 +1,128 @@
+from django.db import connection, transaction
+
+from .models import PointTransaction, Semester
+
+LEDGER_TABLE = PointTransaction._meta.db_table
+LEDGER_SEQUENCE = f"{LEDGER_TABLE}_partitioned_id_seq"
+LEGACY_TABLE = f"{LEDGER_TABLE}_unpartitioned"
+DEFAULT_PARTITION = f"{LEDGER_TABLE}_default"
+
+
+def partitioning_supported() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def semester_partition_name(semester_id: int) -> str:
+    return f"{LEDGER_TABLE}_s{int(semester_id)}"
+
+
+def _quote(name: str) -> str:
+    # The DDL below is PostgreSQL-only and built without a connection, so it can be checked on any backend.
+    return f'"{name}"'
+
+
+def _partition_sql(semester_id: int) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {_quote(semester_partition_name(semester_id))} "
+        f"PARTITION OF {_quote(LEDGER_TABLE)} FOR VALUES IN ({int(semester_id)})"
+    )
+
+
+def ledger_is_partitioned() -> bool:
+    if not partitioning_supported():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM pg_partitioned_table p
+            JOIN pg_class c ON c.oid = p.partrelid
+            WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+            """,
+            [LEDGER_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def create_semester_partition(semester: Semester) -> bool:
+    if not ledger_is_partitioned():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(_partition_sql(semester.pk))
+    return True
+
+
+def detach_semester_partition(semester: Semester, drop: bool = False) -> bool:
+    if not ledger_is_partitioned():
+        return False
+    quote = connection.ops.quote_name
+    partition = quote(semester_partition_name(semester.pk))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {quote(LEDGER_TABLE)} DETACH PARTITION {partition}")
+        if drop:
+            cursor.execute(f"DROP TABLE {partition}")
+    return True
+
+
+def _index_sql(name: str, columns: list[str]) -> str:
+    return f"CREATE INDEX {_quote(name)} ON {_quote(LEDGER_TABLE)} ({', '.join(columns)})"
+
+
+def ledger_index_sql() -> list[str]:
+    opts = PointTransaction._meta
+    statements = []
+    for field in opts.local_concrete_fields:
+        if field.db_index and not field.primary_key:
+            statements.append(_index_sql(f"{LEDGER_TABLE}_{field.column}_idx", [_quote(field.column)]))
+        if field.remote_field and field.db_constraint:
+            target = field.target_field
+            statements.append(
+                f"ALTER TABLE {_quote(LEDGER_TABLE)} ADD CONSTRAINT {_quote(f'{LEDGER_TABLE}_{field.column}_fk')} "
+                f"FOREIGN KEY ({_quote(field.column)}) "
+                f"REFERENCES {_quote(target.model._meta.db_table)} ({_quote(target.column)}) "
+                f"DEFERRABLE INITIALLY DEFERRED"
+            )
+    for index in opts.indexes:
+        columns = [
+            _quote(opts.get_field(name.lstrip("-")).column) + (" DESC" if name.startswith("-") else "")
+            for name in index.fields
+        ]
+        statements.append(_index_sql(index.name, columns))
+    return statements
+
+
+def partition_ledger_sql(semester_ids: list[int]) -> list[str]:
+    ledger = _quote(LEDGER_TABLE)
+    legacy = _quote(LEGACY_TABLE)
+    sequence = _quote(LEDGER_SEQUENCE)
+    columns = ", ".join(_quote(field.column) for field in PointTransaction._meta.local_concrete_fields)
+    return [
+        f"LOCK TABLE {ledger} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {ledger} RENAME TO {legacy}",
+        # The primary key of a partitioned table has to include the partition key, and identity
+        # columns are not allowed on partitioned parents before Postgres 17, so ids come from a
+        # plain sequence instead.
+        f"CREATE TABLE {ledger} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY LIST (semester_id)",
+        f"CREATE SEQUENCE {sequence}",
+        f"ALTER TABLE {ledger} ALTER COLUMN id SET DEFAULT nextval('{LEDGER_SEQUENCE}')",
+        f"ALTER SEQUENCE {sequence} OWNED BY {ledger}.id",
+        f"ALTER TABLE {ledger} ADD PRIMARY KEY (id, semester_id)",
+        f"CREATE TABLE {_quote(DEFAULT_PARTITION)} PARTITION OF {ledger} DEFAULT",
+        *(_partition_sql(semester_id) for semester_id in semester_ids),
+        f"INSERT INTO {ledger} ({columns}) SELECT {columns} FROM {legacy}",
+        f"SELECT setval('{LEDGER_SEQUENCE}', COALESCE((SELECT MAX(id) FROM {ledger}), 0) + 1, false)",
+        # Dropping the old table frees its index and constraint names for the recreated ones.
+        f"DROP TABLE {legacy}",
+        *ledger_index_sql(),
+    ]
+
+
+def partition_ledger() -> bool:
+    if not partitioning_supported() or ledger_is_partitioned():
+        return False
+    semester_ids = list(Semester.objects.order_by("pk").values_list("pk", flat=True))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in partition_ledger_sql(semester_ids):
+            cursor.execute(statement)
+    return True
@@ -0,0 +1,95 @@
+import cProfile
+import os
+import pstats
+import sysconfig
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import ViewProfile
+
+_LIBRARY_ROOTS = tuple(
+    sorted(
+        {os.path.join(path, "") for path in (sysconfig.get_paths()["purelib"], sysconfig.get_paths()["stdlib"])},
+        key=len,
+        reverse=True,
+    )
+)
+
+
+def _short_filename(filename: str) -> str:
+    project_root = os.path.join(str(settings.BASE_DIR), "")
+    if filename.startswith(project_root):
+        return filename[len(project_root) :]
+    for root in _LIBRARY_ROOTS:
+        if filename.startswith(root):
+            return filename[len(root) :]
+    return filename
+
+
+def function_label(key: tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name
+    return f"{_short_filename(filename)}:{line}({name})"
+
+
+def hot_functions(profiler: cProfile.Profile, limit: int) -> list[dict]:
+    stats = pstats.Stats(profiler).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    rows = []
+    for key, (_, calls, tottime, cumtime, callers) in ranked:
+        caller = max(callers.items(), key=lambda item: item[1][3])[0] if callers else None
+        rows.append(
+            {
+                "function": function_label(key),
+                "caller": function_label(caller) if caller else "",
+                "calls": calls,
+                "tottime_ms": tottime * 1000,
+                "cumtime_ms": cumtime * 1000,
+            }
+        )
+    return rows
+
+
+def merge_hot_functions(existing: list[dict], fresh: list[dict], limit: int) -> list[dict]:
+    merged = {row["function"]: dict(row) for row in existing}
+    for row in fresh:
+        current = merged.get(row["function"])
+        if current is None:
+            merged[row["function"]] = dict(row)
+            continue
+        current["calls"] += row["calls"]
+        current["tottime_ms"] += row["tottime_ms"]
+        current["cumtime_ms"] += row["cumtime_ms"]
+        current["caller"] = current["caller"] or row["caller"]
+    return sorted(merged.values(), key=lambda row: row["cumtime_ms"], reverse=True)[:limit]
+
+
+def record_profile(view_name: str, path: str, profiler: cProfile.Profile, elapsed_ms: float, slow: bool) -> None:
+    limit = settings.PROFILING_MAX_FUNCTIONS
+    fresh = hot_functions(profiler, limit)
+    with transaction.atomic():
+        profile, created = ViewProfile.objects.select_for_update().get_or_create(view_name=view_name)
+        profile.sample_count += 1
+        profile.slow_sample_count += int(slow)
+        profile.total_ms += elapsed_ms
+        profile.max_ms = max(profile.max_ms, elapsed_ms)
+        profile.last_path = path[:500]
+        profile.hot_functions = merge_hot_functions(profile.hot_functions, fresh, limit)
+        profile.save()
+        if created:
+            stale_ids = list(
+                ViewProfile.objects.order_by("-updated_at").values_list("id", flat=True)[settings.PROFILING_MAX_VIEWS :]
+            )
+            if stale_ids:
+                ViewProfile.objects.filter(id__in=stale_ids).delete()
+
+
+def start_profiler() -> cProfile.Profile | None:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
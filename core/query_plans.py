@@ -0,0 +1,274 @@
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from importlib import import_module
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.db import DatabaseError, connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import views
+from .models import BonusItem, BonusRedemptionRequest, User
+from .seeding import SeededData
+from .services import (
+    DomainError,
+    award_points,
+    bonus_used_count,
+    confirm_bonus_redemption_request,
+    create_bonus_redemption_request,
+    get_active_semester,
+    redeem_bonus,
+    reserve_group_points,
+    student_balance_points,
+    student_reserved_points,
+    top_students,
+)
+
+
+@dataclass
+class PlanThresholds:
+    seq_scan_rows: int = 1000
+    sort_rows: int = 1000
+
+
+@dataclass
+class QueryPlan:
+    sql: str
+    duration_ms: float
+    plan: list[str]
+    flags: list[str]
+
+
+@dataclass
+class HotPathReport:
+    name: str
+    duration_ms: float
+    queries: list[QueryPlan] = field(default_factory=list)
+    error: str = ""
+
+    @property
+    def flags(self) -> list[str]:
+        return [flag for query in self.queries for flag in query.flags]
+
+
+def _explain_postgresql(sql: str, thresholds: PlanThresholds) -> tuple[list[str], list[str]]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        raw_plan = cursor.fetchone()[0]
+    if isinstance(raw_plan, str):
+        raw_plan = json.loads(raw_plan)
+
+    lines = []
+    flags = []
+
+    def walk(node: dict, depth: int) -> None:
+        node_type = node["Node Type"]
+        relation = node.get("Relation Name") or node.get("Index Name") or ""
+        rows = int(node.get("Actual Rows", 0) * node.get("Actual Loops", 1))
+        lines.append(
+            f"{'  ' * depth}{node_type}{f' on {relation}' if relation else ''} "
+            f"(rows={rows}, time={node.get('Actual Total Time', 0):.3f} ms)"
+        )
+        if node_type == "Seq Scan":
+            scanned = rows + int(node.get("Rows Removed by Filter", 0) * node.get("Actual Loops", 1))
+            if scanned >= thresholds.seq_scan_rows:
+                flags.append(f"Seq Scan on {relation}: {scanned} eil.")
+        if node_type in ("Sort", "Incremental Sort"):
+            if rows >= thresholds.sort_rows or node.get("Sort Space Type") == "Disk":
+                flags.append(f"{node_type}: {rows} eil. ({node.get('Sort Method', '')})")
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(raw_plan[0]["Plan"], 0)
+    return lines, flags
+
+
+def _explain_sqlite(
+    sql: str, thresholds: PlanThresholds, row_counts: dict[str, int | None]
+) -> tuple[list[str], list[str]]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        rows = cursor.fetchall()
+
+    def table_rows(table: str) -> int | None:
+        if table not in row_counts:
+            # EXPLAIN QUERY PLAN names aliases (U0) as well as tables; the savepoint keeps a failed count harmless.
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+                    row_counts[table] = cursor.fetchone()[0]
+            except DatabaseError:
+                row_counts[table] = None
+        return row_counts[table]
+
+    depths = {0: -1}
+    lines = []
+    flags = []
+    for node_id, parent_id, _, detail in rows:
+        depth = depths.get(parent_id, -1) + 1
+        depths[node_id] = depth
+        lines.append(f"{'  ' * depth}{detail}")
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            table = detail.split()[1]
+            count = table_rows(table)
+            if count is None or count >= thresholds.seq_scan_rows:
+                flags.append(f"SCAN {table}: {count if count is not None else '?'} eil.")
+        if "USE TEMP B-TREE" in detail:
+            flags.append(detail)
+    return lines, flags
+
+
+def explain_queries(
+    captured: list[dict], thresholds: PlanThresholds, row_counts: dict[str, int | None]
+) -> list[QueryPlan]:
+    plans = []
+    for query in captured:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            continue
+        try:
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    lines, flags = _explain_postgresql(sql, thresholds)
+                else:
+                    lines, flags = _explain_sqlite(sql, thresholds, row_counts)
+        except Exception as exc:
+            lines, flags = [f"EXPLAIN nepavyko: {exc}"], []
+        plans.append(QueryPlan(sql=sql, duration_ms=float(query.get("time") or 0) * 1000, plan=lines, flags=flags))
+    return plans
+
+
+def _call_view(view: Callable, user: User, path: str, **kwargs) -> None:
+    request = RequestFactory().get(path)
+    request.user = user
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+    request._messages = FallbackStorage(request)
+    view(request, **kwargs)
+
+
+def build_hot_paths(data: SeededData) -> list[tuple[str, Callable[[], object]]]:
+    semester = data.semester
+    student = data.students[0]
+    student_user = User.objects.get(pk=student.user_id)
+    teacher = data.teachers[0]
+    teacher_user = User.objects.get(pk=teacher.user_id)
+    bonus = next(item for item in data.bonuses if item.category == BonusItem.Category.OTHER)
+    points_related_bonus = next(
+        (item for item in data.bonuses if item.category == BonusItem.Category.POINTS_RELATED),
+        bonus,
+    )
+    pending_request = (
+        BonusRedemptionRequest.objects.filter(
+            requested_teacher=teacher,
+            status=BonusRedemptionRequest.Status.PENDING,
+        )
+        .order_by("id")
+        .first()
+    )
+
+    hot_paths = [
+        ("services.get_active_semester", get_active_semester),
+        ("services.student_balance_points", lambda: student_balance_points(student, semester)),
+        ("services.bonus_used_count", lambda: bonus_used_count(student, semester, bonus)),
+        ("services.student_reserved_points", lambda: student_reserved_points(student, semester)),
+        ("services.top_students", lambda: list(top_students(semester))),
+        ("services.award_points", lambda: award_points(teacher_user, student, 1, "Už aktyvumą")),
+        ("services.redeem_bonus", lambda: redeem_bonus(student_user, bonus)),
+        ("services.reserve_group_points", lambda: reserve_group_points(student_user, bonus, 1)),
+        (
+            "services.create_bonus_redemption_request",
+            lambda: create_bonus_redemption_request(student_user, points_related_bonus, teacher.id),
+        ),
+        ("views.teacher_dashboard", lambda: _call_view(views.teacher_dashboard, teacher_user, "/teacher/")),
+        (
+            "views.teacher_dashboard (paieška)",
+            lambda: _call_view(views.teacher_dashboard, teacher_user, "/teacher/?q=Mokinys&class_name=5A"),
+        ),
+        (
+            "views.teacher_award",
+            lambda: _call_view(views.teacher_award, teacher_user, "/teacher/award/", student_id=student.id),
+        ),
+        ("views.teacher_ranking", lambda: _call_view(views.teacher_ranking, teacher_user, "/teacher/ranking/")),
+        (
+            "views.teacher_award_history",
+            lambda: _call_view(views.teacher_award_history, teacher_user, "/teacher/history/"),
+        ),
+        ("views.student_dashboard", lambda: _call_view(views.student_dashboard, student_user, "/student/")),
+        ("views.student_shop", lambda: _call_view(views.student_shop, student_user, "/student/shop/")),
+    ]
+    if pending_request:
+        hot_paths.append(
+            (
+                "services.confirm_bonus_redemption_request",
+                lambda: confirm_bonus_redemption_request(teacher_user, pending_request),
+            )
+        )
+    return hot_paths
+
+
+def run_hot_paths(data: SeededData, thresholds: PlanThresholds) -> list[HotPathReport]:
+    reports = []
+    row_counts: dict[str, int | None] = {}
+    for name, func in build_hot_paths(data):
+        report = HotPathReport(name=name, duration_ms=0)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    func()
+            except DomainError as exc:
+                report.error = exc.message
+            report.duration_ms = (time.perf_counter() - started) * 1000
+        report.queries = explain_queries(captured.captured_queries, thresholds, row_counts)
+        reports.append(report)
+    return reports
+
+
+def render_json(reports: list[HotPathReport], meta: dict) -> str:
+    payload = {
+        "meta": meta,
+        "paths": [{**asdict(report), "flags": report.flags} for report in reports],
+    }
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def render_markdown(reports: list[HotPathReport], meta: dict) -> str:
+    lines = [
+        "# Užklausų planų ataskaita",
+        "",
+        f"- Sugeneruota: {meta['generated_at']}",
+        f"- Duomenų bazė: {meta['vendor']}",
+        f"- Duomenys: {meta['students']} mokinių, {meta['transactions']} operacijų",
+        f"- Ribos: Seq Scan ≥ {meta['seq_scan_rows']} eil., rikiavimas ≥ {meta['sort_rows']} eil.",
+        "",
+        "| Kelias | Užklausos | Laikas, ms | Įspėjimai |",
+        "| --- | ---: | ---: | ---: |",
+    ]
+    for report in reports:
+        lines.append(f"| {report.name} | {len(report.queries)} | {report.duration_ms:.1f} | {len(report.flags)} |")
+
+    for report in reports:
+        lines += ["", f"## {report.name}", ""]
+        if report.error:
+            lines += [f"Domeno klaida: {report.error}", ""]
+        for index, query in enumerate(report.queries, start=1):
+            title = f"### Užklausa {index} ({query.duration_ms:.2f} ms)"
+            if query.flags:
+                title += " – " + "; ".join(query.flags)
+            lines += [title, "", "```sql", query.sql, "```", "", "```", *query.plan, "```", ""]
+    return "\n".join(lines) + "\n"
+
+
+def report_meta(data: SeededData, thresholds: PlanThresholds, transactions: int) -> dict:
+    return {
+        "generated_at": timezone.now().isoformat(timespec="seconds"),
+        "vendor": connection.vendor,
+        "students": len(data.students),
+        "transactions": transactions,
+        "seq_scan_rows": thresholds.seq_scan_rows,
+        "sort_rows": thresholds.sort_rows,
+    }
@@ -0,0 +1,155 @@
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import PointDailyRollup, PointTransaction, RollupWatermark, Semester
+
+POINTS_WATERMARK = "point_daily_rollup"
+
+
+def _rollup_cutoff():
+    # Ledger ids are allocated before commit, so very fresh rows are left for the next run
+    # to avoid moving the watermark past a transaction that is still in flight.
+    settle_seconds = getattr(settings, "ROLLUP_SETTLE_SECONDS", 60)
+    return timezone.now() - timedelta(seconds=settle_seconds)
+
+
+def _rollup_totals(ledger) -> dict[tuple, tuple[int, int]]:
+    rows = (
+        ledger.annotate(day=TruncDate("created_at"))
+        .values("day", "semester_id", "created_by__teacher_profile", "student_profile__class_name", "tx_type")
+        .annotate(points_total=Sum("points_delta"), tx_count=Count("id"))
+        .order_by()
+    )
+    return {
+        (
+            row["day"],
+            row["semester_id"],
+            row["created_by__teacher_profile"],
+            row["student_profile__class_name"],
+            row["tx_type"],
+        ): (row["points_total"], row["tx_count"])
+        for row in rows
+    }
+
+
+def _new_rollup(key: tuple, points_total: int, tx_count: int) -> PointDailyRollup:
+    day, semester_id, teacher_profile_id, class_name, tx_type = key
+    return PointDailyRollup(
+        date=day,
+        semester_id=semester_id,
+        teacher_profile_id=teacher_profile_id,
+        class_name=class_name,
+        tx_type=tx_type,
+        points_total=points_total,
+        tx_count=tx_count,
+    )
+
+
+def _rollup_batch(last_id: int, upper_id: int) -> None:
+    totals = _rollup_totals(PointTransaction.objects.filter(id__gt=last_id, id__lte=upper_id))
+    if not totals:
+        return
+
+    existing = {
+        (rollup.date, rollup.semester_id, rollup.teacher_profile_id, rollup.class_name, rollup.tx_type): rollup
+        for rollup in PointDailyRollup.objects.filter(
+            date__in={key[0] for key in totals},
+            semester_id__in={key[1] for key in totals},
+        )
+    }
+    to_update = []
+    to_create = []
+    for key, (points_total, tx_count) in totals.items():
+        rollup = existing.get(key)
+        if rollup:
+            rollup.points_total += points_total
+            rollup.tx_count += tx_count
+            to_update.append(rollup)
+        else:
+            to_create.append(_new_rollup(key, points_total, tx_count))
+    PointDailyRollup.objects.bulk_update(to_update, ["points_total", "tx_count"])
+    PointDailyRollup.objects.bulk_create(to_create)
+
+
+def rebuild_rollup_day(semester_id: int, day: date) -> None:
+    day_start = timezone.make_aware(datetime.combine(day, time.min))
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=POINTS_WATERMARK)
+        PointDailyRollup.objects.filter(semester_id=semester_id, date=day).delete()
+        ledger = PointTransaction.objects.filter(
+            semester_id=semester_id,
+            id__lte=watermark.last_id,
+            created_at__gte=day_start,
+            created_at__lt=day_start + timedelta(days=1),
+        )
+        PointDailyRollup.objects.bulk_create(
+            [_new_rollup(key, *values) for key, values in _rollup_totals(ledger).items()]
+        )
+
+
+def reconcile_recent_rollups(days: int | None = None) -> None:
+    # A transaction that commits more than ROLLUP_SETTLE_SECONDS after its id was allocated lands below the
+    # watermark and is never picked up incrementally, so the trailing days are recomputed from the ledger.
+    days = days if days is not None else getattr(settings, "ROLLUP_RECONCILE_DAYS", 2)
+    if days <= 0:
+        return
+    start = timezone.make_aware(datetime.combine(timezone.localdate() - timedelta(days=days - 1), time.min))
+    last_id = RollupWatermark.objects.filter(name=POINTS_WATERMARK).values_list("last_id", flat=True).first()
+    recent = (
+        PointTransaction.objects.filter(id__lte=last_id or 0, created_at__gte=start)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("semester_id", "day")
+        .distinct()
+        .order_by()
+    )
+    for semester_id, day in list(recent):
+        rebuild_rollup_day(semester_id, day)
+
+
+def rollup_point_transactions(batch_size: int = 5000) -> int:
+    cutoff = _rollup_cutoff()
+    processed = 0
+    while True:
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=POINTS_WATERMARK)
+            pending = PointTransaction.objects.filter(id__gt=watermark.last_id)
+            fresh_id = pending.filter(created_at__gt=cutoff).aggregate(first=Min("id")).get("first")
+            if fresh_id is not None:
+                pending = pending.filter(id__lt=fresh_id)
+            batch_ids = list(pending.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not batch_ids:
+                break
+
+            _rollup_batch(watermark.last_id, batch_ids[-1])
+            watermark.last_id = batch_ids[-1]
+            watermark.save(update_fields=["last_id", "updated_at"])
+            processed += len(batch_ids)
+    reconcile_recent_rollups()
+    return processed
+
+
+def points_report(semester: Semester) -> dict[str, list[dict]]:
+    rollups = PointDailyRollup.objects.filter(semester=semester).order_by()
+    return {
+        "per_day": list(
+            rollups.values("date", "tx_type")
+            .annotate(points_total=Sum("points_total"), tx_count=Sum("tx_count"))
+            .order_by("-date", "tx_type")
+        ),
+        "per_teacher": list(
+            rollups.filter(tx_type=PointTransaction.TxType.AWARD)
+            .values("teacher_profile__display_name")
+            .annotate(points_total=Sum("points_total"), tx_count=Sum("tx_count"))
+            .order_by("-points_total")
+        ),
+        "per_class": list(
+            rollups.values("class_name", "tx_type")
+            .annotate(points_total=Sum("points_total"), tx_count=Sum("tx_count"))
+            .order_by("class_name", "tx_type")
+        ),
+    }
@@ -0,0 +1,216 @@
+import random
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.backends.base.creation import TEST_DATABASE_PREFIX
+from django.utils import timezone
+
+from .models import (
+    BonusItem,
+    BonusRedemptionRequest,
+    GroupContribution,
+    GroupPurchase,
+    PointTransaction,
+    Semester,
+    StudentProfile,
+    TeacherBudget,
+    TeacherProfile,
+    User,
+)
+
+
+@dataclass
+class SeededData:
+    semester: Semester
+    teachers: list[TeacherProfile]
+    students: list[StudentProfile]
+    bonuses: list[BonusItem]
+
+
+def is_throwaway_database() -> bool:
+    # Demo data is seeded into, and semesters switched in, whatever database this is, so only test databases,
+    # in-memory SQLite and SQLite files under the temp directory are accepted.
+    name = str(connection.settings_dict["NAME"] or "")
+    test_name = connection.settings_dict.get("TEST", {}).get("NAME")
+    if name.startswith(TEST_DATABASE_PREFIX) or (test_name and name == str(test_name)):
+        return True
+    if connection.vendor != "sqlite":
+        return False
+    if connection.is_in_memory_db():
+        return True
+    return Path(name).resolve().is_relative_to(Path(tempfile.gettempdir()).resolve())
+
+
+def _create_users(prefix: str, role: str, count: int) -> list[User]:
+    password = make_password(None)
+    User.objects.bulk_create(
+        [User(username=f"{prefix}-{index}", role=role, password=password) for index in range(count)]
+    )
+    return list(User.objects.filter(username__startswith=f"{prefix}-").order_by("id"))
+
+
+def seed_demo_data(
+    *,
+    students: int = 200,
+    teachers: int = 10,
+    bonuses: int = 8,
+    transactions: int = 5000,
+    days: int = 90,
+    seed: int = 0,
+) -> SeededData:
+    rng = random.Random(seed)
+    token = uuid.uuid4().hex[:8]
+    today = timezone.now().date()
+
+    with transaction.atomic():
+        semester = Semester.objects.create(
+            name=f"Demo {token}",
+            start_date=today - timedelta(days=days),
+            end_date=today + timedelta(days=30),
+            is_active=True,
+        )
+        teacher_users = _create_users(f"seed-{token}-teacher", User.Role.TEACHER, teachers)
+        TeacherProfile.objects.bulk_create(
+            [
+                TeacherProfile(school_id=semester.school_id, user=user, display_name=f"Mokytojas {index}")
+                for index, user in enumerate(teacher_users)
+            ]
+        )
+        teacher_profiles = list(TeacherProfile.objects.filter(user__in=teacher_users).order_by("id"))
+
+        student_users = _create_users(f"seed-{token}-student", User.Role.STUDENT, students)
+        StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(
+                    school_id=semester.school_id,
+                    user=user,
+                    display_name=f"Mokinys {index:05d}",
+                    class_name=f"{5 + index % 8}{'ABC'[index % 3]}",
+                )
+                for index, user in enumerate(student_users)
+            ]
+        )
+        student_profiles = list(StudentProfile.objects.filter(user__in=student_users).order_by("id"))
+
+        bonus_items = BonusItem.objects.bulk_create(
+            [
+                BonusItem(
+                    school_id=semester.school_id,
+                    title_lt=f"Bonusas {token} {index}",
+                    description_lt="Demonstracinis bonusas",
+                    price_points=10 + 10 * index,
+                    max_uses_per_student=3,
+                    category=BonusItem.Category.POINTS_RELATED if index % 4 == 3 else BonusItem.Category.OTHER,
+                )
+                for index in range(bonuses)
+            ]
+        )
+        for bonus in bonus_items:
+            if bonus.category == BonusItem.Category.POINTS_RELATED:
+                bonus.assigned_teachers.add(*teacher_profiles[:3])
+
+        awarded_by_teacher = {teacher.id: 0 for teacher in teacher_profiles}
+        balances = {student.id: 0 for student in student_profiles}
+        used = {}
+        ledger = []
+        for _ in range(transactions):
+            student = rng.choice(student_profiles)
+            redeemable = [
+                bonus
+                for bonus in bonus_items
+                if bonus.category == BonusItem.Category.OTHER
+                and bonus.price_points <= balances[student.id]
+                and used.get((student.id, bonus.id), 0) < bonus.max_uses_per_student
+            ]
+            if redeemable and rng.random() < 0.2:
+                bonus = rng.choice(redeemable)
+                balances[student.id] -= bonus.price_points
+                used[(student.id, bonus.id)] = used.get((student.id, bonus.id), 0) + 1
+                ledger.append(
+                    PointTransaction(
+                        semester=semester,
+                        student_profile=student,
+                        created_by_id=student.user_id,
+                        tx_type=PointTransaction.TxType.REDEEM,
+                        points_delta=-bonus.price_points,
+                        message=f"Bonusas: {bonus.title_lt}",
+                        bonus_item=bonus,
+                    )
+                )
+                continue
+            teacher = rng.choice(teacher_profiles)
+            points = rng.randint(1, 10)
+            awarded_by_teacher[teacher.id] += points
+            balances[student.id] += points
+            ledger.append(
+                PointTransaction(
+                    semester=semester,
+                    student_profile=student,
+                    created_by_id=teacher.user_id,
+                    tx_type=PointTransaction.TxType.AWARD,
+                    points_delta=points,
+                    message="Už aktyvumą pamokoje",
+                )
+            )
+        PointTransaction.objects.bulk_create(ledger, batch_size=1000)
+
+        ledger_ids = list(
+            PointTransaction.objects.filter(semester=semester).order_by("id").values_list("id", flat=True)
+        )
+        day_span = max(len(ledger_ids) // max(days, 1), 1)
+        for offset in range(0, len(ledger_ids), day_span):
+            day = days - min(offset // day_span, days)
+            PointTransaction.objects.filter(id__in=ledger_ids[offset : offset + day_span]).update(
+                created_at=timezone.now() - timedelta(days=day, minutes=rng.randint(0, 600))
+            )
+
+        TeacherBudget.objects.bulk_create(
+            [
+                TeacherBudget(
+                    teacher_profile=teacher,
+                    semester=semester,
+                    allocated_points=awarded_by_teacher[teacher.id] + 1000,
+                    spent_points=awarded_by_teacher[teacher.id],
+                )
+                for teacher in teacher_profiles
+            ]
+        )
+
+        group_bonus = next(bonus for bonus in bonus_items if bonus.category == BonusItem.Category.OTHER)
+        group_purchase = GroupPurchase.objects.create(bonus_item=group_bonus, semester=semester)
+        contributors = [student for student in student_profiles if balances[student.id] > 0][:3]
+        GroupContribution.objects.bulk_create(
+            [
+                GroupContribution(group_purchase=group_purchase, student_profile=student, amount=1)
+                for student in contributors
+            ]
+        )
+
+        requested_bonus = next(
+            (bonus for bonus in bonus_items if bonus.category == BonusItem.Category.POINTS_RELATED),
+            None,
+        )
+        if requested_bonus:
+            BonusRedemptionRequest.objects.bulk_create(
+                [
+                    BonusRedemptionRequest(
+                        semester=semester,
+                        bonus_item=requested_bonus,
+                        student_profile=student,
+                        requested_teacher=teacher_profiles[0],
+                    )
+                    for student in student_profiles[:5]
+                ]
+            )
+
+    return SeededData(
+        semester=semester,
+        teachers=teacher_profiles,
+        students=student_profiles,
+        bonuses=bonus_items,
+    )
@@ -1,12 +1,17 @@
 from dataclasses import dataclass
-from typing import Iterable
+from functools import wraps
+from typing import Callable, Iterable
 
 from django.conf import settings
-from django.db import transaction
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models import Sum, Max, Value, Q
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from .db.retry import retry_on_contention
+from .db.routers import use_primary
+from .metrics import DOMAIN_ERRORS, observe_service
 from .models import (
     Semester,
     SchoolSettings,
@@ -20,6 +25,7 @@ from .models import (
     PointTransaction,
     User,
 )
+from .tenants import tenant_cache_key, tenant_cache_keys
 
 
 @dataclass
@@ -27,8 +33,63 @@ class DomainError(Exception):
     message: str
 
 
+# Writers take row locks in this order, and several rows of one table by ascending id:
+# TeacherProfile -> TeacherBudget -> StudentProfile -> BonusRedemptionRequest -> GroupPurchase -> GroupContribution.
+# Deadlocks and serialization failures that still happen are retried by retry_on_contention.
+def _instrumented(func: Callable) -> Callable:
+    retrying = retry_on_contention(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with observe_service(func.__name__), use_primary():
+            try:
+                return retrying(*args, **kwargs)
+            except DomainError as exc:
+                DOMAIN_ERRORS.labels(service=func.__name__, message=exc.message).inc()
+                raise
+
+    return wrapper
+
+
+SCHOOL_SETTINGS_CACHE_KEY = "services:school-settings"
+ACTIVE_SEMESTERS_CACHE_KEY = "services:active-semesters"
+BONUS_CATALOG_CACHE_KEY = "services:bonus-catalog"
+LEADERBOARD_CACHE_KEY = "services:leaderboard:{semester_id}"
+_MISSING = object()
+
+
+def _service_cache_timeout() -> int:
+    return getattr(settings, "SERVICE_CACHE_TIMEOUT", 300)
+
+
+def invalidate_school_settings(school_id: int | None = None) -> None:
+    cache.delete_many(tenant_cache_keys(SCHOOL_SETTINGS_CACHE_KEY, school_id))
+
+
+def invalidate_active_semester(school_id: int | None = None) -> None:
+    cache.delete_many(tenant_cache_keys(ACTIVE_SEMESTERS_CACHE_KEY, school_id))
+
+
+def invalidate_bonus_catalog(school_id: int | None = None) -> None:
+    cache.delete_many(tenant_cache_keys(BONUS_CATALOG_CACHE_KEY, school_id))
+
+
+def _tenant_cached(base_key: str, load: Callable[[], object]) -> object:
+    if not settings.CACHE_SHARED:
+        # Save signals would only clear this process's locmem copy, so other workers would keep serving a stale one.
+        with use_primary():
+            return load()
+    key = tenant_cache_key(base_key)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        with use_primary():
+            value = load()
+        cache.set(key, value, _service_cache_timeout())
+    return value
+
+
 def get_school_settings() -> SchoolSettings | None:
-    return SchoolSettings.objects.first()
+    return _tenant_cached(SCHOOL_SETTINGS_CACHE_KEY, SchoolSettings.objects.first)
 
 
 def get_school_name() -> str:
@@ -36,13 +97,34 @@ def get_school_name() -> str:
     return settings_row.name if settings_row else "Mokyklos pavadinimas"
 
 
-def get_active_semester() -> Semester:
-    semesters = Semester.objects.filter(is_active=True)
-    if not semesters.exists():
+def _active_semesters() -> list[Semester]:
+    return list(Semester.objects.filter(is_active=True).order_by("pk")[:2])
+
+
+def _single_active_semester(semesters: list[Semester]) -> Semester:
+    if not semesters:
         raise DomainError("Nėra aktyvaus semestro.")
-    if semesters.count() > 1:
+    if len(semesters) > 1:
         raise DomainError("Yra keli aktyvūs semestrai. Patikrinkite nustatymus.")
-    return semesters.first()
+    return semesters[0]
+
+
+def get_active_semester() -> Semester:
+    # Only for rendering: another worker may switch semesters while this copy is cached.
+    return _single_active_semester(_tenant_cached(ACTIVE_SEMESTERS_CACHE_KEY, _active_semesters))
+
+
+def load_active_semester() -> Semester:
+    # Write services call this inside their transaction, so ledger rows never land in a semester switched off elsewhere.
+    return _single_active_semester(_active_semesters())
+
+
+def _active_bonus_items() -> list[BonusItem]:
+    return list(BonusItem.objects.filter(is_active=True).prefetch_related("assigned_teachers").order_by("price_points"))
+
+
+def active_bonus_items() -> list[BonusItem]:
+    return _tenant_cached(BONUS_CATALOG_CACHE_KEY, _active_bonus_items)
 
 
 def student_balance_points(student: StudentProfile, semester: Semester) -> int:
@@ -87,9 +169,18 @@ def get_or_create_group_purchase(semester: Semester, bonus: BonusItem) -> GroupP
     ).first()
     if group_purchase:
         return group_purchase
-    return GroupPurchase.objects.create(semester=semester, bonus_item=bonus)
+    try:
+        with transaction.atomic():
+            return GroupPurchase.objects.create(semester=semester, bonus_item=bonus)
+    except IntegrityError:
+        return GroupPurchase.objects.get(
+            semester=semester,
+            bonus_item=bonus,
+            status__in=[GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION],
+        )
 
 
+@_instrumented
 def reserve_group_points(student_user: User, bonus: BonusItem, amount: int) -> GroupContribution:
     if student_user.role != User.Role.STUDENT:
         raise DomainError("Neturite teisės rezervuoti taškų.")
@@ -100,17 +191,16 @@ def reserve_group_points(student_user: User, bonus: BonusItem, amount: int) -> G
     if bonus.category == BonusItem.Category.POINTS_RELATED:
         raise DomainError("Šiam bonusui grupinis pirkimas negalimas.")
 
-    semester = get_active_semester()
-
-    try:
-        student_profile = StudentProfile.objects.get(user=student_user)
-    except StudentProfile.DoesNotExist as exc:
-        raise DomainError("Mokinio profilis nerastas.") from exc
+    with transaction.atomic():
+        semester = load_active_semester()
+        try:
+            student_profile = StudentProfile.objects.select_for_update().get(user=student_user)
+        except StudentProfile.DoesNotExist as exc:
+            raise DomainError("Mokinio profilis nerastas.") from exc
 
-    if bonus_used_count(student_profile, semester, bonus) >= bonus.max_uses_per_student:
-        raise DomainError("Pasiektas bonuso panaudojimų limitas.")
+        if bonus_used_count(student_profile, semester, bonus) >= bonus.max_uses_per_student:
+            raise DomainError("Pasiektas bonuso panaudojimų limitas.")
 
-    with transaction.atomic():
         group_purchase = get_or_create_group_purchase(semester, bonus)
         group_purchase = GroupPurchase.objects.select_for_update().get(pk=group_purchase.pk)
 
@@ -163,27 +253,27 @@ def reserve_group_points(student_user: User, bonus: BonusItem, amount: int) -> G
         return contribution
 
 
+@_instrumented
 def withdraw_group_reservation(student_user: User, bonus: BonusItem) -> None:
     if student_user.role != User.Role.STUDENT:
         raise DomainError("Neturite teisės atšaukti rezervacijos.")
     if bonus.category == BonusItem.Category.POINTS_RELATED:
         raise DomainError("Šiam bonusui grupinis pirkimas negalimas.")
 
-    semester = get_active_semester()
-    try:
-        student_profile = StudentProfile.objects.get(user=student_user)
-    except StudentProfile.DoesNotExist as exc:
-        raise DomainError("Mokinio profilis nerastas.") from exc
-
-    group_purchase = GroupPurchase.objects.filter(
-        semester=semester,
-        bonus_item=bonus,
-        status__in=[GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION],
-    ).first()
-    if not group_purchase:
-        raise DomainError("Rezervacijos nerastos.")
-
     with transaction.atomic():
+        semester = load_active_semester()
+        try:
+            student_profile = StudentProfile.objects.select_for_update().get(user=student_user)
+        except StudentProfile.DoesNotExist as exc:
+            raise DomainError("Mokinio profilis nerastas.") from exc
+
+        group_purchase = GroupPurchase.objects.filter(
+            semester=semester,
+            bonus_item=bonus,
+            status__in=[GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION],
+        ).first()
+        if not group_purchase:
+            raise DomainError("Rezervacijos nerastos.")
         group_purchase = GroupPurchase.objects.select_for_update().get(pk=group_purchase.pk)
         if group_purchase.status == GroupPurchase.Status.COMPLETED:
             raise DomainError("Rezervacija jau užbaigta.")
@@ -199,27 +289,27 @@ def withdraw_group_reservation(student_user: User, bonus: BonusItem) -> None:
         group_purchase.delete()
 
 
+@_instrumented
 def confirm_group_purchase(student_user: User, bonus: BonusItem) -> None:
     if student_user.role != User.Role.STUDENT:
         raise DomainError("Neturite teisės patvirtinti pirkimo.")
     if bonus.category == BonusItem.Category.POINTS_RELATED:
         raise DomainError("Šiam bonusui grupinis pirkimas negalimas.")
 
-    semester = get_active_semester()
-    try:
-        student_profile = StudentProfile.objects.get(user=student_user)
-    except StudentProfile.DoesNotExist as exc:
-        raise DomainError("Mokinio profilis nerastas.") from exc
-
-    group_purchase = GroupPurchase.objects.filter(
-        semester=semester,
-        bonus_item=bonus,
-        status=GroupPurchase.Status.AWAITING_CONFIRMATION,
-    ).first()
-    if not group_purchase:
-        raise DomainError("Nėra grupinio pirkimo patvirtinimui.")
-
     with transaction.atomic():
+        semester = load_active_semester()
+        try:
+            student_profile = StudentProfile.objects.select_for_update().get(user=student_user)
+        except StudentProfile.DoesNotExist as exc:
+            raise DomainError("Mokinio profilis nerastas.") from exc
+
+        group_purchase = GroupPurchase.objects.filter(
+            semester=semester,
+            bonus_item=bonus,
+            status=GroupPurchase.Status.AWAITING_CONFIRMATION,
+        ).first()
+        if not group_purchase:
+            raise DomainError("Nėra grupinio pirkimo patvirtinimui.")
         group_purchase = GroupPurchase.objects.select_for_update().get(pk=group_purchase.pk)
         contribution = (
             GroupContribution.objects.select_for_update()
@@ -246,7 +336,7 @@ def confirm_group_purchase(student_user: User, bonus: BonusItem) -> None:
         if not all_confirmed:
             return
 
-        for entry in group_purchase.contributions.select_for_update():
+        for entry in group_purchase.contributions.select_for_update().order_by("pk"):
             PointTransaction.objects.create(
                 semester=semester,
                 student_profile=entry.student_profile,
@@ -260,15 +350,15 @@ def confirm_group_purchase(student_user: User, bonus: BonusItem) -> None:
         group_purchase.save(update_fields=["status"])
 
 
+@_instrumented
 def award_points(teacher_user: User, student: StudentProfile, points: int, message: str) -> PointTransaction:
     if teacher_user.role != User.Role.TEACHER:
         raise DomainError("Neturite teisės skirti taškų.")
     if points <= 0:
         raise DomainError("Taškai turi būti teigiami.")
 
-    semester = get_active_semester()
-
     with transaction.atomic():
+        semester = load_active_semester()
         try:
             teacher_profile = TeacherProfile.objects.select_for_update().get(user=teacher_user)
         except TeacherProfile.DoesNotExist as exc:
@@ -294,6 +384,7 @@ def award_points(teacher_user: User, student: StudentProfile, points: int, messa
         return tx
 
 
+@_instrumented
 def redeem_bonus(student_user: User, bonus: BonusItem) -> PointTransaction:
     if student_user.role != User.Role.STUDENT:
         raise DomainError("Neturite teisės išpirkti bonusų.")
@@ -302,9 +393,8 @@ def redeem_bonus(student_user: User, bonus: BonusItem) -> PointTransaction:
     if bonus.category == BonusItem.Category.POINTS_RELATED:
         raise DomainError("Šiam bonusui reikalingas mokytojo patvirtinimas.")
 
-    semester = get_active_semester()
-
     with transaction.atomic():
+        semester = load_active_semester()
         try:
             student_profile = StudentProfile.objects.select_for_update().get(user=student_user)
         except StudentProfile.DoesNotExist as exc:
@@ -312,8 +402,18 @@ def redeem_bonus(student_user: User, bonus: BonusItem) -> PointTransaction:
         balance = student_balance_points(student_profile, semester)
         if balance < bonus.price_points:
             raise DomainError("Nepakanka taškų šiam bonusui.")
+        reserved_total = student_reserved_points(student_profile, semester)
+        if balance - reserved_total < bonus.price_points:
+            raise DomainError("Nepakanka laisvų taškų šiam bonusui.")
 
         used = bonus_used_count(student_profile, semester, bonus)
+        # A pending group purchase of the same bonus becomes a redeem once it completes, so it holds one use.
+        used += GroupContribution.objects.filter(
+            student_profile=student_profile,
+            group_purchase__semester=semester,
+            group_purchase__bonus_item=bonus,
+            group_purchase__status__in=[GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION],
+        ).exists()
         if used >= bonus.max_uses_per_student:
             raise DomainError("Pasiektas bonuso panaudojimų limitas.")
 
@@ -329,6 +429,7 @@ def redeem_bonus(student_user: User, bonus: BonusItem) -> PointTransaction:
         return tx
 
 
+@_instrumented
 def create_bonus_redemption_request(
     student_user: User,
     bonus: BonusItem,
@@ -343,9 +444,8 @@ def create_bonus_redemption_request(
     if not requested_teacher_id:
         raise DomainError("Pasirinkite mokytoją bonuso patvirtinimui.")
 
-    semester = get_active_semester()
-
     with transaction.atomic():
+        semester = load_active_semester()
         try:
             student_profile = StudentProfile.objects.select_for_update().get(user=student_user)
         except StudentProfile.DoesNotExist as exc:
@@ -382,6 +482,7 @@ def create_bonus_redemption_request(
         )
 
 
+@_instrumented
 def confirm_bonus_redemption_request(teacher_user: User, bonus_request: BonusRedemptionRequest) -> PointTransaction:
     if teacher_user.role != User.Role.TEACHER:
         raise DomainError("Neturite teisės tvirtinti bonusų prašymų.")
@@ -392,9 +493,10 @@ def confirm_bonus_redemption_request(teacher_user: User, bonus_request: BonusRed
         except TeacherProfile.DoesNotExist as exc:
             raise DomainError("Mokytojo profilis nerastas.") from exc
 
+        student_profile = StudentProfile.objects.select_for_update().get(pk=bonus_request.student_profile_id)
         bonus_request = (
-            BonusRedemptionRequest.objects.select_for_update()
-            .select_related("bonus_item", "student_profile", "semester")
+            BonusRedemptionRequest.objects.select_for_update(of=("self",))
+            .select_related("bonus_item", "semester")
             .get(pk=bonus_request.pk)
         )
 
@@ -410,7 +512,6 @@ def confirm_bonus_redemption_request(teacher_user: User, bonus_request: BonusRed
             raise DomainError("Bonusas neaktyvus.")
 
         semester = bonus_request.semester
-        student_profile = StudentProfile.objects.select_for_update().get(pk=bonus_request.student_profile_id)
 
         used = bonus_used_count(student_profile, semester, bonus)
         if used >= bonus.max_uses_per_student:
@@ -440,29 +541,30 @@ def confirm_bonus_redemption_request(teacher_user: User, bonus_request: BonusRed
         return tx
 
 
+@_instrumented
 def admin_adjust_points(admin_user: User, student: StudentProfile, points: int, message: str) -> PointTransaction:
     if admin_user.role != User.Role.ADMIN:
         raise DomainError("Neturite teisės koreguoti taškų.")
     if points <= 0:
         raise DomainError("Taškai turi būti teigiami.")
 
-    semester = get_active_semester()
-
-    tx = PointTransaction.objects.create(
-        semester=semester,
-        student_profile=student,
-        created_by=admin_user,
-        tx_type=PointTransaction.TxType.ADMIN_ADJUST,
-        points_delta=points,
-        message=message,
-    )
+    with transaction.atomic():
+        tx = PointTransaction.objects.create(
+            semester=load_active_semester(),
+            student_profile=student,
+            created_by=admin_user,
+            tx_type=PointTransaction.TxType.ADMIN_ADJUST,
+            points_delta=points,
+            message=message,
+        )
     return tx
 
 
 def top_students(semester: Semester, limit: int = 5) -> Iterable[StudentProfile]:
     future_date = getattr(settings, "SCHOOL_FUTURE_DATE", timezone.now())
     return (
-        StudentProfile.objects.annotate(
+        StudentProfile.objects.filter(school_id=semester.school_id)
+        .annotate(
             total_points=Coalesce(
                 Sum("point_transactions__points_delta", filter=Q(point_transactions__semester=semester)),
                 0,
@@ -478,3 +580,21 @@ def top_students(semester: Semester, limit: int = 5) -> Iterable[StudentProfile]
         )
         .order_by("-total_points", "last_tx_time", "display_name")[:limit]
     )
+
+
+def refresh_leaderboard(semester: Semester) -> list[StudentProfile]:
+    with use_primary():
+        leaders = list(top_students(semester))
+    cache.set(LEADERBOARD_CACHE_KEY.format(semester_id=semester.pk), leaders, settings.LEADERBOARD_TIMEOUT)
+    return leaders
+
+
+def cached_top_students(semester: Semester) -> list[StudentProfile]:
+    if not settings.CACHE_SHARED:
+        # The worker only refreshes a shared cache; a per-process copy would keep each worker's own stale ranking.
+        with use_primary():
+            return list(top_students(semester))
+    leaders = cache.get(LEADERBOARD_CACHE_KEY.format(semester_id=semester.pk))
+    if leaders is None:
+        leaders = refresh_leaderboard(semester)
+    return leaders
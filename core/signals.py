@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import tasks  # noqa: F401
+from .activity import append_activity, invalidate_activity_feed, invalidate_school_activity_feeds
+from .auth_backends import invalidate_cached_user
+from .autocomplete import clear_autocomplete_cache
+from .jobs import enqueue_debounced_on_commit, enqueue_on_commit
+from .metrics import install_execute_wrapper
+from .models import BonusItem, PointTransaction, School, SchoolSettings, Semester, StudentProfile, TeacherProfile, User
+from .partitioning import create_semester_partition
+from .services import invalidate_active_semester, invalidate_bonus_catalog, invalidate_school_settings
+from .snapshots import bump_student_version
+from .tenants import invalidate_school_domains
+
+
+@receiver(connection_created)
+def install_metrics_wrapper(sender, connection, **kwargs) -> None:
+    install_execute_wrapper(connection)
+
+
+@receiver(post_save, sender=Semester)
+def create_ledger_partition(sender, instance: Semester, created: bool, **kwargs) -> None:
+    if created:
+        create_semester_partition(instance)
+
+
+@receiver([post_save, post_delete], sender=Semester)
+def invalidate_semester_cache(sender, instance: Semester, **kwargs) -> None:
+    invalidate_active_semester(instance.school_id)
+    transaction.on_commit(lambda: invalidate_active_semester(instance.school_id))
+
+
+@receiver([post_save, post_delete], sender=SchoolSettings)
+def invalidate_school_settings_cache(sender, instance: SchoolSettings, **kwargs) -> None:
+    invalidate_school_settings(instance.school_id)
+    transaction.on_commit(lambda: invalidate_school_settings(instance.school_id))
+
+
+@receiver([post_save, post_delete], sender=School)
+def invalidate_school_domains_cache(sender, instance: School, **kwargs) -> None:
+    invalidate_school_domains()
+    transaction.on_commit(invalidate_school_domains)
+
+
+@receiver([post_save, post_delete], sender=BonusItem)
+@receiver([post_save, post_delete], sender=TeacherProfile)
+def invalidate_bonus_catalog_cache(sender, instance, **kwargs) -> None:
+    invalidate_bonus_catalog(instance.school_id)
+    transaction.on_commit(lambda: invalidate_bonus_catalog(instance.school_id))
+
+
+@receiver(m2m_changed, sender=BonusItem.assigned_teachers.through)
+def invalidate_bonus_catalog_teachers(sender, instance, **kwargs) -> None:
+    invalidate_bonus_catalog(instance.school_id)
+    transaction.on_commit(lambda: invalidate_bonus_catalog(instance.school_id))
+
+
+@receiver(post_save, sender=SchoolSettings)
+def update_school_image_variants(sender, instance: SchoolSettings, **kwargs) -> None:
+    enqueue_on_commit(
+        "school_image_variants", {"pk": instance.pk}, unique_key=f"school_image_variants:{instance.pk}"
+    )
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance: User, **kwargs) -> None:
+    invalidate_cached_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=TeacherProfile)
+@receiver([post_save, post_delete], sender=StudentProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs) -> None:
+    invalidate_cached_user(instance.user_id)
+    transaction.on_commit(lambda: invalidate_school_activity_feeds(instance.school_id))
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+def invalidate_student_autocomplete(sender, instance: StudentProfile, **kwargs) -> None:
+    transaction.on_commit(clear_autocomplete_cache)
+
+
+@receiver([post_save, post_delete], sender=PointTransaction)
+def invalidate_student_snapshot(sender, instance: PointTransaction, **kwargs) -> None:
+    # Only after commit: a bump before it would let a concurrent reader cache pre-commit data under the new version.
+    transaction.on_commit(lambda: bump_student_version(instance.student_profile_id))
+
+
+@receiver(post_save, sender=PointTransaction)
+def append_activity_feed(sender, instance: PointTransaction, created: bool, **kwargs) -> None:
+    if created:
+        transaction.on_commit(lambda: append_activity(instance.pk, instance.semester_id))
+        # A fresh row stays above the rollup watermark for ROLLUP_SETTLE_SECONDS, and the rollup job re-queues
+        # itself while it sees one, so a debounce shorter than that cannot strand a write.
+        window = min(settings.JOB_ENQUEUE_DEBOUNCE, getattr(settings, "ROLLUP_SETTLE_SECONDS", 60))
+        enqueue_debounced_on_commit("rollup_points", unique_key="rollup_points", window=window)
+    else:
+        transaction.on_commit(lambda: invalidate_activity_feed(instance.semester_id))
+
+
+@receiver(post_delete, sender=PointTransaction)
+def drop_activity_feed(sender, instance: PointTransaction, **kwargs) -> None:
+    transaction.on_commit(lambda: invalidate_activity_feed(instance.semester_id))
@@ -0,0 +1,111 @@
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q, RowRange, Sum, Window
+from django.db.models.functions import RowNumber, TruncDate
+
+from .db.routers import use_primary
+from .models import PointTransaction, Semester, StudentProfile
+
+RECENT_ACTIVITY_LIMIT = 10
+
+
+@dataclass
+class StudentSnapshot:
+    balance: int = 0
+    last_purchase: PointTransaction | None = None
+    recent_activity: list[PointTransaction] = field(default_factory=list)
+
+
+def student_version_key(student_id: int) -> str:
+    return f"snapshot:student-version:{student_id}"
+
+
+def bump_student_version(student_id: int) -> None:
+    # A random token rather than a counter: an evicted counter would restart and could match an old snapshot.
+    cache.set(student_version_key(student_id), uuid.uuid4().hex, None)
+
+
+def student_version(student_id: int) -> str:
+    key = student_version_key(student_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def load_student_snapshot(student: StudentProfile, semester: Semester) -> StudentSnapshot:
+    newest_first = [F("created_at").desc(), F("id").desc()]
+    rows = list(
+        PointTransaction.objects.filter(semester=semester, student_profile=student)
+        .annotate(
+            balance=Window(Sum("points_delta")),
+            recent_rank=Window(RowNumber(), order_by=newest_first),
+            type_rank=Window(RowNumber(), partition_by=[F("tx_type")], order_by=newest_first),
+        )
+        .filter(Q(recent_rank__lte=RECENT_ACTIVITY_LIMIT) | Q(tx_type=PointTransaction.TxType.REDEEM, type_rank=1))
+        .select_related("created_by__teacher_profile")
+        .order_by("recent_rank")
+    )
+    if not rows:
+        return StudentSnapshot()
+    return StudentSnapshot(
+        balance=int(rows[0].balance),
+        last_purchase=next((row for row in rows if row.tx_type == PointTransaction.TxType.REDEEM), None),
+        recent_activity=[row for row in rows if row.recent_rank <= RECENT_ACTIVITY_LIMIT],
+    )
+
+
+def student_snapshot(student: StudentProfile, semester: Semester) -> StudentSnapshot:
+    if not settings.CACHE_SHARED:
+        # A bump in another worker's locmem cache would never reach this one.
+        return load_student_snapshot(student, semester)
+    key = f"snapshot:student:{student.pk}:{semester.pk}:{student_version(student.pk)}"
+    snapshot = cache.get(key)
+    if snapshot is None:
+        # A lagging replica would otherwise be cached under the new version until the next write.
+        with use_primary():
+            snapshot = load_student_snapshot(student, semester)
+        cache.set(key, snapshot, settings.STUDENT_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def load_balance_series(student: StudentProfile, semester: Semester) -> list[tuple[date, int]]:
+    day = TruncDate("created_at")
+    oldest_first = [F("created_at").asc(), F("id").asc()]
+    # Running balance per ledger row, keeping only the last row of each day, so one row per day leaves the database.
+    rows = (
+        PointTransaction.objects.filter(semester=semester, student_profile=student)
+        .annotate(
+            day=day,
+            balance=Window(Sum("points_delta"), order_by=oldest_first, frame=RowRange(end=0)),
+            day_rank=Window(RowNumber(), partition_by=[day], order_by=[F("created_at").desc(), F("id").desc()]),
+        )
+        .filter(day_rank=1)
+        .order_by("day")
+        .values_list("day", "balance")
+    )
+    return [(row_day, int(balance)) for row_day, balance in rows]
+
+
+def balance_series(student: StudentProfile, semester: Semester) -> list[tuple[date, int]]:
+    if not settings.CACHE_SHARED:
+        return load_balance_series(student, semester)
+    key = f"snapshot:balance-series:{student.pk}:{semester.pk}:{student_version(student.pk)}"
+    series = cache.get(key)
+    if series is None:
+        with use_primary():
+            series = load_balance_series(student, semester)
+        cache.set(key, series, settings.STUDENT_SNAPSHOT_TIMEOUT)
+    return series
+
+
+def encode_balance_series(series: list[tuple[date, int]]) -> str:
+    payload = {"days": [day.isoformat() for day, _ in series], "balance": [balance for _, balance in series]}
+    return json.dumps(payload, separators=(",", ":"))
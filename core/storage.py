@@ -0,0 +1,15 @@
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticStorage(CompressedManifestStaticFilesStorage):
+    @property
+    def manifest_strict(self) -> bool:
+        return settings.STATIC_MANIFEST_STRICT
+
+    def stored_name(self, name: str) -> str:
+        # Before collectstatic (development, tests) there is no manifest: serve the unhashed name. In production a
+        # missing manifest or entry raises instead of quietly serving names that never get immutable caching.
+        if not self.manifest_strict and not self.hashed_files:
+            return name
+        return super().stored_name(name)
@@ -0,0 +1,260 @@
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import django
+from django.db import DatabaseError, IntegrityError, connection, connections
+
+from .db.retry import contention_reason
+from .models import BonusItem, GroupPurchase, Semester, User
+from .seeding import SeededData, seed_demo_data
+from .services import (
+    DomainError,
+    confirm_group_purchase,
+    redeem_bonus,
+    reserve_group_points,
+)
+from .tenants import default_school_id
+from .verification import Mismatch, verify_ledger
+
+OPERATIONS = ("redeem", "reserve", "confirm")
+PATTERNS = ("hot-bonus", "hot-student", "spread")
+
+
+@dataclass
+class WorkerPlan:
+    worker: int
+    student_user_ids: list[int]
+    bonus_ids: list[int]
+    pattern: str
+    mix: dict[str, int]
+    duration: float
+    hot_students: int
+    seed: int
+
+
+@dataclass
+class WorkerResult:
+    latencies_ms: dict[str, list[float]] = field(default_factory=dict)
+    succeeded: Counter = field(default_factory=Counter)
+    domain_errors: Counter = field(default_factory=Counter)
+    database_errors: Counter = field(default_factory=Counter)
+    lock_waits_ms: list[float] = field(default_factory=list)
+
+    def merge(self, other: "WorkerResult") -> None:
+        for operation, samples in other.latencies_ms.items():
+            self.latencies_ms.setdefault(operation, []).extend(samples)
+        self.succeeded.update(other.succeeded)
+        self.domain_errors.update(other.domain_errors)
+        self.database_errors.update(other.database_errors)
+        self.lock_waits_ms.extend(other.lock_waits_ms)
+
+
+class LockWaitTimer:
+    def __init__(self) -> None:
+        self.samples: list[float] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if "FOR UPDATE" not in sql:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.samples.append((time.perf_counter() - started) * 1000)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS or not weight.strip().isdigit():
+            raise ValueError(f"Neteisingas operacijų santykis: {part!r}")
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("Bent vienos operacijos svoris turi būti teigiamas.")
+    return mix
+
+
+def _set_active(semester_ids: list[int], is_active: bool) -> None:
+    # save() rather than update(), so the semester signals drop the cached active semester.
+    for semester in Semester.objects.filter(pk__in=semester_ids):
+        semester.is_active = is_active
+        semester.save(update_fields=["is_active"])
+
+
+def seed_stress_data(students: int, bonuses: int, seed: int) -> tuple[SeededData, list[int]]:
+    school_id = default_school_id()
+    previously_active = list(Semester.objects.filter(school_id=school_id, is_active=True).values_list("pk", flat=True))
+    _set_active(previously_active, False)
+    try:
+        data = seed_demo_data(
+            students=students, teachers=3, bonuses=bonuses, transactions=students * 10, days=5, seed=seed
+        )
+    except BaseException:
+        _set_active(previously_active, True)
+        raise
+    return data, previously_active
+
+
+def remove_stress_data(data: SeededData, previously_active: list[int]) -> None:
+    user_ids = [student.user_id for student in data.students] + [teacher.user_id for teacher in data.teachers]
+    data.semester.delete()
+    User.objects.filter(pk__in=user_ids).delete()
+    BonusItem.objects.filter(pk__in=[bonus.pk for bonus in data.bonuses]).delete()
+    _set_active(previously_active, True)
+
+
+def build_plans(
+    data: SeededData, workers: int, pattern: str, mix: dict[str, int], duration: float, hot_students: int, seed: int
+) -> list[WorkerPlan]:
+    bonus_ids = [bonus.pk for bonus in data.bonuses if bonus.category == BonusItem.Category.OTHER]
+    student_user_ids = [student.user_id for student in data.students]
+    return [
+        WorkerPlan(
+            worker=worker,
+            student_user_ids=student_user_ids,
+            bonus_ids=bonus_ids,
+            pattern=pattern,
+            mix=mix,
+            duration=duration,
+            hot_students=hot_students,
+            seed=seed,
+        )
+        for worker in range(workers)
+    ]
+
+
+def classify_database_error(exc: DatabaseError) -> str:
+    reason = contention_reason(exc)
+    if reason:
+        return reason
+    if isinstance(exc, IntegrityError):
+        return "integrity_error"
+    return type(exc).__name__
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _choose_operation(rng: random.Random, mix: dict[str, int]) -> str:
+    operations = [operation for operation in OPERATIONS if mix.get(operation)]
+    return rng.choices(operations, weights=[mix[operation] for operation in operations])[0]
+
+
+def run_worker(plan: WorkerPlan) -> WorkerResult:
+    rng = random.Random(plan.seed + plan.worker)
+    students = list(User.objects.filter(pk__in=plan.student_user_ids).order_by("pk"))
+    bonuses = list(BonusItem.objects.filter(pk__in=plan.bonus_ids).order_by("pk"))
+    if plan.pattern == "hot-student":
+        students = students[: max(plan.hot_students, 1)]
+    if plan.pattern == "hot-bonus":
+        bonuses = bonuses[:1]
+
+    result = WorkerResult(latencies_ms={operation: [] for operation in OPERATIONS})
+    timer = LockWaitTimer()
+    deadline = time.monotonic() + plan.duration
+    with connection.execute_wrapper(timer):
+        while time.monotonic() < deadline:
+            operation = _choose_operation(rng, plan.mix)
+            student = rng.choice(students)
+            bonus = rng.choice(bonuses)
+            started = time.perf_counter()
+            try:
+                if operation == "redeem":
+                    redeem_bonus(student, bonus)
+                elif operation == "reserve":
+                    reserve_group_points(student, bonus, rng.randint(1, max(bonus.price_points // 3, 1)))
+                else:
+                    confirm_group_purchase(student, bonus)
+            except DomainError as exc:
+                result.domain_errors[f"{operation}: {exc.message}"] += 1
+            except DatabaseError as exc:
+                result.database_errors[f"{operation}: {classify_database_error(exc)}"] += 1
+            else:
+                result.succeeded[operation] += 1
+            result.latencies_ms[operation].append((time.perf_counter() - started) * 1000)
+    result.lock_waits_ms = timer.samples
+    return result
+
+
+def _run_in_thread(plan: WorkerPlan) -> WorkerResult:
+    try:
+        return run_worker(plan)
+    finally:
+        connections.close_all()
+
+
+def _init_process() -> None:
+    django.setup()
+
+
+def run_stress(plans: list[WorkerPlan], mode: str) -> tuple[WorkerResult, float]:
+    total = WorkerResult(latencies_ms={operation: [] for operation in OPERATIONS})
+    started = time.perf_counter()
+    if mode == "process":
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=len(plans), initializer=_init_process) as pool:
+            for result in pool.map(run_worker, plans):
+                total.merge(result)
+    else:
+        with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+            for result in pool.map(_run_in_thread, plans):
+                total.merge(result)
+    return total, time.perf_counter() - started
+
+
+def invariant_violations(data: SeededData) -> list[Mismatch]:
+    purchase_ids = set(GroupPurchase.objects.filter(semester=data.semester).values_list("pk", flat=True))
+    violations = []
+    for mismatch in verify_ledger(workers=1):
+        if mismatch.check in ("balance", "bonus_usage") and mismatch.key[0] == data.semester.pk:
+            violations.append(mismatch)
+        elif mismatch.check == "group_purchase" and mismatch.key[0] in purchase_ids:
+            violations.append(mismatch)
+    return violations
+
+
+def render_report(result: WorkerResult, elapsed: float, meta: dict, violations: list[Mismatch]) -> str:
+    attempts = sum(len(samples) for samples in result.latencies_ms.values())
+    lines = [
+        f"Duomenų bazė: {meta['vendor']}, režimas: {meta['mode']}, darbuotojai: {meta['workers']}, "
+        f"šablonas: {meta['pattern']}, trukmė: {elapsed:.1f} s",
+        f"Bandymai: {attempts}, pralaidumas: {attempts / elapsed:.1f} op/s, "
+        f"sėkmingi: {sum(result.succeeded.values())} ({sum(result.succeeded.values()) / elapsed:.1f} op/s)",
+        "",
+        f"{'Operacija':<10} {'bandymai':>9} {'sėkmingi':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}",
+    ]
+    for operation in OPERATIONS:
+        samples = result.latencies_ms.get(operation, [])
+        if not samples:
+            continue
+        lines.append(
+            f"{operation:<10} {len(samples):>9} {result.succeeded[operation]:>9} "
+            f"{percentile(samples, 0.5):>8.1f} {percentile(samples, 0.95):>8.1f} "
+            f"{percentile(samples, 0.99):>8.1f} {max(samples):>8.1f}"
+        )
+    waits = result.lock_waits_ms
+    lines += [
+        "",
+        f"SELECT ... FOR UPDATE (tik PostgreSQL): {len(waits)} užkl., p50 {percentile(waits, 0.5):.1f} ms, "
+        f"p99 {percentile(waits, 0.99):.1f} ms, max {max(waits, default=0):.1f} ms",
+        "",
+        "DB klaidos (serializacija, aklavietės, užraktai):",
+    ]
+    lines += [f"  {count:>6}  {name}" for name, count in result.database_errors.most_common()] or ["  nėra"]
+    lines += ["", "Verslo atmetimai (DomainError):"]
+    lines += [f"  {count:>6}  {name}" for name, count in result.domain_errors.most_common()] or ["  nėra"]
+    lines += ["", "Invariantų pažeidimai:"]
+    lines += [
+        f"  [{violation.check}] {violation.description}: saugoma {violation.stored}, apskaičiuota {violation.actual}"
+        for violation in violations
+    ] or ["  nėra"]
+    return "\n".join(lines) + "\n"
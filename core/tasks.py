@@ -0,0 +1,42 @@
+from django.conf import settings
+
+from .images import generate_school_image_variants
+from .jobs import enqueue, task
+from .models import PointTransaction, RollupWatermark, SchoolSettings, Semester
+from .rollups import POINTS_WATERMARK, rollup_point_transactions
+from .services import invalidate_school_settings, refresh_leaderboard
+
+
+@task("school_image_variants")
+def school_image_variants(pk: int) -> None:
+    settings_row = SchoolSettings.objects.filter(pk=pk).first()
+    if settings_row is None:
+        return
+    variants = generate_school_image_variants(settings_row)
+    if variants != settings_row.image_variants:
+        SchoolSettings.objects.filter(pk=pk).update(image_variants=variants)
+        # update() sends no post_save, so a row cached since the upload would keep serving the originals.
+        invalidate_school_settings(settings_row.school_id)
+
+
+@task("rollup_points")
+def rollup_points() -> None:
+    rollup_point_transactions()
+    # The Top 5 is refreshed from here rather than on every ledger write. A refresh stored in the worker's own
+    # locmem cache would never reach the web processes, so it needs a shared cache.
+    if settings.CACHE_SHARED:
+        for semester_id in Semester.objects.filter(is_active=True).values_list("pk", flat=True):
+            enqueue(
+                "refresh_leaderboard", {"semester_id": semester_id}, unique_key=f"refresh_leaderboard:{semester_id}"
+            )
+    watermark = RollupWatermark.objects.filter(name=POINTS_WATERMARK).values_list("last_id", flat=True).first()
+    # Rows younger than the settle window are skipped; come back for them instead of waiting for the next write.
+    if PointTransaction.objects.filter(id__gt=watermark or 0).exists():
+        enqueue("rollup_points", delay=getattr(settings, "ROLLUP_SETTLE_SECONDS", 60), unique_key="rollup_points")
+
+
+@task("refresh_leaderboard")
+def leaderboard(semester_id: int) -> None:
+    semester = Semester.objects.filter(pk=semester_id).first()
+    if semester is not None:
+        refresh_leaderboard(semester)
@@ -0,0 +1,21 @@
+from functools import lru_cache
+from pathlib import Path
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def _static_source(path: str) -> str:
+    found = finders.find(path)
+    if found is None:
+        raise ValueError(f"Statinis failas nerastas: {path}")
+    return Path(found).read_text(encoding="utf-8")
+
+
+@register.simple_tag
+def inline_static(path: str) -> str:
+    return mark_safe(_static_source(path))
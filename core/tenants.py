@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+_current_school: ContextVar[int | None] = ContextVar("current_school", default=None)
+
+SCHOOL_DOMAINS_CACHE_KEY = "tenants:domains"
+
+
+def current_school_id() -> int | None:
+    return _current_school.get()
+
+
+@contextmanager
+def use_school(school_id: int | None):
+    token = _current_school.set(school_id)
+    try:
+        yield
+    finally:
+        _current_school.reset(token)
+
+
+def tenant_cache_key(key: str, school_id: int | None = None) -> str:
+    school_id = school_id if school_id is not None else current_school_id()
+    return f"{key}:school:{school_id if school_id is not None else 'all'}"
+
+
+def tenant_cache_keys(key: str, school_id: int | None = None) -> list[str]:
+    school_id = school_id if school_id is not None else current_school_id()
+    if school_id is None:
+        from .models import School
+
+        school_ids = list(School.objects.values_list("pk", flat=True))
+    else:
+        school_ids = [school_id]
+    # Commands and workers run without a tenant and cache under the unscoped key; drop it as well.
+    return [tenant_cache_key(key, pk) for pk in school_ids] + [f"{key}:school:all"]
+
+
+def default_school_id() -> int:
+    school_id = current_school_id()
+    if school_id is not None:
+        return school_id
+    from .models import School
+
+    school, _ = School.objects.get_or_create(is_default=True, defaults={"name": "Mokykla", "domain": "localhost"})
+    return school.pk
+
+
+def school_domains() -> dict[str, int]:
+    domains = cache.get(SCHOOL_DOMAINS_CACHE_KEY)
+    if domains is None:
+        from .models import School
+
+        domains = {
+            "": School.objects.filter(is_default=True).values_list("pk", flat=True).first(),
+            **dict(School.objects.values_list("domain", "pk")),
+        }
+        cache.set(SCHOOL_DOMAINS_CACHE_KEY, domains, getattr(settings, "SERVICE_CACHE_TIMEOUT", 300))
+    return domains
+
+
+def invalidate_school_domains() -> None:
+    cache.delete(SCHOOL_DOMAINS_CACHE_KEY)
+
+
+def school_for_host(host: str) -> int | None:
+    domains = school_domains()
+    return domains.get(host.lower().rstrip("."), domains[""])
+
+
+def belongs_to_current_school(user) -> bool:
+    school_id = current_school_id()
+    if school_id is None or user.is_superuser:
+        return True
+    profile = getattr(user, "teacher_profile", None) or getattr(user, "student_profile", None)
+    # Staff without a profile are bound to a school through User.school; a user with neither is refused.
+    return (profile or user).school_id == school_id
+
+
+class TenantManager(models.Manager):
+    def get_queryset(self) -> models.QuerySet:
+        queryset = super().get_queryset()
+        school_id = current_school_id()
+        if school_id is None:
+            return queryset
+        return queryset.filter(school_id=school_id)
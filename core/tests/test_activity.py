@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.activity import activity_cache_key, activity_feed, append_activity, load_activity_feed
+from core.models import PointTransaction, Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.services import award_points
+
+
+@override_settings(ACTIVITY_FEED_SIZE=3, CACHE_SHARED=True)
+class ActivityFeedTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.semester = Semester.objects.create(
+            name="2024 Ruduo",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=True,
+        )
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        self.teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=self.teacher_profile, semester=self.semester, allocated_points=500)
+        self.student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        self.student = StudentProfile.objects.create(user=self.student_user, display_name="Mokinys")
+
+    def award(self, points: int) -> PointTransaction:
+        with self.captureOnCommitCallbacks(execute=True):
+            return award_points(self.teacher_user, self.student, points, f"Taškai {points}")
+
+    def test_writes_append_to_bounded_buffer(self) -> None:
+        self.award(1)
+        self.assertEqual([entry.points_delta for entry in activity_feed(self.semester).entries], [1])
+
+        for points in (2, 3, 4):
+            self.award(points)
+
+        with CaptureQueriesContext(connection) as queries:
+            feed = activity_feed(self.semester)
+        self.assertEqual(queries.captured_queries, [])
+        self.assertEqual([entry.points_delta for entry in feed.entries], [4, 3, 2])
+        self.assertTrue(feed.truncated)
+        self.assertEqual(feed.entries[0].student_name, "Mokinys")
+        self.assertEqual(feed.entries[0].teacher_name, "Mokytojas")
+
+    def test_missing_buffer_is_rebuilt_from_ledger(self) -> None:
+        self.award(5)
+        cache.delete(activity_cache_key(self.semester.pk))
+        self.award(6)
+
+        feed = activity_feed(self.semester)
+        self.assertEqual([entry.points_delta for entry in feed.entries], [6, 5])
+        self.assertFalse(feed.truncated)
+
+    def test_append_while_another_writer_holds_the_lock_drops_buffer(self) -> None:
+        tx = self.award(7)
+        activity_feed(self.semester)
+        cache.add(f"{activity_cache_key(self.semester.pk)}:lock", 1)
+
+        append_activity(tx.pk, self.semester.pk)
+        self.assertIsNone(cache.get(activity_cache_key(self.semester.pk)))
+
+    def test_rebuild_racing_a_write_is_not_cached(self) -> None:
+        self.award(1)
+
+        def load_then_write(semester_id):
+            feed = load_activity_feed(semester_id)
+            self.award(2)
+            return feed
+
+        with mock.patch("core.activity.load_activity_feed", side_effect=load_then_write):
+            self.assertEqual([entry.points_delta for entry in activity_feed(self.semester).entries], [1])
+        self.assertEqual([entry.points_delta for entry in activity_feed(self.semester).entries], [2, 1])
+
+    def test_profile_change_only_drops_feeds_of_its_school(self) -> None:
+        activity_feed(self.semester)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            self.student.save(update_fields=["display_name"])
+        semester_queries = [query["sql"] for query in queries.captured_queries if "core_semester" in query["sql"]]
+        self.assertEqual(len(semester_queries), 1)
+        self.assertIn("school_id", semester_queries[0])
+        self.assertIsNone(cache.get(activity_cache_key(self.semester.pk)))
+
+    def test_profile_rename_refreshes_entries(self) -> None:
+        self.award(1)
+        activity_feed(self.semester)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.display_name = "Mokinys Naujas"
+            self.student.save(update_fields=["display_name"])
+        self.assertEqual(activity_feed(self.semester).entries[0].student_name, "Mokinys Naujas")
+
+    def test_dashboards_read_feed_without_ledger_query(self) -> None:
+        self.award(2)
+        activity_feed(self.semester)
+        self.client.force_login(self.teacher_user)
+        self.client.get(reverse("teacher_dashboard"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("teacher_dashboard"))
+
+        self.assertContains(response, "Taškai 2")
+        self.assertNotIn(
+            'FROM "core_pointtransaction" INNER JOIN "core_studentprofile"',
+            " ".join(query["sql"] for query in queries.captured_queries),
+        )
+
+    @override_settings(CACHE_SHARED=False)
+    def test_unshared_cache_reads_feed_from_ledger(self) -> None:
+        activity_feed(self.semester)
+        # The on-commit append runs in whichever worker handled the write, not necessarily this one.
+        award_points(self.teacher_user, self.student, 5, "Kitame procese")
+
+        self.assertEqual([entry.message for entry in activity_feed(self.semester).entries], ["Kitame procese"])
+        self.assertIsNone(cache.get(activity_cache_key(self.semester.pk)))
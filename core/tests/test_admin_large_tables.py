@@ -0,0 +1,85 @@
+from unittest import skipUnless
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import PointTransaction, Semester, StudentProfile, User
+from core.tenants import default_school_id, use_school
+
+
+@override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+class LargeTableAdminTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        today = timezone.now().date()
+        self.active = Semester.objects.create(name="Ruduo", start_date=today, end_date=today, is_active=True)
+        self.previous = Semester.objects.create(name="Pavasaris", start_date=today, end_date=today)
+        admin_user = User.objects.create_superuser(username="admin", password="pass", email="admin@example.com")
+        students = []
+        for index, name in enumerate(["Jonas", "Jonė", "Petras", "Šarūnas"]):
+            user = User.objects.create_user(username=f"student{index}", password="pass", role=User.Role.STUDENT)
+            students.append(StudentProfile.objects.create(user=user, display_name=name))
+        for semester in (self.active, self.previous):
+            PointTransaction.objects.bulk_create(
+                [
+                    PointTransaction(
+                        semester=semester,
+                        student_profile=student,
+                        created_by=admin_user,
+                        tx_type=PointTransaction.TxType.ADMIN_ADJUST,
+                        points_delta=1,
+                        message="Korekcija",
+                    )
+                    for student in students
+                ]
+            )
+        self.client.force_login(admin_user)
+
+    def test_changelist_defaults_to_active_semester_without_row_lookups(self) -> None:
+        url = reverse("admin:core_pointtransaction_changelist")
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.context["cl"].result_list), 4)
+        self.assertTrue(all(tx.semester_id == self.active.id for tx in response.context["cl"].result_list))
+        row_lookups = [query["sql"] for query in queries.captured_queries if 'FROM "core_studentprofile"' in query["sql"]]
+        self.assertEqual(row_lookups, [])
+
+        response = self.client.get(url, {"semester": "all"})
+        self.assertEqual(len(response.context["cl"].result_list), 8)
+
+    def test_search_uses_student_name_prefix(self) -> None:
+        response = self.client.get(reverse("admin:core_pointtransaction_changelist"), {"q": "jon"})
+
+        names = sorted(tx.student_profile.display_name for tx in response.context["cl"].result_list)
+        self.assertEqual(names, ["Jonas", "Jonė"])
+
+    def test_search_folds_lithuanian_letters(self) -> None:
+        response = self.client.get(reverse("admin:core_pointtransaction_changelist"), {"q": "šar"})
+
+        names = [tx.student_profile.display_name for tx in response.context["cl"].result_list]
+        self.assertEqual(names, ["Šarūnas"])
+
+    def test_search_matches_username_exactly(self) -> None:
+        response = self.client.get(reverse("admin:core_pointtransaction_changelist"), {"q": "student3"})
+
+        names = [tx.student_profile.display_name for tx in response.context["cl"].result_list]
+        self.assertEqual(names, ["Šarūnas"])
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's.")
+    def test_search_uses_name_and_username_indexes(self) -> None:
+        model_admin = admin.site._registry[PointTransaction]
+        with use_school(default_school_id()):
+            queryset, _ = model_admin.get_search_results(None, PointTransaction.objects.all(), "jon")
+            plan = queryset.explain()
+
+        self.assertIn("USING COVERING INDEX core_student_school_search", plan)
+        self.assertIn("sqlite_autoindex_core_user_1 (username=?)", plan)
+        self.assertNotIn("SCAN", plan)
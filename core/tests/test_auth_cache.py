@@ -0,0 +1,83 @@
+import pickle
+
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.sessions.models import Session
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.auth_backends import user_cache_key
+from core.models import TeacherProfile, User
+
+
+@override_settings(CACHE_SHARED=True, SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+class CachedAuthTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        self.teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        self.client.force_login(self.teacher_user)
+
+    def test_repeated_request_skips_session_and_profile_queries(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("teacher_guidelines"))
+
+        self.assertEqual(response.status_code, 200)
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn("django_session", tables)
+        self.assertNotIn("core_teacherprofile", tables)
+        self.assertEqual(response.wsgi_request.user.teacher_profile, self.teacher_profile)
+
+    def test_cache_holds_no_password_hash(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        cached = cache.get(user_cache_key(self.teacher_user.pk))
+        self.assertEqual(set(cached), {"teacher_profile", "student_profile"})
+        self.assertNotIn(self.teacher_user.password.encode(), pickle.dumps(cached))
+
+    def test_role_change_applies_without_invalidation(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        # Another worker's save cannot clear this process's cache.
+        User.objects.filter(pk=self.teacher_user.pk).update(role=User.Role.STUDENT)
+        response = self.client.get(reverse("teacher_guidelines"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_flushed_session_is_rejected_after_cache_miss(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        Session.objects.filter(session_key=self.client.session.session_key).delete()
+        cache.clear()
+        response = self.client.get(reverse("teacher_guidelines"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivated_user_is_logged_out(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        User.objects.filter(pk=self.teacher_user.pk).update(is_active=False)
+        response = self.client.get(reverse("teacher_guidelines"))
+
+        self.assertEqual(response.status_code, 302)
+
+
+class UnsharedCacheAuthTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        self.client.force_login(self.teacher_user)
+
+    def test_session_flushed_by_another_worker_is_rejected(self) -> None:
+        self.assertEqual(self.client.get(reverse("teacher_guidelines")).status_code, 200)
+        self.assertIsNone(cache.get(user_cache_key(self.teacher_user.pk)))
+
+        # A logout in another worker deletes the row and only its own locmem entries.
+        Session.objects.filter(session_key=self.client.session.session_key).delete()
+        response = self.client.get(reverse("teacher_guidelines"))
+
+        self.assertEqual(response.status_code, 302)
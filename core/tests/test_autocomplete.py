@@ -0,0 +1,107 @@
+import json
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.autocomplete import clear_autocomplete_cache, encode_matches, matching_students, search_students
+from core.models import StudentProfile, TeacherProfile, User
+from core.tenants import default_school_id, use_school
+
+
+class StudentAutocompleteTests(TestCase):
+    def setUp(self) -> None:
+        clear_autocomplete_cache()
+        self.teacher_user = User.objects.create_user(username="teacher_ac", password="pass", role=User.Role.TEACHER)
+        TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        for index, (name, class_name) in enumerate(
+            [("Jonas Jonaitis", "5A"), ("Jonė Petraitė", "6B"), ("Jurgis Kazlauskas", "5A"), ("Ona Onaitė", "5A")]
+        ):
+            user = User.objects.create_user(username=f"student_ac_{index}", password="pass", role=User.Role.STUDENT)
+            StudentProfile.objects.create(user=user, display_name=name, class_name=class_name)
+
+    def test_endpoint_returns_compact_prefix_matches(self) -> None:
+        self.client.force_login(self.teacher_user)
+
+        response = self.client.get(reverse("teacher_student_autocomplete"), {"q": "jon"})
+
+        self.assertEqual(response.status_code, 200)
+        payload = json.loads(response.content)
+        self.assertEqual([row["name"] for row in payload["results"]], ["Jonas Jonaitis", "Jonė Petraitė"])
+        self.assertEqual(set(payload["results"][0]), {"id", "name", "class"})
+        self.assertTrue(payload["complete"])
+
+        payload = self.client.get(reverse("teacher_student_autocomplete"), {"q": "j", "class_name": "5a"}).json()
+        self.assertEqual([row["name"] for row in payload["results"]], ["Jonas Jonaitis", "Jurgis Kazlauskas"])
+
+    def test_non_ascii_prefix_matches_on_query_and_cache_paths(self) -> None:
+        user = User.objects.create_user(username="student_ac_lt", password="pass", role=User.Role.STUDENT)
+        StudentProfile.objects.create(user=user, display_name="Šarūnas Žemaitis", class_name="5A")
+
+        self.assertEqual([row["name"] for row in search_students("š").results], ["Šarūnas Žemaitis"])
+        self.assertEqual([row["name"] for row in search_students("ŠARŪ").results], ["Šarūnas Žemaitis"])
+        clear_autocomplete_cache()
+        self.assertEqual([row["name"] for row in search_students("šarū").results], ["Šarūnas Žemaitis"])
+
+    def test_renamed_students_are_found_by_their_new_name(self) -> None:
+        StudentProfile.objects.filter(display_name="Ona Onaitė").update(display_name="Šarūnė Onaitė")
+        StudentProfile.objects.filter(display_name="Jurgis Kazlauskas").update(
+            display_name=Concat(Value("Ž"), "class_name")
+        )
+        jone = StudentProfile.objects.get(display_name="Jonė Petraitė")
+        jone.display_name = "Ūla Petraitė"
+        StudentProfile.objects.bulk_update([jone], ["display_name"])
+
+        self.assertEqual([row["name"] for row in search_students("šarū").results], ["Šarūnė Onaitė"])
+        self.assertEqual([row["name"] for row in search_students("ž5").results], ["Ž5A"])
+        self.assertEqual([row["name"] for row in search_students("ūla").results], ["Ūla Petraitė"])
+        self.assertEqual([row["name"] for row in search_students("jon").results], ["Jonas Jonaitis"])
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's.")
+    def test_prefix_query_searches_the_school_name_index(self) -> None:
+        with use_school(default_school_id()):
+            plan = matching_students("jon", "").explain()
+
+        self.assertIn("USING INDEX core_student_school_search", plan)
+        self.assertNotIn("SCAN core_studentprofile", plan)
+
+    def test_students_cannot_use_endpoint(self) -> None:
+        self.client.force_login(User.objects.get(username="student_ac_0"))
+
+        response = self.client.get(reverse("teacher_student_autocomplete"), {"q": "jon"})
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_longer_prefix_is_answered_from_cached_shorter_prefix(self) -> None:
+        with self.assertNumQueries(1):
+            search_students("J")
+        with self.assertNumQueries(0):
+            matches = search_students("Jon")
+            search_students("j")
+        self.assertEqual(len(matches.results), 2)
+
+    @override_settings(AUTOCOMPLETE_LIMIT=2)
+    def test_truncated_prefix_is_not_reused(self) -> None:
+        self.assertFalse(search_students("J").complete)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(search_students("Ju").results), 1)
+
+    @override_settings(AUTOCOMPLETE_MAX_BYTES=90)
+    def test_payload_stays_within_budget(self) -> None:
+        matches = search_students("J")
+
+        self.assertLessEqual(len(encode_matches(matches)), 90)
+        self.assertEqual(len(matches.results), 1)
+        self.assertFalse(matches.complete)
+
+    def test_cache_is_cleared_when_students_change(self) -> None:
+        search_students("O")
+        student = StudentProfile.objects.get(display_name="Ona Onaitė")
+        with self.captureOnCommitCallbacks(execute=True):
+            student.display_name = "Rūta Onaitė"
+            student.save()
+
+        self.assertEqual(search_students("O").results, [])
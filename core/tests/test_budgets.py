@@ -0,0 +1,117 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.budgets import AllocationMode, allocate_teacher_budgets
+from core.models import PointTransaction, School, Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.tenants import use_school
+
+
+class BudgetAllocationTests(TestCase):
+    def setUp(self) -> None:
+        self.previous = Semester.objects.create(
+            name="Pavasaris", start_date=date(2024, 2, 1), end_date=date(2024, 6, 1)
+        )
+        self.semester = Semester.objects.create(
+            name="Ruduo", start_date=date(2024, 9, 1), end_date=date(2024, 12, 31), is_active=True
+        )
+        self.teachers = []
+        for index in range(3):
+            user = User.objects.create_user(username=f"teacher{index}", password="pass", role=User.Role.TEACHER)
+            self.teachers.append(TeacherProfile.objects.create(user=user, display_name=f"Mokytojas {index}"))
+        TeacherBudget.objects.create(
+            teacher_profile=self.teachers[0], semester=self.previous, allocated_points=100, spent_points=40
+        )
+        for index in range(2):
+            user = User.objects.create_user(username=f"student{index}", password="pass", role=User.Role.STUDENT)
+            student = StudentProfile.objects.create(user=user, display_name=f"Mokinys {index}")
+            PointTransaction.objects.create(
+                semester=self.previous,
+                student_profile=student,
+                created_by=self.teachers[1].user,
+                tx_type=PointTransaction.TxType.AWARD,
+                points_delta=5,
+            )
+
+    def allocated(self) -> list[int]:
+        budgets = dict(
+            TeacherBudget.objects.filter(semester=self.semester).values_list("teacher_profile_id", "allocated_points")
+        )
+        return [budgets.get(teacher.id) for teacher in self.teachers]
+
+    def test_flat_allocation_upserts_without_touching_spent_points(self) -> None:
+        TeacherBudget.objects.create(
+            teacher_profile=self.teachers[0], semester=self.semester, allocated_points=10, spent_points=7
+        )
+
+        self.assertEqual(allocate_teacher_budgets(self.semester, AllocationMode.FLAT, amount=50), 3)
+
+        self.assertEqual(self.allocated(), [50, 50, 50])
+        self.assertEqual(
+            TeacherBudget.objects.get(teacher_profile=self.teachers[0], semester=self.semester).spent_points, 7
+        )
+
+    def test_reallocation_never_drops_below_spent_points(self) -> None:
+        TeacherBudget.objects.create(
+            teacher_profile=self.teachers[0], semester=self.semester, allocated_points=100, spent_points=80
+        )
+
+        allocate_teacher_budgets(self.semester, AllocationMode.FLAT, amount=30)
+
+        self.assertEqual(self.allocated(), [80, 30, 30])
+        budget = TeacherBudget.objects.get(teacher_profile=self.teachers[0], semester=self.semester)
+        self.assertEqual((budget.spent_points, budget.remaining_points), (80, 0))
+
+    def test_carry_over_and_per_student_use_previous_semester(self) -> None:
+        allocate_teacher_budgets(self.semester, AllocationMode.CARRY_OVER, amount=20, include_unspent=True)
+        self.assertEqual(self.allocated(), [160, 20, 20])
+
+        allocate_teacher_budgets(self.semester, AllocationMode.PER_STUDENT, amount=30, minimum=10)
+        self.assertEqual(self.allocated(), [10, 60, 10])
+
+    def test_command_allocates_the_active_semester_of_every_school(self) -> None:
+        other = School.objects.create(name="Kita mokykla", domain="kita.pointify.lt")
+        with use_school(other.pk):
+            other_semester = Semester.objects.create(
+                name="Kitos ruduo", start_date=date(2024, 9, 1), end_date=date(2024, 12, 31), is_active=True
+            )
+            user = User.objects.create_user(username="other-teacher", password="pass", role=User.Role.TEACHER)
+            other_teacher = TeacherProfile.objects.create(user=user, display_name="Kitas mokytojas")
+
+        call_command("allocate_budgets", "--amount=25", stdout=StringIO())
+        self.assertEqual(self.allocated(), [25, 25, 25])
+        self.assertEqual(TeacherBudget.objects.get(teacher_profile=other_teacher).semester, other_semester)
+
+        call_command("allocate_budgets", "--amount=40", f"--school={other.pk}", stdout=StringIO())
+        self.assertEqual(self.allocated(), [25, 25, 25])
+        self.assertEqual(TeacherBudget.objects.get(teacher_profile=other_teacher).allocated_points, 40)
+
+    def test_command_and_admin_action(self) -> None:
+        call_command("allocate_budgets", "--amount=25", stdout=StringIO())
+        self.assertEqual(self.allocated(), [25, 25, 25])
+
+        admin_user = User.objects.create_superuser(username="admin", password="pass", email="admin@example.com")
+        self.client.force_login(admin_user)
+        with override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage"):
+            response = self.client.post(
+                reverse("admin:core_semester_changelist"),
+                {"action": "allocate_budgets", ACTION_CHECKBOX_NAME: [self.semester.pk]},
+            )
+            self.assertContains(response, 'name="apply"')
+            response = self.client.post(
+                reverse("admin:core_semester_changelist"),
+                {
+                    "action": "allocate_budgets",
+                    ACTION_CHECKBOX_NAME: [self.semester.pk],
+                    "apply": "1",
+                    "mode": AllocationMode.CARRY_OVER,
+                    "amount": 5,
+                    "minimum": 0,
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.allocated(), [100, 5, 5])
@@ -0,0 +1,48 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY
+
+POOL_ALIAS = "pool_test"
+
+
+def sample(name: str) -> float:
+    return REGISTRY.get_sample_value(name, {"database": POOL_ALIAS}) or 0.0
+
+
+@skipUnless(connection.vendor == "postgresql", "Ryšių telkinys veikia tik su PostgreSQL.")
+class PostgresPoolBackendTests(SimpleTestCase):
+    def setUp(self) -> None:
+        from core.db.backends.postgresql_pool.base import DatabaseWrapper, close_pools
+
+        settings_dict = {
+            **connection.settings_dict,
+            "ENGINE": "core.db.backends.postgresql_pool",
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {**connection.settings_dict["OPTIONS"], "pool": {"min_size": 1, "max_size": 2}},
+        }
+        # Opened and closed in the test thread; the wrapper is not registered in django.db.connections.
+        self.wrapper = DatabaseWrapper(settings_dict, alias=POOL_ALIAS)
+        self.addCleanup(close_pools, POOL_ALIAS)
+        self.addCleanup(self.wrapper.close)
+
+    def test_connection_is_returned_to_the_pool_and_counted(self) -> None:
+        from core.db.backends.postgresql_pool.base import pool_stats
+
+        checkouts = sample("school_db_pool_checkouts_total")
+        waits = sample("school_db_pool_wait_seconds_count")
+
+        for _ in range(2):
+            with self.wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                self.assertEqual(cursor.fetchone(), (1,))
+            self.wrapper.close()
+            self.assertIsNone(self.wrapper.connection)
+
+        stats = pool_stats()[POOL_ALIAS]
+        self.assertEqual(stats["acquire_count"], 2)
+        self.assertEqual(stats["pool_size"], 1)
+        self.assertEqual(stats["pool_available"], 1)
+        self.assertEqual(sample("school_db_pool_checkouts_total"), checkouts + 2)
+        self.assertEqual(sample("school_db_pool_wait_seconds_count"), waits + 2)
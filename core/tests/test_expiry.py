@@ -0,0 +1,73 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.expiry import sweep_stale
+from core.models import BonusRedemptionRequest, GroupContribution, GroupPurchase
+from core.seeding import seed_demo_data
+from core.services import student_reserved_points
+from core.verification import verify_ledger
+
+
+class SweepStaleTests(TestCase):
+    def setUp(self) -> None:
+        self.data = seed_demo_data(students=10, teachers=2, bonuses=4, transactions=100, days=5)
+        self.purchase = GroupPurchase.objects.get()
+        self.contributor = GroupContribution.objects.filter(group_purchase=self.purchase).first().student_profile
+        self.long_ago = timezone.now() - timedelta(days=60)
+
+    def _age_purchase(self) -> None:
+        GroupPurchase.objects.filter(pk=self.purchase.pk).update(created_at=self.long_ago)
+        GroupContribution.objects.filter(group_purchase=self.purchase).update(updated_at=self.long_ago)
+
+    def test_abandoned_group_purchase_expires_and_releases_points(self) -> None:
+        self._age_purchase()
+        self.assertEqual(student_reserved_points(self.contributor, self.data.semester), 1)
+
+        result = sweep_stale(chunk_size=1)
+
+        self.assertEqual(result.group_purchases, 1)
+        self.purchase.refresh_from_db()
+        self.assertEqual(self.purchase.status, GroupPurchase.Status.EXPIRED)
+        self.assertEqual(student_reserved_points(self.contributor, self.data.semester), 0)
+        self.assertEqual(verify_ledger(), [])
+
+    def test_recent_contribution_keeps_purchase_open(self) -> None:
+        self._age_purchase()
+        GroupContribution.objects.filter(group_purchase=self.purchase).first().save()
+
+        self.assertEqual(sweep_stale().group_purchases, 0)
+        self.purchase.refresh_from_db()
+        self.assertEqual(self.purchase.status, GroupPurchase.Status.OPEN)
+
+    def test_ended_semester_expires_everything_pending(self) -> None:
+        semester = self.data.semester
+        semester.end_date = timezone.localdate() - timedelta(days=1)
+        semester.save(update_fields=["end_date"])
+
+        result = sweep_stale(chunk_size=2)
+
+        self.assertEqual((result.group_purchases, result.bonus_requests), (1, 5))
+        request = BonusRedemptionRequest.objects.first()
+        self.assertEqual(request.status, BonusRedemptionRequest.Status.EXPIRED)
+        self.assertIsNotNone(request.decided_at)
+
+    def test_old_pending_request_expires(self) -> None:
+        request = BonusRedemptionRequest.objects.first()
+        BonusRedemptionRequest.objects.filter(pk=request.pk).update(created_at=self.long_ago)
+
+        self.assertEqual(sweep_stale().bonus_requests, 1)
+        self.assertEqual(BonusRedemptionRequest.objects.filter(status=BonusRedemptionRequest.Status.PENDING).count(), 4)
+
+    def test_dry_run_changes_nothing(self) -> None:
+        self._age_purchase()
+
+        out = StringIO()
+        call_command("sweep_stale", "--dry-run", stdout=out)
+
+        self.assertIn("Būtų pažymėta EXPIRED: grupinių pirkimų 1", out.getvalue())
+        self.purchase.refresh_from_db()
+        self.assertEqual(self.purchase.status, GroupPurchase.Status.OPEN)
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.history import award_history_page, award_subtotals_by_class, award_subtotals_by_student, budget_burn
+from core.models import PointTransaction, Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.services import award_points
+
+
+class AwardHistoryTests(TestCase):
+    def setUp(self) -> None:
+        self.semester = Semester.objects.create(
+            name="2024 Ruduo",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=True,
+        )
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        self.teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        self.budget = TeacherBudget.objects.create(
+            teacher_profile=self.teacher_profile, semester=self.semester, allocated_points=100
+        )
+        other_user = User.objects.create_user(username="teacher2", password="pass", role=User.Role.TEACHER)
+        other_profile = TeacherProfile.objects.create(user=other_user, display_name="Kitas")
+        TeacherBudget.objects.create(teacher_profile=other_profile, semester=self.semester, allocated_points=100)
+        self.students = [
+            StudentProfile.objects.create(
+                user=User.objects.create_user(username=f"student{index}", password="pass", role=User.Role.STUDENT),
+                display_name=f"Mokinys {index}",
+                class_name="5A" if index < 2 else "6B",
+            )
+            for index in range(3)
+        ]
+        for points, student in zip([5, 10, 15, 20], [*self.students, self.students[0]], strict=True):
+            award_points(self.teacher_user, student, points, f"Taškai {points}")
+        award_points(other_user, self.students[1], 7, "Kito mokytojo")
+
+    def test_keyset_pages_cover_every_award_once(self) -> None:
+        # Two awards in the same microsecond must still be split by id.
+        tied = timezone.now() - timedelta(days=1)
+        PointTransaction.objects.filter(created_by=self.teacher_user, points_delta__in=[10, 15]).update(created_at=tied)
+        seen = []
+        cursor = ""
+        while True:
+            page = award_history_page(self.teacher_user, self.semester, cursor, size=1)
+            seen.extend(tx.points_delta for tx in page.awards)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, [20, 5, 15, 10])
+
+    def test_subtotals_and_burn_only_count_own_awards(self) -> None:
+        by_student = award_subtotals_by_student(self.teacher_user, self.semester)
+        self.assertEqual([(row.label, row.points, row.awards) for row in by_student][0], ("Mokinys 0", 25, 2))
+        by_class = award_subtotals_by_class(self.teacher_user, self.semester)
+        self.assertEqual([(row.label, row.points) for row in by_class], [("5A", 35), ("6B", 15)])
+        burn = budget_burn(self.teacher_user, self.semester, self.budget)
+        self.assertEqual([(day.spent, day.remaining, day.percent) for day in burn], [(50, 50, 50)])
+
+    def test_view_renders_history(self) -> None:
+        self.client.force_login(self.teacher_user)
+        response = self.client.get(reverse("teacher_award_history"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page"].awards), 4)
+        self.assertContains(response, "Mokinys 2")
+        self.assertNotContains(response, "Kito mokytojo")
+
+    @override_settings(AWARD_HISTORY_PAGE_SIZE=2)
+    def test_later_pages_skip_the_semester_summaries(self) -> None:
+        self.client.force_login(self.teacher_user)
+        url = reverse("teacher_award_history")
+        cursor = self.client.get(url).context["page"].next_cursor
+        with CaptureQueriesContext(connection) as first_page:
+            self.client.get(url)
+
+        with CaptureQueriesContext(connection) as later_page:
+            response = self.client.get(url, {"after": cursor})
+
+        self.assertEqual(len(response.context["page"].awards), 2)
+        self.assertEqual(len(later_page), len(first_page) - 4)
+        self.assertFalse([query["sql"] for query in later_page.captured_queries if "GROUP BY" in query["sql"]])
+        self.assertNotContains(response, "Biudžeto naudojimas")
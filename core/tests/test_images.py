@@ -0,0 +1,62 @@
+import io
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from core.jobs import run_pending
+from core.models import SchoolSettings
+from core.services import get_school_settings
+
+
+def _image_upload(name: str, size: tuple[int, int], image_format: str) -> SimpleUploadedFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (20, 120, 200)).save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class SchoolImageVariantTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self) -> None:
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_upload_generates_hashed_variants_for_login_page(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            settings_row = SchoolSettings.objects.create(
+                name="Mokykla",
+                logo=_image_upload("logo.png", (800, 400), "PNG"),
+                login_background=_image_upload("fonas.jpg", (3000, 2000), "JPEG"),
+            )
+        self.assertEqual(run_pending(), 1)
+
+        settings_row.refresh_from_db()
+        self.assertEqual(set(settings_row.image_variants["logo"]["webp"]), {"48", "64", "96", "128"})
+        self.assertEqual(set(settings_row.image_variants["login_background"]["jpeg"]), {"1280", "1920"})
+
+        response = self.client.get(reverse("login"))
+        self.assertContains(response, 'type="image/webp"')
+        self.assertNotContains(response, settings_row.login_background.url)
+
+        variant_name = settings_row.image_variants["logo"]["webp"]["64"].rsplit("/", 1)[-1]
+        variant_response = self.client.get(reverse("school_image_variant", kwargs={"name": variant_name}))
+        self.assertEqual(variant_response["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(Image.open(io.BytesIO(b"".join(variant_response.streaming_content))).height, 64)
+
+    def test_job_refreshes_cached_school_settings(self) -> None:
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            SchoolSettings.objects.create(name="Mokykla", logo=_image_upload("logo.png", (800, 400), "PNG"))
+        self.assertEqual(get_school_settings().image_variants, {})
+
+        self.assertEqual(run_pending(), 1)
+
+        self.assertEqual(set(get_school_settings().image_variants["logo"]["webp"]), {"48", "64", "96", "128"})
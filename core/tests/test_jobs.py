@@ -0,0 +1,152 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.jobs import TASKS, _recently_enqueued, claim_jobs, enqueue, reclaim_stale_jobs, run_pending, task
+from core.models import BackgroundJob, PointDailyRollup, Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.services import LEADERBOARD_CACHE_KEY, award_points, cached_top_students
+
+calls = []
+
+
+@task("test_record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task("test_explode")
+def explode() -> None:
+    raise RuntimeError("sugedo")
+
+
+@override_settings(JOB_RETRY_BASE_DELAY=0, JOB_RETRY_MAX_DELAY=0, ROLLUP_SETTLE_SECONDS=0)
+class BackgroundJobTests(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+        cache.clear()
+        _recently_enqueued.clear()
+
+    def test_enqueue_deduplicates_pending_jobs_by_unique_key(self) -> None:
+        enqueue("test_record", {"value": 1}, unique_key="record")
+        enqueue("test_record", {"value": 2}, unique_key="record")
+
+        self.assertEqual(run_pending("worker"), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(BackgroundJob.objects.get().status, BackgroundJob.Status.SUCCEEDED)
+
+        enqueue("test_record", {"value": 3}, unique_key="record")
+        self.assertEqual(BackgroundJob.objects.filter(status=BackgroundJob.Status.PENDING).count(), 1)
+
+    def test_delayed_job_waits_until_due(self) -> None:
+        enqueue("test_record", {"value": 1}, delay=60)
+        self.assertEqual(run_pending("worker"), 0)
+
+        BackgroundJob.objects.update(run_after=timezone.now())
+        self.assertEqual(run_pending("worker"), 1)
+
+    def test_failures_retry_then_fail(self) -> None:
+        enqueue("test_explode", max_attempts=2)
+
+        run_pending("worker")
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.Status.PENDING, 1))
+        self.assertIn("sugedo", job.last_error)
+
+        run_pending("worker")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.Status.FAILED, 2))
+
+    def test_claimed_job_is_not_claimed_twice_and_stale_claims_are_reclaimed(self) -> None:
+        enqueue("test_record", {"value": 1})
+        self.assertEqual(len(claim_jobs("first", 10)), 1)
+        self.assertEqual(claim_jobs("second", 10), [])
+
+        BackgroundJob.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(reclaim_stale_jobs(), 1)
+        self.assertEqual(run_pending("second"), 1)
+        self.assertEqual(calls, [1])
+
+    @override_settings(CACHE_SHARED=True)
+    def test_ledger_write_schedules_rollup_and_leaderboard(self) -> None:
+        semester = Semester.objects.create(
+            name="2024 Ruduo", start_date=timezone.now().date(), end_date=timezone.now().date(), is_active=True
+        )
+        teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        teacher = TeacherProfile.objects.create(user=teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=teacher, semester=semester, allocated_points=100)
+        student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        student = StudentProfile.objects.create(user=student_user, display_name="Mokinys")
+        self.assertEqual(cached_top_students(semester)[0].total_points, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            award_points(teacher_user, student, 7, "Taškai")
+        self.assertEqual(cached_top_students(semester)[0].total_points, 0)
+
+        out = StringIO()
+        # The real call would close the TestCase transaction's connection on PostgreSQL.
+        with mock.patch("core.management.commands.run_worker.close_old_connections") as close_old_connections:
+            call_command("run_worker", "--once", stdout=out)
+        close_old_connections.assert_called()
+        self.assertIn("Įvykdyta užduočių: 2", out.getvalue())
+        self.assertEqual(PointDailyRollup.objects.get().points_total, 7)
+        self.assertEqual(cache.get(LEADERBOARD_CACHE_KEY.format(semester_id=semester.pk))[0].total_points, 7)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_leaderboard_without_shared_cache_reads_the_ledger(self) -> None:
+        semester = Semester.objects.create(
+            name="2024 Ruduo", start_date=timezone.now().date(), end_date=timezone.now().date(), is_active=True
+        )
+        teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        teacher = TeacherProfile.objects.create(user=teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=teacher, semester=semester, allocated_points=100)
+        first = StudentProfile.objects.create(
+            user=User.objects.create_user(username="first", password="pass", role=User.Role.STUDENT),
+            display_name="Pirmas",
+        )
+        second = StudentProfile.objects.create(
+            user=User.objects.create_user(username="second", password="pass", role=User.Role.STUDENT),
+            display_name="Antras",
+        )
+        award_points(teacher_user, first, 5, "Taškai")
+        self.assertEqual(cached_top_students(semester)[0], first)
+
+        # No worker refreshes a per-process cache, so the next read must already see the new order.
+        award_points(teacher_user, second, 9, "Taškai")
+        self.assertEqual([s.pk for s in cached_top_students(semester)], [second.pk, first.pk])
+        self.assertIsNone(cache.get(LEADERBOARD_CACHE_KEY.format(semester_id=semester.pk)))
+
+    @override_settings(ROLLUP_SETTLE_SECONDS=60)
+    def test_ledger_writes_in_one_process_queue_the_rollup_once(self) -> None:
+        semester = Semester.objects.create(
+            name="2024 Ruduo", start_date=timezone.now().date(), end_date=timezone.now().date(), is_active=True
+        )
+        teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        teacher = TeacherProfile.objects.create(user=teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=teacher, semester=semester, allocated_points=100)
+        student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        student = StudentProfile.objects.create(user=student_user, display_name="Mokinys")
+
+        with CaptureQueriesContext(connection) as queries:
+            for points in (1, 2, 3):
+                with self.captureOnCommitCallbacks(execute=True):
+                    award_points(teacher_user, student, points, "Taškai")
+        job_inserts = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("INSERT") and '"core_backgroundjob"' in query["sql"]
+        ]
+        self.assertEqual(len(job_inserts), 1)
+        self.assertEqual(list(BackgroundJob.objects.values_list("name", flat=True)), ["rollup_points"])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        TASKS.pop("test_record", None)
+        TASKS.pop("test_explode", None)
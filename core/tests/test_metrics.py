@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from core.metrics import execute_wrapper
+from core.models import Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.services import DomainError, award_points
+
+
+def sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class MetricsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.semester = Semester.objects.create(
+            name="2024 Ruduo",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=True,
+        )
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        self.teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=self.teacher_profile, semester=self.semester, allocated_points=5)
+        student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        self.student_profile = StudentProfile.objects.create(user=student_user, display_name="Mokinys")
+
+    def test_service_latency_queries_and_domain_errors(self) -> None:
+        labels = {"service": "award_points"}
+        calls_before = sample("school_service_latency_seconds_count", labels)
+        queries_before = sample("school_service_queries_sum", labels)
+        error_labels = {**labels, "message": "Nepakanka biudžeto šiems taškams."}
+        errors_before = sample("school_domain_errors_total", error_labels)
+
+        award_points(self.teacher_user, self.student_profile, 5, "Už aktyvumą")
+        with self.assertRaises(DomainError):
+            award_points(self.teacher_user, self.student_profile, 1, "Už aktyvumą")
+
+        self.assertEqual(sample("school_service_latency_seconds_count", labels), calls_before + 2)
+        self.assertGreater(sample("school_service_queries_sum", labels), queries_before + 2)
+        self.assertEqual(sample("school_domain_errors_total", error_labels), errors_before + 1)
+
+    def test_select_for_update_is_timed_per_table(self) -> None:
+        labels = {"table": "core_teacherbudget"}
+        before = sample("school_lock_wait_seconds_count", labels)
+
+        execute_wrapper(
+            lambda *args: None,
+            'SELECT "core_teacherbudget"."id" FROM "core_teacherbudget" WHERE "id" = %s FOR UPDATE',
+            [1],
+            False,
+            {},
+        )
+
+        self.assertEqual(sample("school_lock_wait_seconds_count", labels), before + 1)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_endpoint_requires_scraper_token(self) -> None:
+        self.client.get(reverse("login"))
+
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer scrape-secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'school_view_latency_seconds_bucket{le="0.005",method="GET",view="login"}', response.content)
+
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_endpoint_is_closed_without_a_token(self) -> None:
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer ")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,85 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from core.models import PointTransaction, Semester, StudentProfile, User
+from core.partitioning import (
+    create_semester_partition,
+    ledger_is_partitioned,
+    partition_ledger,
+    partition_ledger_sql,
+    semester_partition_name,
+)
+
+
+class LedgerPartitioningTests(TransactionTestCase):
+    def _create_semester(self, name: str) -> Semester:
+        return Semester.objects.create(
+            name=name,
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=False,
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite fallback")
+    def test_sqlite_keeps_plain_table(self) -> None:
+        semester = self._create_semester("2024 Ruduo")
+
+        self.assertFalse(partition_ledger())
+        self.assertFalse(ledger_is_partitioned())
+        self.assertFalse(create_semester_partition(semester))
+
+    def test_partition_ddl_recreates_keys_indexes_and_partitions(self) -> None:
+        statements = partition_ledger_sql([3, 5])
+        sql = "\n".join(statements)
+
+        self.assertIn("PARTITION BY LIST (semester_id)", sql)
+        self.assertIn("ADD PRIMARY KEY (id, semester_id)", sql)
+        self.assertIn('"core_pointtransaction_s3" PARTITION OF "core_pointtransaction" FOR VALUES IN (3)', sql)
+        self.assertIn('"core_pointtransaction_s5" PARTITION OF "core_pointtransaction" FOR VALUES IN (5)', sql)
+        # Index and constraint names are only free once the old table is gone.
+        drop = statements.index('DROP TABLE "core_pointtransaction_unpartitioned"')
+        self.assertFalse(any(statement.startswith("CREATE INDEX") for statement in statements[:drop]))
+        for field in PointTransaction._meta.local_concrete_fields:
+            if field.remote_field:
+                self.assertIn(
+                    f'FOREIGN KEY ("{field.column}") REFERENCES "{field.related_model._meta.db_table}" ("id")', sql
+                )
+                self.assertIn(f'CREATE INDEX "core_pointtransaction_{field.column}_idx"', sql)
+        for index in PointTransaction._meta.indexes:
+            self.assertIn(f'CREATE INDEX "{index.name}" ON "core_pointtransaction"', sql)
+        self.assertIn('ON "core_pointtransaction" ("semester_id", "student_profile_id", "created_at")', sql)
+
+    @skipUnless(connection.vendor == "postgresql", "Postgres partitioning")
+    def test_postgres_partitions_by_semester(self) -> None:
+        semester = self._create_semester("2024 Ruduo")
+        user = User.objects.create_user(username="admin", password="pass", role=User.Role.ADMIN)
+        student = StudentProfile.objects.create(
+            user=User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT),
+            display_name="Mokinys",
+        )
+        tx = PointTransaction.objects.create(
+            semester=semester,
+            student_profile=student,
+            created_by=user,
+            tx_type=PointTransaction.TxType.ADMIN_ADJUST,
+            points_delta=5,
+        )
+
+        self.assertTrue(partition_ledger())
+        self.assertTrue(ledger_is_partitioned())
+        next_semester = self._create_semester("2025 Pavasaris")
+        PointTransaction.objects.create(
+            semester=next_semester,
+            student_profile=student,
+            created_by=user,
+            tx_type=PointTransaction.TxType.ADMIN_ADJUST,
+            points_delta=7,
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {semester_partition_name(next_semester.pk)}")
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertTrue(PointTransaction.objects.filter(pk=tx.pk, semester=semester).exists())
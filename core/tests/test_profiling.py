@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import TeacherProfile, User, ViewProfile
+
+
+@override_settings(
+    PROFILING_ENABLED=True,
+    PROFILING_SAMPLE_RATE=1.0,
+    PROFILING_SLOW_MS=10_000,
+    PROFILING_SLOW_FOLLOWUP=1,
+)
+class SamplingProfilerTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        self.client.force_login(self.teacher_user)
+
+    def test_sampled_requests_aggregate_per_view(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+        self.client.get(reverse("teacher_guidelines"))
+
+        profile = ViewProfile.objects.get(view_name="teacher_guidelines")
+        self.assertEqual(profile.sample_count, 2)
+        self.assertEqual(profile.slow_sample_count, 0)
+        self.assertTrue(any("core/views.py" in row["function"] for row in profile.hot_functions))
+
+    @override_settings(PROFILING_MAX_VIEWS=1)
+    def test_store_keeps_only_recent_views(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+        self.client.get(reverse("teacher_dashboard"))
+
+        self.assertEqual(list(ViewProfile.objects.values_list("view_name", flat=True)), ["teacher_dashboard"])
+
+    @override_settings(PROFILING_SAMPLE_RATE=0.0, PROFILING_SLOW_MS=0)
+    def test_slow_request_profiles_next_request_of_same_view(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+        self.assertFalse(ViewProfile.objects.exists())
+
+        self.client.get(reverse("teacher_guidelines"))
+        self.client.get(reverse("teacher_guidelines"))
+
+        profile = ViewProfile.objects.get(view_name="teacher_guidelines")
+        self.assertEqual(profile.sample_count, 1)
+        self.assertEqual(profile.slow_sample_count, 1)
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled_profiler_records_nothing(self) -> None:
+        self.client.get(reverse("teacher_guidelines"))
+
+        self.assertFalse(ViewProfile.objects.exists())
@@ -0,0 +1,66 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from core.models import PointTransaction, Semester
+from core.seeding import is_throwaway_database
+
+
+class ExplainHotPathsCommandTests(TestCase):
+    def test_report_covers_hot_paths_and_rolls_back_seed(self) -> None:
+        out = StringIO()
+
+        call_command(
+            "explain_hot_paths",
+            students=20,
+            teachers=2,
+            transactions=300,
+            seq_scan_rows=100,
+            stdout=out,
+        )
+
+        report = out.getvalue()
+        self.assertIn("| services.bonus_used_count |", report)
+        self.assertIn("| views.student_shop |", report)
+        self.assertIn("```sql", report)
+        self.assertFalse(Semester.objects.exists())
+        self.assertFalse(PointTransaction.objects.exists())
+
+    def test_refuses_to_run_against_a_real_database(self) -> None:
+        Semester.objects.create(name="2024 Ruduo", start_date="2024-09-01", end_date="2024-12-31", is_active=True)
+
+        with mock.patch.dict(connection.settings_dict, {"NAME": "/srv/school/db.sqlite3"}):
+            with self.assertRaises(CommandError):
+                call_command("explain_hot_paths", students=5, teachers=1, transactions=10, stdout=StringIO())
+        self.assertTrue(Semester.objects.get().is_active)
+
+    def test_throwaway_database_detection(self) -> None:
+        temp_path = str(Path(tempfile.gettempdir()) / "explain.sqlite3")
+        cases = [
+            ("sqlite", "test_school_motivation", True),
+            ("postgresql", "test_school_motivation", True),
+            ("postgresql", "school_motivation", False),
+            ("postgresql", temp_path, False),
+        ]
+        for vendor, name, expected in cases:
+            with (
+                self.subTest(vendor=vendor, name=name),
+                mock.patch.object(connection, "vendor", vendor),
+                mock.patch.dict(connection.settings_dict, {"NAME": name}),
+            ):
+                self.assertEqual(is_throwaway_database(), expected)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite file paths are only judged on the SQLite backend.")
+    def test_sqlite_throwaway_paths(self) -> None:
+        cases = [
+            ("/srv/school/db.sqlite3", False),
+            (str(Path(tempfile.gettempdir()) / "explain.sqlite3"), True),
+        ]
+        for name, expected in cases:
+            with self.subTest(name=name), mock.patch.dict(connection.settings_dict, {"NAME": name}):
+                self.assertEqual(is_throwaway_database(), expected)
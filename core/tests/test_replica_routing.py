@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.db.routers import ReplicaRouter, replica_reads, use_primary, use_replica
+from core.models import User
+from core.tenants import default_school_id, invalidate_school_domains
+
+
+def with_replica():
+    return override_settings(DATABASES={**settings.DATABASES, "replica": {**settings.DATABASES["default"]}})
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    def setUp(self) -> None:
+        # The flush after each test drops the default school created by the migrations.
+        default_school_id()
+        invalidate_school_domains()
+        self.router = ReplicaRouter()
+        self.user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+
+    def test_reads_use_replica_only_outside_transactions(self) -> None:
+        with with_replica():
+            self.assertEqual(self.router.db_for_read(User), "default")
+            with use_replica():
+                self.assertEqual(self.router.db_for_read(User), "replica")
+                self.assertEqual(self.router.db_for_write(User), "default")
+                with use_primary():
+                    self.assertEqual(self.router.db_for_read(User), "default")
+                with transaction.atomic():
+                    self.assertEqual(self.router.db_for_read(User), "default")
+
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_decorated_view_reads_from_replica_unless_pinned(self) -> None:
+        @replica_reads
+        def view(request):
+            return HttpResponse(self.router.db_for_read(User))
+
+        factory = RequestFactory()
+        with with_replica():
+            request = factory.get("/")
+            request.user = self.user
+            self.assertEqual(view(request).content, b"replica")
+
+            request = factory.get("/", HTTP_COOKIE=f"{settings.REPLICA_PIN_COOKIE}=1")
+            request.user = self.user
+            self.assertEqual(view(request).content, b"default")
+
+            request = factory.post("/")
+            request.user = self.user
+            self.assertEqual(view(request).content, b"default")
+
+    def test_post_pins_session_to_primary(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("logout"))
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        with with_replica():
+            response = self.client.post(reverse("logout"))
+
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie["httponly"])
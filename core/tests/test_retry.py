@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.db import OperationalError, transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.db.retry import contention_reason, retry_on_contention
+
+
+class SqlStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def contention_error(sqlstate: str) -> OperationalError:
+    error = OperationalError("could not serialize access")
+    error.__cause__ = SqlStateError(sqlstate)
+    return error
+
+
+@override_settings(SERVICE_RETRY_ATTEMPTS=3, SERVICE_RETRY_BASE_DELAY=0, SERVICE_RETRY_MAX_DELAY=0)
+class RetryOnContentionTests(SimpleTestCase):
+    def test_contention_errors_are_classified(self) -> None:
+        self.assertEqual(contention_reason(contention_error("40001")), "serialization_failure")
+        self.assertEqual(contention_reason(contention_error("40P01")), "deadlock")
+        self.assertEqual(contention_reason(OperationalError("database is locked")), "sqlite_locked")
+        self.assertIsNone(contention_reason(OperationalError("no such table")))
+
+    def test_retries_until_success(self) -> None:
+        service = mock.Mock(
+            side_effect=[contention_error("40P01"), contention_error("40001"), "ok"], __name__="service"
+        )
+        self.assertEqual(retry_on_contention(service)(), "ok")
+        self.assertEqual(service.call_count, 3)
+
+    def test_gives_up_after_configured_attempts(self) -> None:
+        service = mock.Mock(side_effect=contention_error("40P01"), __name__="service")
+        with self.assertRaises(OperationalError):
+            retry_on_contention(service)()
+        self.assertEqual(service.call_count, 3)
+
+    def test_other_errors_are_not_retried(self) -> None:
+        service = mock.Mock(side_effect=OperationalError("no such table"), __name__="service")
+        with self.assertRaises(OperationalError):
+            retry_on_contention(service)()
+        self.assertEqual(service.call_count, 1)
+
+
+@override_settings(SERVICE_RETRY_ATTEMPTS=3, SERVICE_RETRY_BASE_DELAY=0, SERVICE_RETRY_MAX_DELAY=0)
+class RetryInsideTransactionTests(TestCase):
+    def test_outer_transaction_is_not_retried(self) -> None:
+        service = mock.Mock(side_effect=contention_error("40001"), __name__="service")
+        with self.assertRaises(OperationalError), transaction.atomic():
+            retry_on_contention(service)()
+        self.assertEqual(service.call_count, 1)
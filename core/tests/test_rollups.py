@@ -0,0 +1,84 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import (
+    User,
+    StudentProfile,
+    TeacherProfile,
+    Semester,
+    TeacherBudget,
+    PointDailyRollup,
+    PointTransaction,
+    RollupWatermark,
+)
+from core.rollups import POINTS_WATERMARK, points_report, rollup_point_transactions
+from core.services import award_points
+
+
+@override_settings(ROLLUP_SETTLE_SECONDS=0)
+class PointRollupTests(TestCase):
+    def setUp(self) -> None:
+        self.semester = Semester.objects.create(
+            name="2024 Ruduo",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=True,
+        )
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        self.teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=self.teacher_profile, semester=self.semester, allocated_points=500)
+        student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        self.student_profile = StudentProfile.objects.create(user=student_user, display_name="Mokinys", class_name="5A")
+
+    def test_rollup_is_incremental_from_watermark(self) -> None:
+        award_points(self.teacher_user, self.student_profile, 10, "Puikiai!")
+        award_points(self.teacher_user, self.student_profile, 15, "Puikiai!")
+        self.assertEqual(rollup_point_transactions(), 2)
+
+        tx = award_points(self.teacher_user, self.student_profile, 5, "Puikiai!")
+        self.assertEqual(rollup_point_transactions(), 1)
+        self.assertEqual(rollup_point_transactions(), 0)
+
+        rollup = PointDailyRollup.objects.get()
+        self.assertEqual(rollup.teacher_profile, self.teacher_profile)
+        self.assertEqual(rollup.class_name, "5A")
+        self.assertEqual(rollup.points_total, 30)
+        self.assertEqual(rollup.tx_count, 3)
+        self.assertEqual(RollupWatermark.objects.get(name=POINTS_WATERMARK).last_id, tx.id)
+
+        report = points_report(self.semester)
+        self.assertEqual(report["per_teacher"][0]["points_total"], 30)
+
+    def test_row_committed_below_watermark_is_reconciled(self) -> None:
+        late = award_points(self.teacher_user, self.student_profile, 10, "Vėluoja")
+        award_points(self.teacher_user, self.student_profile, 15, "Puikiai!")
+        # The first row's transaction is still open while the second one is rolled up past it.
+        PointTransaction.objects.filter(pk=late.pk).delete()
+        self.assertEqual(rollup_point_transactions(), 1)
+        late.save(force_insert=True)
+
+        self.assertEqual(rollup_point_transactions(), 0)
+        rollup = PointDailyRollup.objects.get()
+        self.assertEqual((rollup.points_total, rollup.tx_count), (25, 2))
+
+        with override_settings(ROLLUP_RECONCILE_DAYS=0):
+            PointDailyRollup.objects.update(points_total=0)
+            rollup_point_transactions()
+        self.assertEqual(PointDailyRollup.objects.get().points_total, 0)
+
+    @override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
+    def test_admin_report_reads_rollups(self) -> None:
+        award_points(self.teacher_user, self.student_profile, 10, "Puikiai!")
+        rollup_point_transactions()
+        admin_user = User.objects.create_superuser(username="admin", password="pass", role=User.Role.ADMIN)
+        self.client.force_login(admin_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin:core_pointdailyrollup_report"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Mokytojas")
+        self.assertFalse([query for query in queries.captured_queries if "core_pointtransaction" in query["sql"]])
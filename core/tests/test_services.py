@@ -1,4 +1,6 @@
-from django.test import TestCase
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from core.models import (
@@ -12,6 +14,7 @@ from core.models import (
     PointTransaction,
     GroupPurchase,
     GroupContribution,
+    SchoolSettings,
 )
 from core.services import (
     award_points,
@@ -24,6 +27,11 @@ from core.services import (
     withdraw_group_reservation,
     create_bonus_redemption_request,
     confirm_bonus_redemption_request,
+    get_active_semester,
+    get_school_name,
+    active_bonus_items,
+    bonus_used_count,
+    get_or_create_group_purchase,
     DomainError,
 )
 
@@ -76,6 +84,47 @@ class ServicesTests(TestCase):
         balance = student_balance_points(self.student_profile, self.semester)
         self.assertEqual(balance, 20)
 
+    @override_settings(CACHE_SHARED=True)
+    def test_writes_ignore_cached_semester_after_switch(self) -> None:
+        next_semester = Semester.objects.create(
+            name="2025 Pavasaris",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=False,
+        )
+        TeacherBudget.objects.create(teacher_profile=self.teacher_profile, semester=next_semester, allocated_points=50)
+        get_active_semester()
+        # A bulk switch sends no signals, so the cached read path still sees the old semester.
+        Semester.objects.filter(pk=self.semester.pk).update(is_active=False)
+        Semester.objects.filter(pk=next_semester.pk).update(is_active=True)
+        self.assertEqual(get_active_semester(), self.semester)
+
+        tx = award_points(self.teacher_user, self.student_profile, 10, "Naujas semestras")
+        self.assertEqual(tx.semester, next_semester)
+
+    @override_settings(CACHE_SHARED=False)
+    def test_reads_skip_per_process_cache_when_not_shared(self) -> None:
+        SchoolSettings.objects.create(name="Senas pavadinimas")
+        self.assertEqual(get_school_name(), "Senas pavadinimas")
+        self.assertEqual(get_active_semester(), self.semester)
+        self.assertIn(self.bonus, active_bonus_items())
+        next_semester = Semester.objects.create(
+            name="2025 Pavasaris",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=False,
+        )
+
+        # Bulk updates stand in for a save in another worker, whose signals would not reach this process's locmem.
+        SchoolSettings.objects.update(name="Naujas pavadinimas")
+        Semester.objects.filter(pk=self.semester.pk).update(is_active=False)
+        Semester.objects.filter(pk=next_semester.pk).update(is_active=True)
+        BonusItem.objects.filter(pk=self.bonus.pk).update(is_active=False)
+
+        self.assertEqual(get_school_name(), "Naujas pavadinimas")
+        self.assertEqual(get_active_semester(), next_semester)
+        self.assertNotIn(self.bonus, active_bonus_items())
+
     def test_award_points_over_budget_raises(self) -> None:
         with self.assertRaises(DomainError):
             award_points(self.teacher_user, self.student_profile, 200, "Per daug")
@@ -88,6 +137,31 @@ class ServicesTests(TestCase):
         with self.assertRaises(DomainError):
             redeem_bonus(self.student_user, self.bonus)
 
+    def test_redeem_bonus_excludes_reserved_points(self) -> None:
+        group_bonus = BonusItem.objects.create(
+            title_lt="Klasės ekskursija", description_lt="Bendras pirkinys", price_points=60, is_active=True
+        )
+        award_points(self.teacher_user, self.student_profile, 50, "Taškai")
+        reserve_group_points(self.student_user, group_bonus, 30)
+        with self.assertRaises(DomainError):
+            redeem_bonus(self.student_user, self.bonus)
+        self.assertEqual(student_balance_points(self.student_profile, self.semester), 50)
+
+    def test_pending_group_purchase_holds_a_bonus_use(self) -> None:
+        self.bonus.max_uses_per_student = 2
+        self.bonus.save(update_fields=["max_uses_per_student"])
+        award_points(self.teacher_user, self.student_profile, 80, "Taškai")
+        award_points(self.teacher_user, self.student_profile_two, 20, "Taškai")
+        reserve_group_points(self.student_user, self.bonus, 10)
+        redeem_bonus(self.student_user, self.bonus)
+        with self.assertRaises(DomainError):
+            redeem_bonus(self.student_user, self.bonus)
+
+        reserve_group_points(self.student_user_two, self.bonus, 20)
+        confirm_group_purchase(self.student_user, self.bonus)
+        confirm_group_purchase(self.student_user_two, self.bonus)
+        self.assertEqual(bonus_used_count(self.student_profile, self.semester, self.bonus), 2)
+
     def test_admin_adjust_points(self) -> None:
         tx = admin_adjust_points(self.admin_user, self.student_profile, 10, "Korekcija")
         self.assertEqual(tx.tx_type, PointTransaction.TxType.ADMIN_ADJUST)
@@ -120,6 +194,13 @@ class ServicesTests(TestCase):
             2,
         )
 
+    def test_get_or_create_group_purchase_returns_row_created_concurrently(self) -> None:
+        existing = GroupPurchase.objects.create(semester=self.semester, bonus_item=self.bonus)
+        with mock.patch.object(GroupPurchase.objects, "filter") as stale_filter:
+            stale_filter.return_value.first.return_value = None
+            self.assertEqual(get_or_create_group_purchase(self.semester, self.bonus), existing)
+        self.assertEqual(GroupPurchase.objects.count(), 1)
+
     def test_group_reservation_withdraw_only_single_contributor(self) -> None:
         award_points(self.teacher_user, self.student_profile, 40, "Taškai")
         reserve_group_points(self.student_user, self.bonus, 20)
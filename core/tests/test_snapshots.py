@@ -0,0 +1,124 @@
+import json
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.checks import check_shared_cache
+from core.models import BonusItem, PointTransaction, Semester, StudentProfile, TeacherBudget, TeacherProfile, User
+from core.services import award_points, redeem_bonus
+from core.snapshots import load_balance_series, load_student_snapshot
+
+
+class StudentSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.semester = Semester.objects.create(
+            name="2024 Ruduo",
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date(),
+            is_active=True,
+        )
+        self.teacher_user = User.objects.create_user(username="teacher", password="pass", role=User.Role.TEACHER)
+        teacher_profile = TeacherProfile.objects.create(user=self.teacher_user, display_name="Mokytojas")
+        TeacherBudget.objects.create(teacher_profile=teacher_profile, semester=self.semester, allocated_points=500)
+        self.student_user = User.objects.create_user(username="student", password="pass", role=User.Role.STUDENT)
+        self.student = StudentProfile.objects.create(user=self.student_user, display_name="Mokinys")
+        self.bonus = BonusItem.objects.create(
+            title_lt="Bilietas", description_lt="Renginys", price_points=5, max_uses_per_student=3
+        )
+        self.client.force_login(self.student_user)
+
+    def test_snapshot_has_balance_last_purchase_and_recent_activity(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        purchase = redeem_bonus(self.student_user, self.bonus)
+        for _ in range(10):
+            award_points(self.teacher_user, self.student, 1, "Aktyvumas")
+
+        with CaptureQueriesContext(connection) as queries:
+            snapshot = load_student_snapshot(self.student, self.semester)
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(snapshot.balance, 25)
+        self.assertEqual(snapshot.last_purchase, purchase)
+        self.assertEqual(len(snapshot.recent_activity), 10)
+        self.assertNotIn(purchase, snapshot.recent_activity)
+        self.assertEqual(snapshot.recent_activity[0].created_by.teacher_profile.display_name, "Mokytojas")
+
+    @override_settings(CACHE_SHARED=True)
+    def test_unchanged_dashboard_skips_ledger_queries_until_a_write(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        self.client.get(reverse("student_dashboard"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("student_dashboard"))
+        student_ledger_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if f'"core_pointtransaction"."student_profile_id" = {self.student.pk}' in query["sql"]
+        ]
+        self.assertEqual(student_ledger_queries, [])
+        self.assertEqual(response.context["balance"], 20)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redeem_bonus(self.student_user, self.bonus)
+        response = self.client.get(reverse("student_dashboard"))
+        self.assertEqual(response.context["balance"], 15)
+        self.assertEqual(response.context["last_purchase"].points_delta, -5)
+
+    def test_process_local_cache_reads_ledger_on_every_dashboard(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        self.client.get(reverse("student_dashboard"))
+
+        # Without a shared cache, a write in another worker cannot bump this process's version.
+        PointTransaction.objects.filter(student_profile=self.student).update(points_delta=12)
+        response = self.client.get(reverse("student_dashboard"))
+        self.assertEqual(response.context["balance"], 12)
+
+    def test_balance_series_has_end_of_day_balance(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        award_points(self.teacher_user, self.student, 3, "Aktyvumas")
+        PointTransaction.objects.update(created_at=timezone.now() - timedelta(days=2))
+        award_points(self.teacher_user, self.student, 7, "Taškai")
+        redeem_bonus(self.student_user, self.bonus)
+
+        with CaptureQueriesContext(connection) as queries:
+            series = load_balance_series(self.student, self.semester)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual([balance for _, balance in series], [23, 25])
+        self.assertEqual(series[1][0] - series[0][0], timedelta(days=2))
+
+    @override_settings(CACHE_SHARED=True)
+    def test_balance_series_endpoint_is_cached_until_a_write(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        self.client.get(reverse("student_balance_series"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("student_balance_series"))
+        self.assertFalse(any('"core_pointtransaction"' in query["sql"] for query in queries.captured_queries))
+        self.assertEqual(json.loads(response.content)["balance"], [20])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            redeem_bonus(self.student_user, self.bonus)
+        response = self.client.get(reverse("student_balance_series"))
+        self.assertEqual(json.loads(response.content), {"days": [timezone.localdate().isoformat()], "balance": [15]})
+
+    def test_balance_series_is_not_cached_in_process_local_cache(self) -> None:
+        award_points(self.teacher_user, self.student, 20, "Taškai")
+        self.client.get(reverse("student_balance_series"))
+
+        PointTransaction.objects.filter(student_profile=self.student).update(points_delta=12)
+        response = self.client.get(reverse("student_balance_series"))
+        self.assertEqual(json.loads(response.content)["balance"], [12])
+
+
+class SharedCacheCheckTests(TestCase):
+    def test_warns_only_when_cache_is_not_shared(self) -> None:
+        with override_settings(CACHE_SHARED=False):
+            self.assertEqual([message.id for message in check_shared_cache()], ["core.W001"])
+        with override_settings(CACHE_SHARED=True):
+            self.assertEqual(check_shared_cache(), [])
@@ -0,0 +1,83 @@
+import io
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from core.metrics import SQLITE_LOCK_WAIT
+
+TUNED_ALIAS = "tuned"
+
+
+class TunedSQLiteBackendTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_dict = {
+            "ENGINE": "core.db.backends.sqlite_tuned",
+            "NAME": str(Path(directory.name) / "tuned.sqlite3"),
+            "OPTIONS": {"pragmas": {"busy_timeout": 2500}},
+        }
+
+    @contextmanager
+    def tuned_connection(self):
+        # Created, used and closed in the calling thread, under an alias outside django.db.connections, so neither
+        # thread-sharing nor SimpleTestCase's database guard depends on the Django version.
+        handler = ConnectionHandler({"default": {}, TUNED_ALIAS: self.settings_dict})
+        connection = handler.create_connection(TUNED_ALIAS)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def pragma(self, connection, name: str):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self) -> None:
+        with self.tuned_connection() as connection:
+            self.assertEqual(self.pragma(connection, "journal_mode"), "wal")
+            self.assertEqual(self.pragma(connection, "synchronous"), 1)
+            self.assertEqual(self.pragma(connection, "busy_timeout"), 2500)
+            self.assertEqual(self.pragma(connection, "temp_store"), 2)
+
+    def test_transactions_begin_immediate(self) -> None:
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        samples = SQLITE_LOCK_WAIT.labels(database=TUNED_ALIAS)._sum.get
+        with self.tuned_connection() as connection:
+            connection.ensure_connection()
+            before = samples()
+            with connection.execute_wrapper(record):
+                # What transaction.atomic() does on the outermost block.
+                connection.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+                with connection.cursor() as cursor:
+                    cursor.execute("CREATE TABLE sample (id integer)")
+                connection.commit()
+                connection.set_autocommit(True)
+        self.assertEqual(statements[0], "BEGIN IMMEDIATE")
+        self.assertGreater(samples(), before)
+
+    def test_replica_sync_accepts_tuned_backend(self) -> None:
+        replica_path = Path(self.settings_dict["NAME"]).with_name("replica.sqlite3")
+        connections = ConnectionHandler(
+            {"default": self.settings_dict, "replica": {**self.settings_dict, "NAME": str(replica_path)}}
+        )
+        with self.tuned_connection() as connection, connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE sample (id integer)")
+
+        with mock.patch("core.management.commands.sync_sqlite_replica.connections", connections):
+            call_command("sync_sqlite_replica", stdout=io.StringIO())
+
+        with sqlite3.connect(replica_path) as replica:
+            self.assertEqual(replica.execute("SELECT name FROM sqlite_master").fetchall(), [("sample",)])
@@ -0,0 +1,81 @@
+import re
+from collections import defaultdict
+
+from django.contrib.staticfiles import finders
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import TeacherProfile, User
+from core.storage import StaticStorage
+
+
+def css_rules(path: str) -> dict[tuple[tuple[str, ...], str], set[str]]:
+    """Map (enclosing at-rules, selector) to its declarations; enough CSS parsing for minified Bootstrap."""
+    with open(finders.find(path), encoding="utf-8") as stylesheet:
+        text = re.sub(r"/\*.*?\*/", "", stylesheet.read(), flags=re.S)
+    rules = defaultdict(set)
+
+    def walk(pos: int, context: tuple[str, ...]) -> int:
+        while pos < len(text):
+            opening, closing = text.find("{", pos), text.find("}", pos)
+            if opening == -1 or -1 < closing < opening:
+                return len(text) if closing == -1 else closing + 1
+            # Statements such as @charset end with ";" and carry no block.
+            prelude = text[pos:opening].split(";")[-1].strip()
+            if prelude.startswith("@"):
+                pos = walk(opening + 1, (*context, prelude))
+                continue
+            end = text.index("}", opening)
+            declarations = {part.strip() for part in text[opening + 1 : end].split(";") if part.strip()}
+            for selector in prelude.split(","):
+                rules[(context, selector.strip())] |= declarations
+            pos = end + 1
+        return pos
+
+    walk(0, ())
+    return rules
+
+
+class StaticAssetsTests(TestCase):
+    def test_login_inlines_critical_css_and_loads_vendored_bootstrap(self) -> None:
+        response = self.client.get(reverse("login"))
+
+        self.assertNotContains(response, "cdn.jsdelivr.net")
+        self.assertContains(response, ".navbar{")
+        self.assertNotContains(response, ".modal")
+        self.assertContains(response, 'rel="preload" href="/static/vendor/bootstrap/css/bootstrap.min.css" as="style"')
+        self.assertContains(response, '<script src="/static/vendor/bootstrap/js/bootstrap.min.js" defer></script>')
+
+    def test_critical_css_stays_small(self) -> None:
+        with open(finders.find("core/css/critical.css"), "rb") as critical:
+            self.assertLess(len(critical.read()), 12 * 1024)
+
+    def test_critical_css_is_copied_from_vendored_bootstrap(self) -> None:
+        bootstrap = css_rules("vendor/bootstrap/css/bootstrap.min.css")
+        critical = css_rules("core/css/critical.css")
+
+        self.assertTrue(critical)
+        for key, declarations in critical.items():
+            with self.subTest(context=key[0], selector=key[1]):
+                self.assertIn(key, bootstrap)
+                self.assertLessEqual(declarations, bootstrap[key])
+
+    def test_teacher_dashboard_script_is_a_static_bundle(self) -> None:
+        teacher_user = User.objects.create_user(username="teacher_assets", password="pass", role=User.Role.TEACHER)
+        TeacherProfile.objects.create(user=teacher_user, display_name="Mokytojas")
+        self.client.force_login(teacher_user)
+
+        response = self.client.get(reverse("teacher_dashboard"))
+
+        self.assertContains(response, '<script src="/static/core/js/teacher_dashboard.js" defer></script>')
+        self.assertNotContains(response, "addEventListener")
+        self.assertIsNotNone(finders.find("core/js/teacher_dashboard.js"))
+
+    def test_missing_manifest_only_falls_back_when_not_strict(self) -> None:
+        with override_settings(STATIC_MANIFEST_STRICT=False):
+            self.assertEqual(
+                StaticStorage().url("core/js/teacher_dashboard.js"), "/static/core/js/teacher_dashboard.js"
+            )
+        with override_settings(STATIC_MANIFEST_STRICT=True):
+            with self.assertRaisesMessage(ValueError, "Missing staticfiles manifest entry"):
+                StaticStorage().url("core/js/teacher_dashboard.js")
@@ -0,0 +1,108 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import TestCase
+
+from core.models import GroupContribution, GroupPurchase, School, Semester
+from core.stress import (
+    build_plans,
+    classify_database_error,
+    invariant_violations,
+    parse_mix,
+    remove_stress_data,
+    run_worker,
+    seed_stress_data,
+)
+from core.tenants import use_school
+
+
+class SqlStateError(Exception):
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+class StressHarnessTests(TestCase):
+    def setUp(self) -> None:
+        self.other = Semester.objects.create(
+            name="2025 ruduo", start_date="2025-09-01", end_date="2025-12-31", is_active=True
+        )
+        self.data, self.previously_active = seed_stress_data(students=10, bonuses=4, seed=1)
+
+    def test_worker_runs_mix_and_keeps_invariants(self) -> None:
+        plans = build_plans(
+            self.data,
+            workers=1,
+            pattern="hot-bonus",
+            mix=parse_mix("redeem=2,reserve=2,confirm=1"),
+            duration=0.5,
+            hot_students=3,
+            seed=1,
+        )
+        result = run_worker(plans[0])
+
+        attempts = sum(len(samples) for samples in result.latencies_ms.values())
+        self.assertGreater(attempts, 0)
+        self.assertEqual(attempts, sum(result.succeeded.values()) + sum(result.domain_errors.values()))
+        self.assertEqual(result.database_errors, {})
+        self.assertEqual(invariant_violations(self.data), [])
+
+    def test_over_funded_group_purchase_is_a_violation(self) -> None:
+        purchase = GroupPurchase.objects.get(semester=self.data.semester)
+        GroupContribution.objects.filter(group_purchase=purchase).update(amount=purchase.bonus_item.price_points)
+
+        violations = [violation for violation in invariant_violations(self.data) if violation.check == "group_purchase"]
+        self.assertEqual(len(violations), 1)
+        self.assertEqual(violations[0].actual, 3 * purchase.bonus_item.price_points)
+        self.assertFalse(violations[0].repairable)
+
+    def test_cleanup_restores_active_semester(self) -> None:
+        self.assertEqual(self.previously_active, [self.other.pk])
+        remove_stress_data(self.data, self.previously_active)
+
+        self.assertEqual(list(Semester.objects.values_list("pk", "is_active")), [(self.other.pk, True)])
+
+    def test_database_errors_are_classified(self) -> None:
+        for sqlstate, expected in [
+            ("40001", "serialization_failure"),
+            ("40P01", "deadlock"),
+            ("55P03", "lock_not_available"),
+        ]:
+            error = OperationalError("failed")
+            error.__cause__ = SqlStateError(sqlstate)
+            self.assertEqual(classify_database_error(error), expected)
+        self.assertEqual(classify_database_error(OperationalError("database is locked")), "sqlite_locked")
+
+    def test_parse_mix_rejects_unknown_operations(self) -> None:
+        self.assertEqual(parse_mix("redeem=3, confirm=1"), {"redeem": 3, "confirm": 1})
+        with self.assertRaises(ValueError):
+            parse_mix("withdraw=1")
+
+    def test_failed_seed_restores_active_semester(self) -> None:
+        remove_stress_data(self.data, self.previously_active)
+        with mock.patch("core.stress.seed_demo_data", side_effect=OperationalError("database is locked")):
+            with self.assertRaises(OperationalError):
+                seed_stress_data(students=5, bonuses=2, seed=2)
+
+        self.assertTrue(Semester.objects.get(pk=self.other.pk).is_active)
+
+    def test_command_refuses_to_run_against_a_real_database(self) -> None:
+        with mock.patch.dict(connection.settings_dict, {"NAME": "/srv/school/db.sqlite3"}):
+            with self.assertRaises(CommandError):
+                call_command("stress_shop", duration=0.1, students=5, stdout=StringIO())
+        self.assertEqual(Semester.objects.filter(is_active=True).get(), self.data.semester)
+
+    def test_other_schools_keep_their_active_semester(self) -> None:
+        remove_stress_data(self.data, self.previously_active)
+        other_school = School.objects.create(name="Kita mokykla", domain="kita.pointify.lt")
+        with use_school(other_school.pk):
+            other_semester = Semester.objects.create(
+                name="Kitos ruduo", start_date="2025-09-01", end_date="2025-12-31", is_active=True
+            )
+
+        _, previously_active = seed_stress_data(students=5, bonuses=2, seed=2)
+        self.assertEqual(previously_active, [self.other.pk])
+        other_semester.refresh_from_db()
+        self.assertTrue(other_semester.is_active)
@@ -0,0 +1,127 @@
+from datetime import date
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.autocomplete import clear_autocomplete_cache
+from core.models import PointTransaction, School, SchoolSettings, Semester, StudentProfile, TeacherProfile, User
+from core.services import ACTIVE_SEMESTERS_CACHE_KEY, get_active_semester, get_school_name
+from core.tenants import tenant_cache_key, use_school
+from core.warmup import warm_caches
+
+
+class TenantTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        clear_autocomplete_cache()
+        self.schools = {}
+        for code in ("a", "b"):
+            school = School.objects.create(name=f"Mokykla {code}", domain=f"{code}.pointify.lt")
+            with use_school(school.pk):
+                SchoolSettings.objects.create(name=f"Mokykla {code.upper()}")
+                Semester.objects.create(
+                    name=f"Semestras {code}", start_date=date(2026, 9, 1), end_date=date(2027, 1, 31), is_active=True
+                )
+                teacher = User.objects.create_user(username=f"teacher_{code}", password="pass", role=User.Role.TEACHER)
+                TeacherProfile.objects.create(user=teacher, display_name=f"Mokytojas {code}")
+                student = User.objects.create_user(username=f"student_{code}", password="pass", role=User.Role.STUDENT)
+                student_profile = StudentProfile.objects.create(
+                    user=student, display_name=f"Jonas {code}", class_name="5A"
+                )
+                PointTransaction.objects.create(
+                    semester=Semester.objects.get(),
+                    student_profile=student_profile,
+                    created_by=teacher,
+                    tx_type=PointTransaction.TxType.ADMIN_ADJUST,
+                    points_delta=5,
+                )
+                User.objects.create_user(
+                    username=f"admin_{code}", password="pass", role=User.Role.ADMIN, is_staff=True, is_superuser=False
+                )
+            self.schools[code] = school
+
+    @override_settings(CACHE_SHARED=True)
+    def test_queries_and_caches_are_scoped_to_current_school(self) -> None:
+        for code, school in self.schools.items():
+            with use_school(school.pk):
+                self.assertEqual(get_active_semester().name, f"Semestras {code}")
+                self.assertEqual(get_school_name(), f"Mokykla {code.upper()}")
+                self.assertEqual(list(StudentProfile.objects.values_list("display_name", flat=True)), [f"Jonas {code}"])
+
+    @override_settings(CACHE_SHARED=True)
+    def test_warm_up_fills_every_school_cache(self) -> None:
+        warm_caches()
+
+        for code, school in self.schools.items():
+            semesters = cache.get(tenant_cache_key(ACTIVE_SEMESTERS_CACHE_KEY, school.pk))
+            self.assertEqual([semester.name for semester in semesters], [f"Semestras {code}"])
+
+    def test_host_selects_school(self) -> None:
+        self.client.force_login(User.objects.get(username="teacher_a"))
+
+        response = self.client.get(reverse("teacher_dashboard"), HTTP_HOST="a.pointify.lt")
+        self.assertContains(response, "Mokykla A")
+        self.assertContains(response, "Jonas a")
+        self.assertNotContains(response, "Jonas b")
+
+        payload = self.client.get(
+            reverse("teacher_student_autocomplete"), {"q": "Jonas"}, HTTP_HOST="a.pointify.lt"
+        ).json()
+        self.assertEqual([row["name"] for row in payload["results"]], ["Jonas a"])
+
+    def test_users_can_only_sign_in_at_their_school(self) -> None:
+        credentials = {"username": "student_b", "password": "pass"}
+
+        response = self.client.post(reverse("login"), credentials, HTTP_HOST="a.pointify.lt")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(reverse("login"), credentials, HTTP_HOST="b.pointify.lt")
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff_without_profile_can_only_sign_in_at_their_school(self) -> None:
+        credentials = {"username": "admin_a", "password": "pass"}
+
+        response = self.client.post(reverse("admin:login"), credentials, HTTP_HOST="b.pointify.lt")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(reverse("admin:login"), credentials, HTTP_HOST="a.pointify.lt")
+        self.assertEqual(response.status_code, 302)
+
+    def test_admin_lists_only_current_school_rows(self) -> None:
+        admin_user = User.objects.get(username="admin_a")
+        admin_user.user_permissions.set(Permission.objects.filter(content_type__app_label="core"))
+        self.client.force_login(admin_user)
+
+        response = self.client.get(
+            reverse("admin:core_pointtransaction_changelist"), {"semester": "all"}, HTTP_HOST="a.pointify.lt"
+        )
+        self.assertEqual([tx.semester.name for tx in response.context["cl"].result_list], ["Semestras a"])
+        self.assertEqual([title for _, title in response.context["cl"].filter_specs[0].lookup_choices], ["Semestras a"])
+
+        response = self.client.get(reverse("admin:core_user_changelist"), HTTP_HOST="a.pointify.lt")
+        self.assertEqual(
+            sorted(user.username for user in response.context["cl"].result_list),
+            ["admin_a", "student_a", "teacher_a"],
+        )
+
+        response = self.client.get(reverse("admin:core_pointdailyrollup_report"), HTTP_HOST="a.pointify.lt")
+        self.assertEqual([semester.name for semester in response.context["semesters"]], ["Semestras a"])
+
+        response = self.client.get(reverse("admin:core_user_changelist"), HTTP_HOST="b.pointify.lt")
+        self.assertEqual(response.status_code, 302)
+
+    def test_unknown_host_uses_default_school(self) -> None:
+        default = School.objects.get(is_default=True)
+        with use_school(default.pk):
+            Semester.objects.create(
+                name="Numatytasis", start_date=date(2026, 9, 1), end_date=date(2027, 1, 31), is_active=True
+            )
+        teacher = User.objects.create_user(username="teacher_default", password="pass", role=User.Role.TEACHER)
+        TeacherProfile.objects.create(user=teacher, display_name="Mokytojas")
+        self.client.force_login(teacher)
+
+        response = self.client.get(reverse("teacher_dashboard"))
+
+        self.assertContains(response, "Numatytasis")
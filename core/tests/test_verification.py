@@ -0,0 +1,75 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core.models import GroupPurchase, PointDailyRollup, PointTransaction, TeacherBudget
+from core.rollups import rollup_point_transactions
+from core.seeding import seed_demo_data
+from core.verification import check_budgets, recheck, scan_ledger, verify_ledger
+
+
+def seed_verified_ledger():
+    data = seed_demo_data(students=20, teachers=3, bonuses=4, transactions=300, days=10)
+    with override_settings(ROLLUP_SETTLE_SECONDS=0):
+        rollup_point_transactions()
+    return data
+
+
+class VerifyLedgerTests(TestCase):
+    def setUp(self) -> None:
+        self.data = seed_verified_ledger()
+
+    def test_consistent_ledger_has_no_mismatches(self) -> None:
+        self.assertEqual(verify_ledger(chunk_size=50), [])
+
+    def test_worker_pool_is_refused_inside_a_transaction(self) -> None:
+        with self.assertRaises(transaction.TransactionManagementError):
+            verify_ledger(workers=2, chunk_size=50)
+
+    def test_drift_fixed_by_a_later_write_is_not_reported(self) -> None:
+        totals = scan_ledger(workers=1, chunk_size=50)
+        budget = TeacherBudget.objects.get(teacher_profile=self.data.teachers[0])
+        TeacherBudget.objects.filter(pk=budget.pk).update(spent_points=budget.spent_points + 5)
+        (candidate,) = check_budgets(totals)
+
+        TeacherBudget.objects.filter(pk=budget.pk).update(spent_points=budget.spent_points)
+        self.assertFalse(recheck(candidate))
+
+    def test_drift_is_reported_and_repaired(self) -> None:
+        TeacherBudget.objects.filter(teacher_profile=self.data.teachers[0]).update(spent_points=0)
+        rollup = PointDailyRollup.objects.order_by("id").first()
+        PointDailyRollup.objects.filter(pk=rollup.pk).update(points_total=rollup.points_total + 7)
+        GroupPurchase.objects.update(status=GroupPurchase.Status.AWAITING_CONFIRMATION)
+
+        mismatches = verify_ledger(chunk_size=50)
+        self.assertEqual(sorted(mismatch.check for mismatch in mismatches), ["budget", "group_purchase", "rollup"])
+
+        out = StringIO()
+        call_command("verify_ledger", "--workers=1", "--chunk-size=50", "--repair", stdout=out)
+        self.assertIn("ištaisyta", out.getvalue())
+        self.assertEqual(verify_ledger(chunk_size=50), [])
+        self.assertEqual(GroupPurchase.objects.get().status, GroupPurchase.Status.OPEN)
+
+    def test_command_fails_when_mismatches_remain(self) -> None:
+        TeacherBudget.objects.filter(teacher_profile=self.data.teachers[0]).update(spent_points=0)
+
+        with self.assertRaises(CommandError):
+            call_command("verify_ledger", "--workers=1", stdout=StringIO())
+
+
+class ParallelVerifyLedgerTests(TransactionTestCase):
+    def setUp(self) -> None:
+        # Committed rows, so worker processes see them over their own connections on any backend.
+        seed_verified_ledger()
+
+    def test_worker_pool_finds_drift_in_a_later_chunk(self) -> None:
+        first_id = PointTransaction.objects.order_by("id").values_list("id", flat=True).first()
+        award = PointTransaction.objects.filter(id__gte=first_id + 50, tx_type=PointTransaction.TxType.AWARD).first()
+        PointTransaction.objects.filter(pk=award.pk).update(points_delta=award.points_delta + 3)
+
+        mismatches = verify_ledger(workers=2, chunk_size=50)
+        drift = sorted((mismatch.check, mismatch.actual - mismatch.stored) for mismatch in mismatches)
+        self.assertEqual(drift, [("budget", 3), ("rollup", 3)])
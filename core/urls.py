@@ -4,12 +4,17 @@ from django.urls import path
 from .views import (
     LoginView,
     home,
+    metrics,
+    school_image_variant,
     teacher_dashboard,
     teacher_award,
+    teacher_award_history,
+    teacher_student_autocomplete,
     teacher_ranking,
     teacher_guidelines,
     teacher_confirm_bonus_request,
     student_dashboard,
+    student_balance_series,
     student_shop,
     student_redeem,
     student_reserve_points,
@@ -21,8 +26,12 @@ urlpatterns = [
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", auth_views.LogoutView.as_view(), name="logout"),
     path("", home, name="home"),
+    path("metrics/", metrics, name="metrics"),
+    path("school-assets/<str:name>", school_image_variant, name="school_image_variant"),
     path("teacher/", teacher_dashboard, name="teacher_dashboard"),
+    path("teacher/students/autocomplete/", teacher_student_autocomplete, name="teacher_student_autocomplete"),
     path("teacher/award/<int:student_id>/", teacher_award, name="teacher_award"),
+    path("teacher/history/", teacher_award_history, name="teacher_award_history"),
     path("teacher/ranking/", teacher_ranking, name="teacher_ranking"),
     path("teacher/guidelines/", teacher_guidelines, name="teacher_guidelines"),
     path(
@@ -31,6 +40,7 @@ urlpatterns = [
         name="teacher_confirm_bonus_request",
     ),
     path("student/", student_dashboard, name="student_dashboard"),
+    path("student/balance-series/", student_balance_series, name="student_balance_series"),
     path("student/shop/", student_shop, name="student_shop"),
     path("student/redeem/<int:bonus_id>/", student_redeem, name="student_redeem"),
     path("student/reserve/<int:bonus_id>/", student_reserve_points, name="student_reserve_points"),
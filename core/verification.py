@@ -0,0 +1,430 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+
+import django
+from django.db import connections, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+from .models import (
+    BonusItem,
+    GroupContribution,
+    GroupPurchase,
+    PointDailyRollup,
+    PointTransaction,
+    RollupWatermark,
+    StudentProfile,
+    TeacherBudget,
+)
+from .rollups import POINTS_WATERMARK, rebuild_rollup_day
+
+ACTIVE_GROUP_STATUSES = [GroupPurchase.Status.OPEN, GroupPurchase.Status.AWAITING_CONFIRMATION]
+
+
+@dataclass
+class LedgerTotals:
+    awards: Counter = field(default_factory=Counter)
+    balances: Counter = field(default_factory=Counter)
+    redeems: Counter = field(default_factory=Counter)
+    day_points: Counter = field(default_factory=Counter)
+    day_counts: Counter = field(default_factory=Counter)
+
+    def merge(self, other: "LedgerTotals") -> None:
+        self.awards.update(other.awards)
+        self.balances.update(other.balances)
+        self.redeems.update(other.redeems)
+        self.day_points.update(other.day_points)
+        self.day_counts.update(other.day_counts)
+
+
+@dataclass
+class Mismatch:
+    check: str
+    key: tuple
+    description: str
+    stored: int | None
+    actual: int | None
+    repairable: bool = False
+    repaired: bool = False
+
+
+def scan_ledger_chunk(bounds: tuple[int, int], rollup_upper_id: int) -> LedgerTotals:
+    chunk = PointTransaction.objects.filter(id__gte=bounds[0], id__lt=bounds[1]).order_by()
+    totals = LedgerTotals()
+    for row in (
+        chunk.filter(tx_type=PointTransaction.TxType.AWARD)
+        .values("semester_id", "created_by_id")
+        .annotate(points=Sum("points_delta"))
+    ):
+        totals.awards[(row["semester_id"], row["created_by_id"])] = row["points"]
+    for row in chunk.values("semester_id", "student_profile_id").annotate(points=Sum("points_delta")):
+        totals.balances[(row["semester_id"], row["student_profile_id"])] = row["points"]
+    for row in (
+        chunk.filter(tx_type=PointTransaction.TxType.REDEEM)
+        .values("semester_id", "student_profile_id", "bonus_item_id")
+        .annotate(uses=Count("id"))
+    ):
+        totals.redeems[(row["semester_id"], row["student_profile_id"], row["bonus_item_id"])] = row["uses"]
+    for row in (
+        chunk.filter(id__lte=rollup_upper_id)
+        .annotate(day=TruncDate("created_at"))
+        .values("semester_id", "day", "tx_type")
+        .annotate(points=Sum("points_delta"), tx_count=Count("id"))
+    ):
+        key = (row["semester_id"], row["day"], row["tx_type"])
+        totals.day_points[key] = row["points"]
+        totals.day_counts[key] = row["tx_count"]
+    return totals
+
+
+def _init_worker() -> None:
+    django.setup()
+
+
+def ledger_chunks(chunk_size: int) -> list[tuple[int, int]]:
+    bounds = PointTransaction.objects.aggregate(first=Min("id"), last=Max("id"))
+    if bounds["first"] is None:
+        return []
+    return [
+        (start, min(start + chunk_size, bounds["last"] + 1))
+        for start in range(bounds["first"], bounds["last"] + 1, chunk_size)
+    ]
+
+
+def rollup_upper_id() -> int:
+    watermark = RollupWatermark.objects.filter(name=POINTS_WATERMARK).first()
+    return watermark.last_id if watermark else 0
+
+
+def scan_ledger(workers: int, chunk_size: int) -> LedgerTotals:
+    chunks = ledger_chunks(chunk_size)
+    upper_id = rollup_upper_id()
+    totals = LedgerTotals()
+    if workers <= 1 or len(chunks) <= 1:
+        for bounds in chunks:
+            totals.merge(scan_ledger_chunk(bounds, upper_id))
+        return totals
+
+    # Forked workers must open their own database connections, and closing them under an open transaction would
+    # discard the caller's work; the workers could not see its uncommitted rows anyway.
+    if any(connection.in_atomic_block for connection in connections.all(initialized_only=True)):
+        raise transaction.TransactionManagementError(
+            "Lygiagretus patikrinimas negalimas atviroje transakcijoje; naudokite workers=1."
+        )
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for partial in pool.map(scan_ledger_chunk, chunks, repeat(upper_id)):
+            totals.merge(partial)
+    return totals
+
+
+def check_budgets(totals: LedgerTotals) -> list[Mismatch]:
+    mismatches = []
+    budgeted = set()
+    for budget in TeacherBudget.objects.values("id", "semester_id", "teacher_profile__user_id", "spent_points"):
+        key = (budget["semester_id"], budget["teacher_profile__user_id"])
+        budgeted.add(key)
+        actual = totals.awards.get(key, 0)
+        if budget["spent_points"] != actual:
+            mismatches.append(
+                Mismatch(
+                    check="budget",
+                    key=(budget["id"],),
+                    description=f"Biudžetas #{budget['id']} (semestras {key[0]}, vartotojas {key[1]})",
+                    stored=budget["spent_points"],
+                    actual=actual,
+                    repairable=True,
+                )
+            )
+    for key, points in totals.awards.items():
+        if key not in budgeted:
+            mismatches.append(
+                Mismatch(
+                    check="budget",
+                    key=key,
+                    description=f"Skirta be biudžeto (semestras {key[0]}, vartotojas {key[1]})",
+                    stored=None,
+                    actual=points,
+                )
+            )
+    return mismatches
+
+
+def check_balances(totals: LedgerTotals) -> list[Mismatch]:
+    reserved = Counter(
+        {
+            (row["group_purchase__semester_id"], row["student_profile_id"]): row["amount"]
+            for row in GroupContribution.objects.filter(group_purchase__status__in=ACTIVE_GROUP_STATUSES)
+            .values("group_purchase__semester_id", "student_profile_id")
+            .annotate(amount=Sum("amount"))
+            .order_by()
+        }
+    )
+    mismatches = []
+    for key in set(totals.balances) | set(reserved):
+        balance = totals.balances.get(key, 0)
+        if balance < 0 or balance < reserved.get(key, 0):
+            mismatches.append(
+                Mismatch(
+                    check="balance",
+                    key=key,
+                    description=f"Mokinio {key[1]} likutis semestre {key[0]} (rezervuota {reserved.get(key, 0)})",
+                    stored=reserved.get(key, 0),
+                    actual=balance,
+                )
+            )
+    return mismatches
+
+
+def check_bonus_usage(totals: LedgerTotals) -> list[Mismatch]:
+    limits = dict(BonusItem.objects.values_list("id", "max_uses_per_student"))
+    return [
+        Mismatch(
+            check="bonus_usage",
+            key=key,
+            description=f"Bonusas {key[2]}: mokinys {key[1]}, semestras {key[0]}",
+            stored=limits.get(key[2]),
+            actual=uses,
+        )
+        for key, uses in totals.redeems.items()
+        if key[2] in limits and uses > limits[key[2]]
+    ]
+
+
+def check_group_purchases(purchase_ids: list[int] | None = None) -> list[Mismatch]:
+    purchases = (
+        GroupPurchase.objects.all() if purchase_ids is None else GroupPurchase.objects.filter(pk__in=purchase_ids)
+    )
+    purchases = purchases.select_related("bonus_item").annotate(
+        total=Coalesce(Sum("contributions__amount"), 0),
+        unconfirmed=Count("contributions", filter=Q(contributions__confirmed_at__isnull=True)),
+    )
+    mismatches = []
+    for purchase in purchases:
+        if purchase.status == GroupPurchase.Status.EXPIRED:
+            continue
+        price = purchase.bonus_item.price_points
+        if purchase.total > price:
+            mismatches.append(
+                Mismatch(
+                    check="group_purchase",
+                    key=(purchase.id,),
+                    description=f"Grupinis pirkimas #{purchase.id} surinko daugiau nei kaina",
+                    stored=price,
+                    actual=purchase.total,
+                )
+            )
+            continue
+        if purchase.status == GroupPurchase.Status.COMPLETED:
+            if purchase.total != price or purchase.unconfirmed:
+                mismatches.append(
+                    Mismatch(
+                        check="group_purchase",
+                        key=(purchase.id,),
+                        description=f"Užbaigtas grupinis pirkimas #{purchase.id} ({purchase.unconfirmed} nepatvirtinta)",
+                        stored=price,
+                        actual=purchase.total,
+                    )
+                )
+            continue
+        expected = GroupPurchase.Status.AWAITING_CONFIRMATION if purchase.total >= price else GroupPurchase.Status.OPEN
+        if purchase.status != expected:
+            mismatches.append(
+                Mismatch(
+                    check="group_purchase",
+                    key=(purchase.id,),
+                    description=f"Grupinio pirkimo #{purchase.id} būsena {purchase.status}",
+                    stored=price,
+                    actual=purchase.total,
+                    repairable=True,
+                )
+            )
+    return mismatches
+
+
+def check_rollups(totals: LedgerTotals) -> list[Mismatch]:
+    stored = {
+        (row["semester_id"], row["date"], row["tx_type"]): (row["points"], row["tx_count"])
+        for row in PointDailyRollup.objects.values("semester_id", "date", "tx_type")
+        .annotate(points=Sum("points_total"), tx_count=Sum("tx_count"))
+        .order_by()
+    }
+    mismatches = []
+    for key in set(stored) | set(totals.day_points):
+        actual = (totals.day_points.get(key, 0), totals.day_counts.get(key, 0))
+        if stored.get(key, (0, 0)) != actual:
+            mismatches.append(
+                Mismatch(
+                    check="rollup",
+                    key=key,
+                    description=f"Suvestinė {key[1]} {key[2]} (semestras {key[0]})",
+                    stored=stored.get(key, (0, 0))[0],
+                    actual=actual[0],
+                    repairable=True,
+                )
+            )
+    return mismatches
+
+
+def _awarded(semester_id: int, user_id: int) -> int:
+    return (
+        PointTransaction.objects.filter(
+            semester_id=semester_id, created_by_id=user_id, tx_type=PointTransaction.TxType.AWARD
+        )
+        .aggregate(total=Coalesce(Sum("points_delta"), 0))
+        .get("total")
+    )
+
+
+def _recheck_budget(mismatch: Mismatch) -> bool:
+    if len(mismatch.key) == 2:
+        semester_id, user_id = mismatch.key
+        if TeacherBudget.objects.filter(semester_id=semester_id, teacher_profile__user_id=user_id).exists():
+            return False
+        mismatch.actual = _awarded(semester_id, user_id)
+        return mismatch.actual != 0
+    budget = (
+        TeacherBudget.objects.select_for_update().select_related("teacher_profile").filter(pk=mismatch.key[0]).first()
+    )
+    if budget is None:
+        return False
+    mismatch.stored = budget.spent_points
+    mismatch.actual = _awarded(budget.semester_id, budget.teacher_profile.user_id)
+    return mismatch.stored != mismatch.actual
+
+
+def _recheck_balance(mismatch: Mismatch) -> bool:
+    semester_id, student_id = mismatch.key
+    # Every service that moves a student's points locks the profile row first.
+    StudentProfile.objects.select_for_update().filter(pk=student_id).first()
+    mismatch.actual = (
+        PointTransaction.objects.filter(semester_id=semester_id, student_profile_id=student_id)
+        .aggregate(total=Coalesce(Sum("points_delta"), 0))
+        .get("total")
+    )
+    mismatch.stored = (
+        GroupContribution.objects.filter(
+            student_profile_id=student_id,
+            group_purchase__semester_id=semester_id,
+            group_purchase__status__in=ACTIVE_GROUP_STATUSES,
+        )
+        .aggregate(total=Coalesce(Sum("amount"), 0))
+        .get("total")
+    )
+    return mismatch.actual < 0 or mismatch.actual < mismatch.stored
+
+
+def _recheck_bonus_usage(mismatch: Mismatch) -> bool:
+    semester_id, student_id, bonus_id = mismatch.key
+    StudentProfile.objects.select_for_update().filter(pk=student_id).first()
+    mismatch.actual = PointTransaction.objects.filter(
+        semester_id=semester_id,
+        student_profile_id=student_id,
+        bonus_item_id=bonus_id,
+        tx_type=PointTransaction.TxType.REDEEM,
+    ).count()
+    return mismatch.actual > mismatch.stored
+
+
+def _recheck_group_purchase(mismatch: Mismatch) -> bool:
+    GroupPurchase.objects.select_for_update().filter(pk=mismatch.key[0]).first()
+    current = check_group_purchases([mismatch.key[0]])
+    if not current:
+        return False
+    mismatch.stored, mismatch.actual = current[0].stored, current[0].actual
+    return True
+
+
+def _recheck_rollup(mismatch: Mismatch) -> bool:
+    semester_id, day, tx_type = mismatch.key
+    # The rollup job holds this lock while it writes rollups and moves the watermark.
+    watermark = RollupWatermark.objects.select_for_update().filter(name=POINTS_WATERMARK).first()
+    ledger = (
+        PointTransaction.objects.filter(
+            semester_id=semester_id, tx_type=tx_type, id__lte=watermark.last_id if watermark else 0
+        )
+        .annotate(day=TruncDate("created_at"))
+        .filter(day=day)
+        .aggregate(points=Coalesce(Sum("points_delta"), 0), tx_count=Count("id"))
+    )
+    stored = PointDailyRollup.objects.filter(semester_id=semester_id, date=day, tx_type=tx_type).aggregate(
+        points=Coalesce(Sum("points_total"), 0), tx_count=Coalesce(Sum("tx_count"), 0)
+    )
+    mismatch.stored, mismatch.actual = stored["points"], ledger["points"]
+    return (stored["points"], stored["tx_count"]) != (ledger["points"], ledger["tx_count"])
+
+
+RECHECKS = {
+    "budget": _recheck_budget,
+    "balance": _recheck_balance,
+    "bonus_usage": _recheck_bonus_usage,
+    "group_purchase": _recheck_group_purchase,
+    "rollup": _recheck_rollup,
+}
+
+
+def recheck(mismatch: Mismatch) -> bool:
+    # The chunk scans and the stored values are read at different moments, so a write that landed in between
+    # looks like drift; each candidate is recomputed for its own key, with the rows writers lock held.
+    with transaction.atomic():
+        return RECHECKS[mismatch.check](mismatch)
+
+
+def _repair_budget(budget_id: int) -> None:
+    with transaction.atomic():
+        budget = TeacherBudget.objects.select_for_update().select_related("teacher_profile").get(pk=budget_id)
+        budget.spent_points = _awarded(budget.semester_id, budget.teacher_profile.user_id)
+        budget.save(update_fields=["spent_points"])
+
+
+def _repair_group_purchase(purchase_id: int) -> None:
+    with transaction.atomic():
+        purchase = GroupPurchase.objects.select_for_update().select_related("bonus_item").get(pk=purchase_id)
+        if purchase.status not in ACTIVE_GROUP_STATUSES:
+            return
+        total = purchase.contributions.aggregate(total=Coalesce(Sum("amount"), 0)).get("total")
+        if total >= purchase.bonus_item.price_points:
+            purchase.status = GroupPurchase.Status.AWAITING_CONFIRMATION
+        else:
+            purchase.status = GroupPurchase.Status.OPEN
+        purchase.save(update_fields=["status"])
+
+
+def repair(mismatch: Mismatch) -> None:
+    if mismatch.check == "budget":
+        _repair_budget(mismatch.key[0])
+    elif mismatch.check == "group_purchase":
+        _repair_group_purchase(mismatch.key[0])
+    elif mismatch.check == "rollup":
+        semester_id, day, _ = mismatch.key
+        rebuild_rollup_day(semester_id, day)
+    else:
+        return
+    mismatch.repaired = True
+
+
+def verify_ledger(workers: int = 1, chunk_size: int = 250_000, fix: bool = False) -> list[Mismatch]:
+    totals = scan_ledger(workers, chunk_size)
+    candidates = [
+        *check_budgets(totals),
+        *check_balances(totals),
+        *check_bonus_usage(totals),
+        *check_group_purchases(),
+        *check_rollups(totals),
+    ]
+    mismatches = [mismatch for mismatch in candidates if recheck(mismatch)]
+    if fix:
+        repaired_days = set()
+        for mismatch in mismatches:
+            if not mismatch.repairable:
+                continue
+            if mismatch.check == "rollup":
+                day_key = mismatch.key[:2]
+                if day_key in repaired_days:
+                    mismatch.repaired = True
+                    continue
+                repaired_days.add(day_key)
+            repair(mismatch)
+    return mismatches
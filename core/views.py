@@ -1,25 +1,35 @@
+import hmac
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import logout
-from django.http import HttpRequest, HttpResponse
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, HttpResponseForbidden
 from django.db.models import Sum
 from django.shortcuts import get_object_or_404, redirect, render
 
+from .activity import activity_feed
+from .autocomplete import encode_matches, search_students
+from .db.routers import replica_reads
 from .decorators import require_role
 from .forms import AwardForm
+from .history import award_history_page, award_subtotals_by_class, award_subtotals_by_student, budget_burn
+from .images import VARIANT_DIR, login_background_context, school_logo_context
+from .metrics import render_latest
 from .models import (
     BonusItem,
     BonusRedemptionRequest,
     GroupPurchase,
     GroupContribution,
-    PointTransaction,
     StudentProfile,
     TeacherBudget,
     User,
 )
 from .services import (
     DomainError,
+    active_bonus_items,
     award_points,
     get_active_semester,
     get_school_name,
@@ -33,8 +43,9 @@ from .services import (
     student_balance_points,
     bonus_used_count,
     student_reserved_points,
-    top_students,
+    cached_top_students,
 )
+from .snapshots import balance_series, encode_balance_series, student_snapshot
 
 
 class LoginView(auth_views.LoginView):
@@ -43,15 +54,29 @@ class LoginView(auth_views.LoginView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         school_settings = get_school_settings()
-        context["school_logo_url"] = school_settings.logo.url if school_settings and school_settings.logo else ""
-        context["login_background_url"] = (
-            school_settings.login_background.url
-            if school_settings and school_settings.login_background
-            else ""
-        )
+        context.update(school_logo_context(school_settings, 64))
+        context.update(login_background_context(school_settings))
         return context
 
 
+def school_image_variant(request: HttpRequest, name: str) -> FileResponse:
+    path = f"{VARIANT_DIR}/{name}"
+    if name.startswith(".") or not default_storage.exists(path):
+        raise Http404
+    response = FileResponse(default_storage.open(path, "rb"))
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    # Behind a reverse proxy every request comes from the proxy's address, so the scraper sends a bearer token.
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if not settings.METRICS_TOKEN or scheme != "Bearer" or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return HttpResponseForbidden()
+    payload, content_type = render_latest()
+    return HttpResponse(payload, content_type=content_type)
+
+
 def home(request: HttpRequest) -> HttpResponse:
     if not request.user.is_authenticated:
         return redirect("login")
@@ -66,10 +91,10 @@ def home(request: HttpRequest) -> HttpResponse:
     return redirect("student_dashboard")
 
 
+@replica_reads
 @require_role([User.Role.TEACHER])
 def teacher_dashboard(request: HttpRequest) -> HttpResponse:
-    school_settings = get_school_settings()
-    school_logo_url = school_settings.logo.url if school_settings and school_settings.logo else ""
+    school_logo = school_logo_context(get_school_settings(), 48)
     query = (request.GET.get("q") or "").strip()
     selected_class = (request.GET.get("class_name") or "").strip()
     class_options = list(
@@ -98,7 +123,7 @@ def teacher_dashboard(request: HttpRequest) -> HttpResponse:
                 "selected_class": selected_class,
                 "class_options": class_options,
                 "school_name": get_school_name(),
-                "school_logo_url": school_logo_url,
+                **school_logo,
                 "bonuses_payload": [],
             },
         )
@@ -119,12 +144,7 @@ def teacher_dashboard(request: HttpRequest) -> HttpResponse:
             students_truncated = True
         else:
             students = students_base.order_by("display_name")
-    total_recent_activity = PointTransaction.objects.filter(semester=semester).count()
-    recent_activity = (
-        PointTransaction.objects.filter(semester=semester)
-        .select_related("student_profile", "created_by__teacher_profile")
-        .order_by("-created_at")[:10]
-    )
+    feed = activity_feed(semester)
     pending_bonus_requests = (
         BonusRedemptionRequest.objects.filter(
             requested_teacher=teacher_profile,
@@ -133,8 +153,8 @@ def teacher_dashboard(request: HttpRequest) -> HttpResponse:
         .select_related("student_profile", "bonus_item", "semester")
         .order_by("created_at")
     )
-    top_five = top_students(semester)
-    bonuses = list(BonusItem.objects.filter(is_active=True).order_by("price_points"))
+    top_five = cached_top_students(semester)
+    bonuses = active_bonus_items()
     bonuses_payload = [{"title": bonus.title_lt, "price_points": bonus.price_points} for bonus in bonuses]
 
     context = {
@@ -142,20 +162,29 @@ def teacher_dashboard(request: HttpRequest) -> HttpResponse:
         "budget": budget,
         "students": students,
         "students_truncated": students_truncated,
-        "recent_activity": recent_activity,
-        "recent_activity_truncated": total_recent_activity > 10,
+        "recent_activity": feed.entries,
+        "recent_activity_truncated": feed.truncated,
         "pending_bonus_requests": pending_bonus_requests,
         "top_five": top_five,
         "query": query,
         "selected_class": selected_class,
         "class_options": class_options,
         "school_name": get_school_name(),
-        "school_logo_url": school_logo_url,
+        **school_logo,
         "bonuses_payload": bonuses_payload,
     }
     return render(request, "core/teacher_dashboard.html", context)
 
 
+@replica_reads
+@require_role([User.Role.TEACHER])
+def teacher_student_autocomplete(request: HttpRequest) -> HttpResponse:
+    matches = search_students(request.GET.get("q") or "", request.GET.get("class_name") or "")
+    response = HttpResponse(encode_matches(matches), content_type="application/json")
+    response["Cache-Control"] = "private, max-age=30"
+    return response
+
+
 @require_role([User.Role.TEACHER])
 def teacher_award(request: HttpRequest, student_id: int) -> HttpResponse:
     student = get_object_or_404(StudentProfile, pk=student_id)
@@ -191,11 +220,12 @@ def teacher_award(request: HttpRequest, student_id: int) -> HttpResponse:
     )
 
 
+@replica_reads
 @require_role([User.Role.TEACHER])
 def teacher_ranking(request: HttpRequest) -> HttpResponse:
     try:
         semester = get_active_semester()
-        top_five = top_students(semester)
+        top_five = cached_top_students(semester)
     except DomainError as exc:
         messages.error(request, exc.message)
         semester = None
@@ -203,21 +233,46 @@ def teacher_ranking(request: HttpRequest) -> HttpResponse:
     return render(request, "core/teacher_ranking.html", {"top_five": top_five, "semester": semester})
 
 
+@replica_reads
+@require_role([User.Role.TEACHER])
+def teacher_award_history(request: HttpRequest) -> HttpResponse:
+    try:
+        semester = get_active_semester()
+    except DomainError as exc:
+        messages.error(request, exc.message)
+        return render(request, "core/teacher_award_history.html", {"semester": None})
+    cursor = request.GET.get("after") or ""
+    context = {
+        "semester": semester,
+        "page": award_history_page(request.user, semester, cursor),
+        "is_first_page": not cursor,
+    }
+    if not cursor:
+        # The summaries scan the whole semester; deeper pages only read the next slice of the index.
+        budget = TeacherBudget.objects.filter(teacher_profile=request.user.teacher_profile, semester=semester).first()
+        context.update(
+            budget=budget,
+            by_student=award_subtotals_by_student(request.user, semester),
+            by_class=award_subtotals_by_class(request.user, semester),
+            burn=budget_burn(request.user, semester, budget),
+        )
+    return render(request, "core/teacher_award_history.html", context)
+
+
 @require_role([User.Role.TEACHER])
 def teacher_guidelines(request: HttpRequest) -> HttpResponse:
-    school_settings = get_school_settings()
-    school_logo_url = school_settings.logo.url if school_settings and school_settings.logo else ""
+    school_logo = school_logo_context(get_school_settings(), 48)
     context = {
         "school_name": get_school_name(),
-        "school_logo_url": school_logo_url,
+        **school_logo,
     }
     return render(request, "core/teacher_guidelines.html", context)
 
 
+@replica_reads
 @require_role([User.Role.STUDENT])
 def student_dashboard(request: HttpRequest) -> HttpResponse:
-    school_settings = get_school_settings()
-    school_logo_url = school_settings.logo.url if school_settings and school_settings.logo else ""
+    school_logo = school_logo_context(get_school_settings(), 48)
     try:
         semester = get_active_semester()
     except DomainError as exc:
@@ -231,45 +286,39 @@ def student_dashboard(request: HttpRequest) -> HttpResponse:
                 "recent_activity": [],
                 "school_activity": [],
                 "school_name": get_school_name(),
-                "school_logo_url": school_logo_url,
+                **school_logo,
                 "last_purchase": None,
             },
         )
     student_profile = request.user.student_profile
-    balance = student_balance_points(student_profile, semester)
-    last_purchase = (
-        PointTransaction.objects.filter(
-            semester=semester,
-            student_profile=student_profile,
-            tx_type=PointTransaction.TxType.REDEEM,
-        )
-        .order_by("-created_at")
-        .first()
-    )
-    recent_activity = (
-        PointTransaction.objects.filter(semester=semester, student_profile=student_profile)
-        .select_related("created_by__teacher_profile")
-        .order_by("-created_at")[:10]
-    )
-    school_activity = (
-        PointTransaction.objects.filter(semester=semester)
-        .select_related("created_by__teacher_profile", "student_profile")
-        .order_by("-created_at")[:10]
-    )
+    snapshot = student_snapshot(student_profile, semester)
 
     context = {
         "semester": semester,
-        "balance": balance,
-        "recent_activity": recent_activity,
-        "school_activity": school_activity,
+        "balance": snapshot.balance,
+        "recent_activity": snapshot.recent_activity,
+        "school_activity": activity_feed(semester).entries,
         "current_student_id": student_profile.id,
         "school_name": get_school_name(),
-        "school_logo_url": school_logo_url,
-        "last_purchase": last_purchase,
+        **school_logo,
+        "last_purchase": snapshot.last_purchase,
     }
     return render(request, "core/student_dashboard.html", context)
 
 
+@replica_reads
+@require_role([User.Role.STUDENT])
+def student_balance_series(request: HttpRequest) -> HttpResponse:
+    try:
+        series = balance_series(request.user.student_profile, get_active_semester())
+    except DomainError:
+        series = []
+    response = HttpResponse(encode_balance_series(series), content_type="application/json")
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@replica_reads
 @require_role([User.Role.STUDENT])
 def student_shop(request: HttpRequest) -> HttpResponse:
     try:
@@ -281,7 +330,7 @@ def student_shop(request: HttpRequest) -> HttpResponse:
     balance = student_balance_points(student_profile, semester)
     reserved = student_reserved_points(student_profile, semester)
     available_points = balance - reserved
-    bonuses = BonusItem.objects.filter(is_active=True).prefetch_related("assigned_teachers").order_by("price_points")
+    bonuses = active_bonus_items()
     pending_requests_by_bonus = {
         bonus_request.bonus_item_id: bonus_request
         for bonus_request in BonusRedemptionRequest.objects.filter(
@@ -0,0 +1,69 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils import translation
+
+from .models import School
+from .services import DomainError, get_active_semester, get_school_settings
+from .tenants import use_school
+
+
+def warm_templates() -> int:
+    template_dir = Path(settings.BASE_DIR) / "templates"
+    names = ["base.html"] + sorted(
+        path.relative_to(template_dir).as_posix() for path in (template_dir / "core").glob("*.html")
+    )
+    for name in names:
+        get_template(name)
+    return len(names)
+
+
+def warm_urls() -> int:
+    resolver = get_resolver()
+    return len(resolver.reverse_dict)
+
+
+def warm_translations() -> None:
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.gettext("Log in")
+
+
+def warm_database() -> None:
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def warm_caches() -> None:
+    if not settings.CACHE_SHARED:
+        return
+    # Requests always run under a school, so the per-school keys are the ones worth filling.
+    for school_id in School.objects.values_list("pk", flat=True):
+        with use_school(school_id):
+            get_school_settings()
+            try:
+                get_active_semester()
+            except DomainError:
+                pass
+
+
+def warm_up(database: bool = True, open_connections: bool = True) -> dict[str, float]:
+    steps = [
+        ("templates", warm_templates),
+        ("urls", warm_urls),
+        ("translations", warm_translations),
+    ]
+    if database:
+        if open_connections:
+            steps.append(("database", warm_database))
+        steps.append(("caches", warm_caches))
+
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        timings[name] = (time.perf_counter() - started) * 1000
+    return timings
@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+wsgi_app = "school_motivation_system.wsgi:application"
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# "gthread" suits I/O bound dashboards with a small number of processes, "sync" keeps one request
+# per process and is the safest choice together with SQLite.
+preset = os.environ.get("GUNICORN_PRESET", "gthread")
+if preset == "sync":
+    worker_class = "sync"
+    workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+    threads = 1
+elif preset == "gthread":
+    worker_class = "gthread"
+    workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() + 1))
+    threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+else:
+    raise RuntimeError(f"Nežinomas GUNICORN_PRESET: {preset}")
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+
+# Every worker writes its metric samples to memory-mapped files in this directory and /metrics
+# merges them, so a scrape sees the whole server and not just the worker that answered it.
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "school-motivation-metrics")
+)
+
+
+def on_starting(server):
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # With preload the application is already imported in the master, so compiled templates,
+    # the URLconf and translation catalogs are shared with every forked worker. Database
+    # connections must not cross the fork, so they are handled per worker below.
+    if not preload_app:
+        return
+    from django.core import checks
+    from django.db import connections
+
+    from core.warmup import warm_up
+
+    for message in checks.run_checks(tags=[checks.Tags.caches], include_deployment_checks=True):
+        server.log.warning("%s", message)
+
+    timings = warm_up(database=False)
+    connections.close_all()
+    server.log.info("Warm-up (master): %s", ", ".join(f"{key}={value:.0f}ms" for key, value in timings.items()))
+
+
+def post_worker_init(worker):
+    from django.conf import settings
+    from django.db import connections
+
+    from core.warmup import warm_up
+
+    # Django connections belong to the thread that opened them. gthread requests run on pool
+    # threads, so a connection opened here is only reused by a sync worker; the pooled backend
+    # keeps one pool per process, so opening it here still spares the first requests the connect.
+    pooled = settings.DATABASES["default"]["ENGINE"] == "core.db.backends.postgresql_pool"
+    timings = warm_up(database=True, open_connections=worker_class == "sync" or pooled)
+    if worker_class != "sync":
+        # The cache warm-up queried on this thread; return that connection instead of leaving it idle.
+        connections.close_all()
+    worker.log.info(
+        "Warm-up (worker %s): %s", worker.pid, ", ".join(f"{key}={value:.0f}ms" for key, value in timings.items())
+    )
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    from django.conf import settings
+
+    if settings.DATABASES["default"]["ENGINE"] == "core.db.backends.postgresql_pool":
+        from core.db.backends.postgresql_pool.base import close_pools
+
+        close_pools()
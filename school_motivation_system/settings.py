@@ -19,14 +19,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.TenantMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
+    "core.middleware.SamplingProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "school_motivation_system.urls"
@@ -61,6 +65,120 @@ DATABASES = {
     }
 }
 
+if os.environ.get("DB_SQLITE_PROFILE", "0") == "1" and DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].update(
+        {
+            "ENGINE": "core.db.backends.sqlite_tuned",
+            "OPTIONS": {
+                "timeout": float(os.environ.get("SQLITE_BUSY_TIMEOUT", "5")),
+                "immediate_transactions": True,
+                "pragmas": {
+                    "busy_timeout": int(float(os.environ.get("SQLITE_BUSY_TIMEOUT", "5")) * 1000),
+                    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+                },
+            },
+        }
+    )
+
+if os.environ.get("DB_POOL", "0") == "1":
+    DATABASES["default"].update(
+        {
+            "ENGINE": "core.db.backends.postgresql_pool",
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+                    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+                    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+                    "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600")),
+                    "check": os.environ.get("DB_POOL_CHECK", "1") == "1",
+                },
+            },
+        }
+    )
+
+# Reads of the dashboard views go to this alias when it is configured. Without DB_REPLICA_*
+# variables everything stays on "default".
+REPLICA_DATABASE = "replica"
+if os.environ.get("DB_REPLICA_NAME") or os.environ.get("DB_REPLICA_HOST"):
+    DATABASES[REPLICA_DATABASE] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.environ.get("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.environ.get("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+REPLICA_PIN_COOKIE = "pin_primary"
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
+CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "school-motivation",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION", str(BASE_DIR / "cache")),
+    },
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION", "core_cache"),
+    },
+}
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+CACHES = {"default": CACHE_BACKENDS[CACHE_BACKEND]}
+# locmem lives inside one process: caches that a write in another worker must invalidate are used only when shared.
+# Cached sessions/profiles, school settings, the active semester, the bonus catalog, the student dashboard snapshot,
+# the activity feeds and the leaderboard need CACHE_BACKEND=file or db in production; `check --deploy` and Gunicorn
+# start-up warn (core.W001) when this is off.
+CACHE_SHARED = os.environ.get("CACHE_SHARED", "0" if CACHE_BACKEND == "locmem" else "1") == "1"
+
+# A logout in one worker would only clear its own locmem copy, so sessions are read through the cache only when shared.
+SESSION_ENGINE = "django.contrib.sessions.backends." + ("cached_db" if CACHE_SHARED else "db")
+AUTHENTICATION_BACKENDS = ["core.auth_backends.CachedModelBackend"]
+USER_CACHE_TIMEOUT = int(os.environ.get("USER_CACHE_TIMEOUT", "300"))
+STUDENT_SNAPSHOT_TIMEOUT = int(os.environ.get("STUDENT_SNAPSHOT_TIMEOUT", "900"))
+ACTIVITY_FEED_SIZE = int(os.environ.get("ACTIVITY_FEED_SIZE", "10"))
+ACTIVITY_FEED_TIMEOUT = int(os.environ.get("ACTIVITY_FEED_TIMEOUT", "900"))
+LEADERBOARD_TIMEOUT = int(os.environ.get("LEADERBOARD_TIMEOUT", "300"))
+AWARD_HISTORY_PAGE_SIZE = int(os.environ.get("AWARD_HISTORY_PAGE_SIZE", "50"))
+
+AUTOCOMPLETE_LIMIT = int(os.environ.get("AUTOCOMPLETE_LIMIT", "10"))
+AUTOCOMPLETE_MAX_BYTES = int(os.environ.get("AUTOCOMPLETE_MAX_BYTES", "2048"))
+AUTOCOMPLETE_CACHE_SIZE = int(os.environ.get("AUTOCOMPLETE_CACHE_SIZE", "512"))
+AUTOCOMPLETE_CACHE_TIMEOUT = int(os.environ.get("AUTOCOMPLETE_CACHE_TIMEOUT", "60"))
+
+GROUP_PURCHASE_EXPIRY_DAYS = int(os.environ.get("GROUP_PURCHASE_EXPIRY_DAYS", "14"))
+BONUS_REQUEST_EXPIRY_DAYS = int(os.environ.get("BONUS_REQUEST_EXPIRY_DAYS", "30"))
+
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.environ.get("ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000"))
+
+SERVICE_RETRY_ATTEMPTS = int(os.environ.get("SERVICE_RETRY_ATTEMPTS", "4"))
+SERVICE_RETRY_BASE_DELAY = float(os.environ.get("SERVICE_RETRY_BASE_DELAY", "0.02"))
+SERVICE_RETRY_MAX_DELAY = float(os.environ.get("SERVICE_RETRY_MAX_DELAY", "0.5"))
+
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_DELAY = float(os.environ.get("JOB_RETRY_BASE_DELAY", "5"))
+JOB_RETRY_MAX_DELAY = float(os.environ.get("JOB_RETRY_MAX_DELAY", "600"))
+JOB_LOCK_TIMEOUT = int(os.environ.get("JOB_LOCK_TIMEOUT", "900"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1"))
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", "7"))
+JOB_ENQUEUE_DEBOUNCE = float(os.environ.get("JOB_ENQUEUE_DEBOUNCE", "5"))
+ROLLUP_RECONCILE_DAYS = int(os.environ.get("ROLLUP_RECONCILE_DAYS", "2"))
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+PROFILING_ENABLED = os.environ.get("PROFILING", "0") == "1"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0.01"))
+PROFILING_SLOW_MS = float(os.environ.get("PROFILING_SLOW_MS", "500"))
+PROFILING_SLOW_FOLLOWUP = int(os.environ.get("PROFILING_SLOW_FOLLOWUP", "5"))
+PROFILING_MAX_VIEWS = int(os.environ.get("PROFILING_MAX_VIEWS", "50"))
+PROFILING_MAX_FUNCTIONS = int(os.environ.get("PROFILING_MAX_FUNCTIONS", "40"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -75,7 +193,10 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STATICFILES_DIRS = [BASE_DIR / "static"]
+STATICFILES_STORAGE = "core.storage.StaticStorage"
+# Off by default with DEBUG (and so in tests) so pages render before collectstatic has written the manifest.
+STATIC_MANIFEST_STRICT = os.environ.get("STATIC_MANIFEST_STRICT", "0" if DEBUG else "1") == "1"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
@@ -0,0 +1,68 @@
+(function () {
+    const chart = document.getElementById('balance-chart');
+    if (!chart || !chart.dataset.url) {
+        return;
+    }
+    const emptyEl = document.getElementById('balance-chart-empty');
+    const svgNs = 'http://www.w3.org/2000/svg';
+    const padding = 24;
+
+    const element = (name, attributes, text) => {
+        const node = document.createElementNS(svgNs, name);
+        Object.entries(attributes).forEach(([key, value]) => node.setAttribute(key, value));
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        chart.appendChild(node);
+    };
+
+    const render = (series) => {
+        if (!series.days.length) {
+            chart.classList.add('d-none');
+            if (emptyEl) {
+                emptyEl.classList.remove('d-none');
+            }
+            return;
+        }
+        const width = chart.clientWidth || 600;
+        const height = chart.clientHeight || 160;
+        chart.setAttribute('viewBox', `0 0 ${width} ${height}`);
+        const times = series.days.map((day) => Date.parse(day));
+        const first = times[0];
+        const span = Math.max(times[times.length - 1] - first, 1);
+        const low = Math.min(0, ...series.balance);
+        const high = Math.max(...series.balance, low + 1);
+        const x = (time) => padding + ((time - first) / span) * (width - 2 * padding);
+        const y = (balance) => height - padding - ((balance - low) / (high - low)) * (height - 2 * padding);
+
+        // The balance holds until the next change, so the line steps rather than interpolates between days.
+        const points = [];
+        times.forEach((time, index) => {
+            if (index > 0) {
+                points.push(`${x(time)},${y(series.balance[index - 1])}`);
+            }
+            points.push(`${x(time)},${y(series.balance[index])}`);
+        });
+        if (times.length === 1) {
+            points.push(`${width - padding},${y(series.balance[0])}`);
+        }
+        element('line', {
+            x1: padding, y1: y(low), x2: width - padding, y2: y(low), stroke: 'currentColor', 'stroke-opacity': 0.2,
+        });
+        element('polyline', {
+            points: points.join(' '), fill: 'none', stroke: 'var(--bs-primary)', 'stroke-width': 2,
+        });
+        element('text', { x: padding, y: 14, 'font-size': 12, fill: 'currentColor' }, `${high} t.`);
+        element('text', { x: padding, y: height - 6, 'font-size': 12, fill: 'currentColor' }, series.days[0]);
+        element('text', {
+            x: width - padding, y: height - 6, 'font-size': 12, fill: 'currentColor', 'text-anchor': 'end',
+        }, series.days[series.days.length - 1]);
+    };
+
+    fetch(chart.dataset.url, { headers: { Accept: 'application/json' }, credentials: 'same-origin' })
+        .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+        .then(render)
+        .catch(() => {
+            chart.classList.add('d-none');
+        });
+})();
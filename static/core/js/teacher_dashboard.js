@@ -0,0 +1,118 @@
+(function () {
+    const dataElement = document.getElementById('bonus-items-data');
+    if (!dataElement) {
+        return;
+    }
+    const bonuses = JSON.parse(dataElement.textContent || '[]');
+    const titleEl = document.getElementById('bonus-title');
+    const priceEl = document.getElementById('bonus-price');
+    const prevBtn = document.getElementById('bonus-prev');
+    const nextBtn = document.getElementById('bonus-next');
+    if (!titleEl || !priceEl || !prevBtn || !nextBtn) {
+        return;
+    }
+    let index = 0;
+
+    const render = () => {
+        if (!bonuses.length) {
+            titleEl.textContent = 'Nėra bonusų';
+            priceEl.textContent = '0';
+            prevBtn.disabled = true;
+            nextBtn.disabled = true;
+            return;
+        }
+        const item = bonuses[index];
+        titleEl.textContent = item.title;
+        priceEl.textContent = item.price_points;
+        prevBtn.disabled = bonuses.length === 1;
+        nextBtn.disabled = bonuses.length === 1;
+    };
+
+    prevBtn.addEventListener('click', () => {
+        if (!bonuses.length) {
+            return;
+        }
+        index = (index - 1 + bonuses.length) % bonuses.length;
+        render();
+    });
+
+    nextBtn.addEventListener('click', () => {
+        if (!bonuses.length) {
+            return;
+        }
+        index = (index + 1) % bonuses.length;
+        render();
+    });
+
+    render();
+})();
+
+(function () {
+    const input = document.getElementById('student-search-name');
+    const list = document.getElementById('student-suggestions');
+    const classSelect = document.getElementById('student-search-class');
+    if (!input || !list || !input.dataset.autocompleteUrl) {
+        return;
+    }
+    let timer = null;
+    let controller = null;
+
+    const hide = () => {
+        list.classList.add('d-none');
+        list.replaceChildren();
+    };
+
+    const show = (payload) => {
+        list.replaceChildren();
+        payload.results.forEach((student) => {
+            const link = document.createElement('a');
+            link.className = 'list-group-item list-group-item-action d-flex justify-content-between';
+            link.href = input.dataset.awardUrl.replace('/0/', `/${student.id}/`);
+            const name = document.createElement('span');
+            name.textContent = student.name;
+            const studentClass = document.createElement('span');
+            studentClass.className = 'text-muted small';
+            studentClass.textContent = student.class || '-';
+            link.append(name, studentClass);
+            list.append(link);
+        });
+        if (!payload.complete) {
+            const more = document.createElement('div');
+            more.className = 'list-group-item small text-secondary';
+            more.textContent = 'Rodomi ne visi mokiniai – tikslinkite paiešką.';
+            list.append(more);
+        }
+        list.classList.toggle('d-none', !list.childElementCount);
+    };
+
+    const lookup = () => {
+        const params = new URLSearchParams({ q: input.value.trim(), class_name: classSelect ? classSelect.value : '' });
+        if (!params.get('q')) {
+            hide();
+            return;
+        }
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+        fetch(`${input.dataset.autocompleteUrl}?${params}`, { signal: controller.signal, credentials: 'same-origin' })
+            .then((response) => (response.ok ? response.json() : null))
+            .then((payload) => (payload ? show(payload) : hide()))
+            .catch((error) => {
+                if (error.name !== 'AbortError') {
+                    hide();
+                }
+            });
+    };
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(lookup, 150);
+    });
+    input.addEventListener('keydown', (event) => {
+        if (event.key === 'Escape') {
+            hide();
+        }
+    });
+    input.addEventListener('blur', () => setTimeout(hide, 200));
+})();